@@ -0,0 +1,102 @@
+# File: benchmarks/__main__.py
+
+"""
+Run the benchmark suite against a throwaway test database and write the
+results to a JSON file that benchmarks.compare can diff.
+
+Run from the app/ directory:
+
+    python -m benchmarks [-o results.json] [-k NAME_SUBSTRING] [--repeat 5]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from benchmarks import cases  # noqa: E402,F401
+from benchmarks.suite import BENCHMARKS, measure  # noqa: E402
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", help="Write the results to this file.")
+    parser.add_argument(
+        "-k", dest="keyword", help="Only run benchmarks whose name contains this."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum duration of each timing round, in seconds.",
+    )
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.keyword or args.keyword in name]
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    results = {}
+
+    try:
+        for name in names:
+            result = measure(
+                BENCHMARKS[name](), repeat=args.repeat, min_time=args.min_time
+            )
+            results[name] = result
+
+            print(
+                "{:<32} {:10.2f} us  {:12.1f} ops/s".format(
+                    name, result["median"] * 1e6, result["ops_per_sec"]
+                )
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
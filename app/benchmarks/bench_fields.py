@@ -0,0 +1,57 @@
+# File: benchmarks/bench_fields.py
+
+"""
+Compare DateTimeRangeField.clean, which uses the single-pass parser for the
+formats emitted by the date range picker, against the same clean with the
+parser disabled, i.e. with both date/times going through the two nested
+DateTimeFields.
+
+Run from the app/ directory:
+
+    python -m benchmarks.bench_fields
+"""
+
+import os
+import timeit
+
+from unittest import mock
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from daterangepicker.fields import DateTimeRangeField  # noqa: E402
+
+NUMBER = 20000
+
+INPUTS = {
+    "input format": "12/28/2030 03:30 AM - 12/29/2030 04:45 PM",
+    "iso 8601": "2030-12-28T03:30:00 - 2030-12-29T16:45:00",
+}
+
+
+def main():
+    field = DateTimeRangeField()
+
+    for name, time_range_str in INPUTS.items():
+        with mock.patch("daterangepicker.fields.parse_time_range", return_value=None):
+            fields_time = timeit.timeit(
+                lambda: field.clean(time_range_str), number=NUMBER
+            )
+
+        clean_time = timeit.timeit(lambda: field.clean(time_range_str), number=NUMBER)
+
+        print(
+            "{:<14} fields: {:7.2f} us  fast path: {:7.2f} us  ({:.1f}x)".format(
+                name,
+                fields_time / NUMBER * 1e6,
+                clean_time / NUMBER * 1e6,
+                fields_time / clean_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# File: benchmarks/bench_forms.py
+
+"""
+Report how many TimeRangedModelForms are constructed per second, alone and as
+the forms of a formset, and compare against the same with DateTimeRangeField
+copied the way MultiValueField does it, i.e. with both of its DateTimeFields
+deep-copied for every form.
+
+Run from the app/ directory:
+
+    python -m benchmarks.bench_forms [--forms 100]
+"""
+
+import argparse
+import datetime
+import os
+import timeit
+
+from unittest import mock
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.forms import MultiValueField, modelformset_factory  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from daterangepicker.fields import DateTimeRangeField  # noqa: E402
+from daterangepicker.forms import TimeRangedModelFormSet  # noqa: E402
+
+from simpleapp.forms import EventForm  # noqa: E402
+from simpleapp.models import Event  # noqa: E402
+
+NUMBER = 5000
+
+
+def forms_per_second(func, forms):
+    """ Time func, which constructs the given number of forms. """
+    number = max(NUMBER // forms, 10)
+
+    return number * forms / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--forms", type=int, default=100, help="Number of forms in the formset."
+    )
+    args = parser.parse_args()
+
+    start = timezone.now() + datetime.timedelta(days=1)
+    event = Event(
+        title="Benchmark Event",
+        time_start=start,
+        time_end=start + datetime.timedelta(hours=2),
+    )
+
+    EventFormSet = modelformset_factory(
+        Event, form=EventForm, formset=TimeRangedModelFormSet, extra=args.forms
+    )
+
+    cases = {
+        "form": (lambda: EventForm(), 1),
+        "form[instance]": (lambda: EventForm(instance=event), 1),
+        "formset[{}]".format(args.forms): (
+            lambda: EventFormSet(queryset=Event.objects.none()).forms,
+            args.forms,
+        ),
+    }
+
+    for name, (func, forms) in cases.items():
+        with mock.patch.object(
+            DateTimeRangeField, "__deepcopy__", MultiValueField.__deepcopy__
+        ):
+            deep_copy = forms_per_second(func, forms)
+
+        shared = forms_per_second(func, forms)
+
+        print(
+            "{:<16} deep copy: {:9.0f} forms/s  shared: {:9.0f} forms/s  "
+            "({:.1f}x)".format(name, deep_copy, shared, shared / deep_copy)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# File: benchmarks/bench_queries.py
+
+"""
+Load a large number of events into a throwaway test database and report the
+query plan and timing of each of the Event range lookups.
+
+Run from the app/ directory:
+
+    python -m benchmarks.bench_queries [--rows 1000000]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone  # noqa: E402
+
+from simpleapp.models import Event  # noqa: E402
+
+BATCH_SIZE = 50000
+
+
+def populate(rows):
+    """ Insert rows events spread over ten years around now. """
+    now = timezone.now()
+    span = int(datetime.timedelta(days=3650).total_seconds())
+
+    rng = random.Random(0)
+
+    table = connection.ops.quote_name(Event._meta.db_table)
+    sql = "INSERT INTO {} (title, time_start, time_end) VALUES (%s, %s, %s)".format(
+        table
+    )
+
+    with connection.cursor() as cursor:
+        for offset in range(0, rows, BATCH_SIZE):
+            params = []
+
+            for i in range(offset, min(offset + BATCH_SIZE, rows)):
+                start = now + datetime.timedelta(seconds=rng.randrange(-span, span))
+                end = start + datetime.timedelta(minutes=rng.randrange(30, 60 * 48))
+
+                params.append(("Event {}".format(i), start, end))
+
+            cursor.executemany(sql, params)
+
+        cursor.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        populate(args.rows)
+
+        now = timezone.now()
+        week = datetime.timedelta(days=7)
+
+        querysets = {
+            "overlapping": Event.objects.overlapping(now, now + week),
+            "overlapping (max_duration)": Event.objects.overlapping(
+                now, now + week, max_duration=datetime.timedelta(days=2)
+            ),
+            "containing": Event.objects.containing(now),
+            "containing (max_duration)": Event.objects.containing(
+                now, max_duration=datetime.timedelta(days=2)
+            ),
+            "upcoming": Event.objects.upcoming(now=now)[:50],
+            "past": Event.objects.past(now=now)[:50],
+        }
+
+        for name, queryset in querysets.items():
+            start = time.perf_counter()
+            count = len(queryset)
+            elapsed = time.perf_counter() - start
+
+            print("{:<28} {:6d} rows  {:8.2f} ms".format(name, count, elapsed * 1e3))
+            print("    " + queryset.explain())
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# File: benchmarks/cases.py
+
+"""
+The benchmarks for the daterangepicker hot paths. They expect Django to be set
+up with a test database, as done by ``python -m benchmarks``.
+"""
+
+from benchmarks.suite import benchmark
+
+from django.forms import modelformset_factory
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.forms import TimeRangedModelFormSet
+from daterangepicker.utils import format_time_range, time_range_generator
+from daterangepicker.widgets import DateTimeRangeWidget
+
+from simpleapp import watermarks
+from simpleapp.forms import EventForm
+from simpleapp.models import Event
+
+import datetime
+import itertools
+
+
+def future_range(days=1, hours=2):
+    start = timezone.now().replace(second=0, microsecond=0) + datetime.timedelta(
+        days=days
+    )
+
+    return start, start + datetime.timedelta(hours=hours)
+
+
+def event_data():
+    return {
+        "title": "Benchmark Event",
+        "time_range": time_range_generator(*future_range()),
+    }
+
+
+@benchmark("field.clean[valid]")
+def field_clean_valid():
+    field = DateTimeRangeField()
+    time_range_str = time_range_generator(*future_range())
+
+    return lambda: field.clean(time_range_str)
+
+
+@benchmark("field.clean[valid iso]")
+def field_clean_valid_iso():
+    field = DateTimeRangeField()
+    start, end = future_range()
+    time_range_str = "{} - {}".format(start.isoformat(), end.isoformat())
+
+    return lambda: field.clean(time_range_str)
+
+
+def clean_invalid(field, time_range_str):
+    try:
+        field.clean(time_range_str)
+    except Exception:
+        pass
+
+
+@benchmark("field.clean[end before start]")
+def field_clean_end_before_start():
+    field = DateTimeRangeField()
+    start, end = future_range()
+    time_range_str = time_range_generator(end, start)
+
+    return lambda: clean_invalid(field, time_range_str)
+
+
+@benchmark("field.clean[garbage]")
+def field_clean_garbage():
+    field = DateTimeRangeField()
+
+    return lambda: clean_invalid(field, "yo momma - yo momma")
+
+
+@benchmark("widget.format_value[range]")
+def widget_format_value_range():
+    widget = DateTimeRangeWidget()
+    time_range = future_range()
+
+    return lambda: widget.format_value(time_range)
+
+
+@benchmark("widget.format_value[none]")
+def widget_format_value_none():
+    widget = DateTimeRangeWidget()
+
+    return lambda: widget.format_value(None)
+
+
+@benchmark("widget.render[template]")
+def widget_render_template():
+    widget = DateTimeRangeWidget(fast_render=False)
+    time_range = future_range()
+
+    return lambda: widget.render("time_range", time_range, {"id": "id_time_range"})
+
+
+@benchmark("widget.render[fast]")
+def widget_render_fast():
+    widget = DateTimeRangeWidget(fast_render=True)
+    time_range = future_range()
+
+    return lambda: widget.render("time_range", time_range, {"id": "id_time_range"})
+
+
+@benchmark("time_range_generator[input]")
+def time_range_generator_input():
+    start, end = future_range()
+
+    return lambda: time_range_generator(start, end)
+
+
+@benchmark("time_range_generator[html]")
+def time_range_generator_html():
+    start, end = future_range()
+
+    return lambda: time_range_generator(start, end, html=True)
+
+
+@benchmark("format_time_range[input]")
+def format_time_range_input():
+    start, end = future_range()
+
+    return lambda: format_time_range(start, end)
+
+
+@benchmark("format_time_range[html]")
+def format_time_range_html():
+    start, end = future_range()
+
+    return lambda: format_time_range(start, end, html=True)
+
+
+@benchmark("form.construct")
+def form_construct():
+    return EventForm
+
+
+@benchmark("form.construct[instance]")
+def form_construct_instance():
+    start, end = future_range()
+    event = Event.objects.create(
+        title="Benchmark Event", time_start=start, time_end=end
+    )
+
+    return lambda: EventForm(instance=event)
+
+
+@benchmark("formset.construct[100]")
+def formset_construct():
+    formset_class = modelformset_factory(
+        Event, form=EventForm, formset=TimeRangedModelFormSet, extra=100
+    )
+
+    return lambda: formset_class(queryset=Event.objects.none()).forms
+
+
+@benchmark("form.is_valid")
+def form_is_valid():
+    data = event_data()
+
+    return lambda: EventForm(data).is_valid()
+
+
+@benchmark("form.save")
+def form_save():
+    data = event_data()
+
+    def save():
+        form = EventForm(data)
+        form.is_valid()
+        form.save()
+
+    return save
+
+
+@benchmark("view.home")
+def view_home():
+    start, end = future_range()
+
+    Event.objects.bulk_create(
+        Event(title="Benchmark Event {}".format(i), time_start=start, time_end=end)
+        for i in range(100)
+    )
+
+    # bulk_create sends no signals, so record the change by hand.
+    watermarks.touch(watermarks.EVENTS)
+
+    client = Client()
+    url = reverse("simpleapp:home")
+
+    return lambda: client.get(url)
+
+
+@benchmark("view.create_event[get]")
+def view_create_event_get():
+    client = Client()
+    url = reverse("simpleapp:create_event")
+
+    return lambda: client.get(url)
+
+
+@benchmark("view.create_event[post]")
+def view_create_event_post():
+    client = Client()
+    url = reverse("simpleapp:create_event")
+    counter = itertools.count()
+
+    def post():
+        data = event_data()
+        data["title"] += " {}".format(next(counter))
+
+        client.post(url, data)
+
+    return post
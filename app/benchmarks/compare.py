@@ -0,0 +1,84 @@
+# File: benchmarks/compare.py
+
+"""
+Compare two result files written by ``python -m benchmarks -o`` and flag the
+benchmarks whose median time got worse by more than a threshold.
+
+Run from the app/ directory:
+
+    python -m benchmarks.compare base.json head.json [--threshold 10]
+
+Exits with status 1 if any benchmark regressed.
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(base, head, threshold):
+    """
+    Return (name, base median, head median, change) tuples for every benchmark
+    in both result sets, and the names of those that regressed by more than
+    threshold percent.
+
+    """
+    rows = []
+    regressions = []
+
+    for name in sorted(set(base["results"]) & set(head["results"])):
+        base_median = base["results"][name]["median"]
+        head_median = head["results"][name]["median"]
+        change = (head_median - base_median) / base_median * 100
+
+        rows.append((name, base_median, head_median, change))
+
+        if change > threshold:
+            regressions.append(name)
+
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="Percentage slowdown that counts as a regression.",
+    )
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows, regressions = compare(base, head, args.threshold)
+
+    for name, base_median, head_median, change in rows:
+        print(
+            "{:<32} {:10.2f} us -> {:10.2f} us  {:+7.1f}%{}".format(
+                name,
+                base_median * 1e6,
+                head_median * 1e6,
+                change,
+                "  REGRESSION" if name in regressions else "",
+            )
+        )
+
+    for name in sorted(set(base["results"]) ^ set(head["results"])):
+        print(
+            "{:<32} only in {}".format(
+                name, "base" if name in base["results"] else "head"
+            )
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
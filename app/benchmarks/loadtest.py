@@ -0,0 +1,205 @@
+# File: benchmarks/loadtest.py
+
+"""
+A small HTTP load generator for comparing how many concurrent clients the WSGI
+and ASGI deployments can serve. It only uses the standard library, so it
+measures the server rather than the client.
+
+Serve the app both ways from the app/ directory, with the same number of
+worker processes, e.g.
+
+    gunicorn core.wsgi:application --workers 4 --bind 127.0.0.1:8001
+    uvicorn core.asgi:application --workers 4 --port 8002 --no-access-log
+
+then point the load test at the sync and async views:
+
+    python -m benchmarks.loadtest http://127.0.0.1:8001/ \\
+        --concurrency 1,16,64,256 --slow-clients 32
+    python -m benchmarks.loadtest http://127.0.0.1:8002/async/ \\
+        --concurrency 1,16,64,256 --slow-clients 32
+
+Each level runs --concurrency clients sending requests back to back for
+--duration seconds, and reports throughput and latency percentiles. Slow
+clients trickle their request headers in for the whole run, the way clients on
+bad connections do: a sync worker is tied up by each of them, whereas the
+event loop of an ASGI server just waits for their bytes to arrive.
+"""
+
+from urllib.parse import urlsplit
+
+import argparse
+import asyncio
+import statistics
+import time
+
+
+class Stats(object):
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+
+def build_request(url):
+    parts = urlsplit(url)
+    path = parts.path or "/"
+
+    if parts.query:
+        path += "?" + parts.query
+
+    return (
+        "GET {} HTTP/1.1\r\nHost: {}\r\nConnection: close\r\n\r\n".format(
+            path, parts.netloc
+        )
+    ).encode("ascii")
+
+
+async def fetch(host, port, request):
+    """ Send one request and return its status code. """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        writer.write(request)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+
+    return int(status_line.split()[1])
+
+
+async def client(host, port, request, deadline, stats, timeout):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+
+        try:
+            status = await asyncio.wait_for(fetch(host, port, request), timeout)
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+            stats.errors += 1
+            continue
+
+        if status >= 400:
+            stats.errors += 1
+        else:
+            stats.latencies.append(time.perf_counter() - start)
+
+
+async def slow_client(host, port, request, deadline):
+    """ Trickle a request in one byte at a time until the deadline. """
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return
+
+    # Hold back the blank line that ends the headers until the run is over.
+    head, tail = request[:-2], request[-2:]
+    delay = max(deadline - time.perf_counter(), 0) / len(head)
+
+    try:
+        for i in range(len(head)):
+            writer.write(head[i : i + 1])
+            await writer.drain()
+            await asyncio.sleep(delay)
+
+        writer.write(tail)
+        await writer.drain()
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_level(url, concurrency, duration, slow_clients, timeout):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    request = build_request(url)
+    stats = Stats()
+
+    deadline = time.perf_counter() + duration
+    slow = [
+        asyncio.ensure_future(slow_client(host, port, request, deadline))
+        for _ in range(slow_clients)
+    ]
+
+    # Give the slow clients a head start so they occupy their workers first.
+    await asyncio.sleep(min(0.5, duration / 10))
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            client(host, port, request, deadline, stats, timeout)
+            for _ in range(concurrency)
+        ]
+    )
+    elapsed = time.perf_counter() - start
+
+    for task in slow:
+        task.cancel()
+
+    await asyncio.gather(*slow, return_exceptions=True)
+
+    return stats, elapsed
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+
+    if len(values) == 1:
+        return values[0]
+
+    return statistics.quantiles(values, n=100, method="inclusive")[
+        int(fraction * 100) - 1
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("url")
+    parser.add_argument(
+        "--concurrency",
+        default="1,16,64,256",
+        help="comma-separated numbers of concurrent clients (default: %(default)s)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--slow-clients",
+        type=int,
+        default=0,
+        help="clients that trickle their request in during each level",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=5.0,
+        help="seconds after which a request counts as an error",
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        "{:>11} {:>10} {:>10} {:>10} {:>8}".format(
+            "concurrency", "req/s", "p50 ms", "p99 ms", "errors"
+        )
+    )
+
+    for concurrency in [int(n) for n in args.concurrency.split(",")]:
+        stats, elapsed = asyncio.run(
+            run_level(
+                args.url, concurrency, args.duration, args.slow_clients, args.timeout
+            )
+        )
+
+        print(
+            "{:>11} {:>10.1f} {:>10.2f} {:>10.2f} {:>8}".format(
+                concurrency,
+                len(stats.latencies) / elapsed,
+                percentile(stats.latencies, 0.5) * 1e3,
+                percentile(stats.latencies, 0.99) * 1e3,
+                stats.errors,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# File: benchmarks/suite.py
+
+"""
+A small registry and timer for the benchmark suite run by
+``python -m benchmarks``.
+"""
+
+import statistics
+import timeit
+
+# Benchmark name -> setup function
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark under the given name.
+
+    The decorated function is called once to do any setup, and must return the
+    zero-argument callable that is actually timed.
+
+    """
+
+    def decorator(setup):
+        if name in BENCHMARKS:
+            raise ValueError("Duplicate benchmark name: {}".format(name))
+
+        BENCHMARKS[name] = setup
+
+        return setup
+
+    return decorator
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """
+    Time func, returning per-call statistics in seconds.
+
+    The number of calls per round is picked like ``python -m timeit`` does, so
+    that each of the repeat rounds takes at least min_time.
+
+    """
+    timer = timeit.Timer(func)
+
+    number = 1
+
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+
+        number *= 2
+
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    median = statistics.median(timings)
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "best": min(timings),
+        "median": median,
+        "ops_per_sec": 1 / median,
+    }
@@ -34,7 +34,7 @@ ALLOWED_HOSTS = []
 
 INSTALLED_APPS = [
     "daterangepicker",
-    "simpleapp",
+    "simpleapp.apps.SimpleAppConfig",
     # third-party libs
     "bootstrapform",
     # Django builtins
@@ -47,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Reports per-request phase timings in a Server-Timing header and log line.
+    "daterangepicker.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,6 +77,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
 
 
 # Database
@@ -119,3 +122,40 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/2.0/howto/static-files/
 
 STATIC_URL = "/static/"
+
+STATIC_ROOT = os.path.join(BASE_DIR, "static")
+
+# Outside of development, collectstatic gives every file a content-hashed name,
+# so that it can be served with a far-future, immutable Cache-Control header.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage",},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        if DEBUG
+        else "django.contrib.staticfiles.storage.ManifestStaticFilesStorage",
+    },
+}
+
+
+# Events listing
+# Number of events shown per page on the home page.
+
+SIMPLEAPP_EVENTS_PER_PAGE = 25
+
+# Seconds the rendered event list is fresh for, and whether an outdated copy
+# may be served (for up to simpleapp.caching.STALE_TIMEOUT seconds more) while
+# a single request re-renders it.
+
+SIMPLEAPP_EVENT_LIST_CACHE_TIMEOUT = 300
+
+SIMPLEAPP_EVENT_LIST_STALE_WHILE_REVALIDATE = True
+
+# Seconds free/busy windows are cached for, as are the per-day tokens they are
+# cached under.
+
+SIMPLEAPP_FREEBUSY_CACHE_TIMEOUT = 300
+
+# Days ahead up to which the occurrences of recurring events are materialised.
+# Run the refresh_occurrences command daily to move the horizon forward.
+
+SIMPLEAPP_OCCURRENCE_HORIZON_DAYS = 365
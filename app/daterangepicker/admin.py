@@ -0,0 +1,123 @@
+# File: daterangepicker/admin.py
+
+"""
+Admin support for TimeRangeField: a changelist filter that narrows the rows
+down to those overlapping a range picked with DateTimeRangeWidget, e.g.
+
+    class EventAdmin(admin.ModelAdmin):
+        list_filter = [("time_range", TimeRangeListFilter)]
+
+        @property
+        def media(self):
+            return super(EventAdmin, self).media + admin_media()
+"""
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from daterangepicker.assets import BUNDLE_CSS, BUNDLE_JS
+from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.widgets import DateTimeRangeWidget
+
+
+def admin_media():
+    """
+    The media a ModelAdmin needs for DateTimeRangeWidget, in its changelist
+    filter or its forms.
+
+    The widget's bundle expects jQuery as a global, which the admin's
+    jquery.init.js takes away again, so the bundle is ordered between the
+    two, as the admin does for its own autocomplete widget.
+
+    """
+    extra = "" if settings.DEBUG else ".min"
+
+    return forms.Media(
+        js=[
+            "admin/js/vendor/jquery/jquery{}.js".format(extra),
+            BUNDLE_JS,
+            "admin/js/jquery.init.js",
+        ],
+        css={"all": [BUNDLE_CSS,]},
+    )
+
+
+class TimeRangeListFilter(admin.FieldListFilter):
+    """
+    Filter a changelist on a TimeRangeField by a range entered with a
+    DateTimeRangeWidget. The range is passed as <field>__overlaps, so the
+    query is the two column comparisons of the overlaps lookup, which the
+    model's (time_start, time_end) index answers.
+
+    The ModelAdmin has to add admin_media() to its media for the picker.
+
+    """
+
+    template = "daterangepicker/admin/time_range_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = "{}__overlaps".format(field_path)
+        self.form_field = DateTimeRangeField(allow_past=True)
+
+        super(TimeRangeListFilter, self).__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+        # Django 5.0+ gives every parameter as a list of values, and earlier
+        # versions as a string.
+        value = self.used_parameters.get(self.lookup_kwarg, "")
+
+        if isinstance(value, list):
+            value = value[-1] if value else ""
+
+        self.lookup_val = value
+        self.hidden_params = []
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def queryset(self, request, queryset):
+        if not self.lookup_val:
+            return queryset
+
+        try:
+            time_range = self.form_field.clean(self.lookup_val)
+        except ValidationError as e:
+            raise IncorrectLookupParameters(e)
+
+        return queryset.filter(**{self.lookup_kwarg: time_range})
+
+    def get_facet_counts(self, pk_attname, filtered_qs):
+        # Facets are new in Django 5.0. A range typed in by hand has no
+        # choices to count rows for.
+        return {}
+
+    def choices(self, changelist):
+        # The form resubmits the other filters and the ordering as they are.
+        # ChangeList.filter_params, with every value, is new in Django 5.0.
+        params = getattr(changelist, "filter_params", None)
+
+        if params is None:
+            params = {name: [value] for name, value in changelist.params.items()}
+
+        self.hidden_params = [
+            (name, value)
+            for name, values in params.items()
+            if name != self.lookup_kwarg
+            for value in values
+        ]
+
+        yield {
+            "selected": not self.lookup_val,
+            "query_string": changelist.get_query_string(remove=[self.lookup_kwarg]),
+            "display": _("All"),
+        }
+
+    def widget_html(self):
+        widget = DateTimeRangeWidget(attrs={"id": "id_{}".format(self.lookup_kwarg)})
+
+        return widget.render(self.lookup_kwarg, self.lookup_val)
@@ -0,0 +1,96 @@
+# File: daterangepicker/assets.py
+
+"""
+The bundled front-end assets of DateTimeRangeWidget.
+
+moment.js and daterangepicker.js are vendored, already minified, under
+static/daterangepicker/vendor. They are concatenated with the minified
+js/script.js into one JS bundle, and css/styles.css is minified into one CSS
+bundle, so a page using the widget needs no CDN and, once the bundles get
+content-hashed names from ManifestStaticFilesStorage, can cache them for good.
+
+The bundles are committed. After changing one of the sources, rebuild them
+from the app/ directory with
+
+    python3 -m daterangepicker.assets
+"""
+
+import os
+import re
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+BUNDLE_JS = "daterangepicker/dist/daterangepicker.min.js"
+BUNDLE_CSS = "daterangepicker/dist/daterangepicker.min.css"
+
+# Each bundle and its sources, in order, relative to STATIC_DIR.
+BUNDLES = {
+    BUNDLE_JS: [
+        "daterangepicker/vendor/moment.min.js",
+        "daterangepicker/vendor/daterangepicker.min.js",
+        "daterangepicker/js/script.js",
+    ],
+    BUNDLE_CSS: ["daterangepicker/css/styles.css",],
+}
+
+
+def minify_js(source):
+    """
+    Drop the comment lines and indentation of a script. This is only meant
+    for script.js, which has no comments or strings that could be mistaken
+    for one another.
+
+    """
+    lines = (line.strip() for line in source.splitlines())
+
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def minify_css(source):
+    """ Drop the comments and redundant whitespace of a stylesheet. """
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    source = re.sub(r" ?([{}:;,>]) ?", r"\1", source)
+
+    return source.replace(";}", "}").strip()
+
+
+def read_source(path):
+    with open(os.path.join(STATIC_DIR, path), encoding="utf-8") as f:
+        source = f.read()
+
+    if ".min." in path:
+        return source.strip()
+
+    return minify_css(source) if path.endswith(".css") else minify_js(source)
+
+
+def build_bundle(name):
+    """ Return the contents of the named bundle, built from its sources. """
+    sources = [read_source(path) for path in BUNDLES[name]]
+
+    # Scripts are separated by a semicolon in case one leaves a statement open.
+    separator = ";\n" if name.endswith(".js") else "\n"
+
+    return separator.join(sources) + "\n"
+
+
+def build():
+    """ Write every bundle under STATIC_DIR, returning their paths. """
+    paths = []
+
+    for name in BUNDLES:
+        path = os.path.join(STATIC_DIR, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build_bundle(name))
+
+        paths.append(path)
+
+    return paths
+
+
+if __name__ == "__main__":
+    for path in build():
+        print("Wrote {}".format(path))
@@ -0,0 +1,101 @@
+# File: daterangepicker/conflicts.py
+
+"""
+Detection of overlapping time ranges among model instances with time_start and
+time_end fields, as edited by TimeRangedModelForm.
+
+Ranges are half-open, [time_start, time_end), so an event may start at the very
+moment another one ends.
+"""
+
+import heapq
+
+
+def overlapping(queryset, time_start, time_end):
+    """ Filter queryset down to the rows overlapping [time_start, time_end). """
+    return queryset.filter(time_start__lt=time_end, time_end__gt=time_start)
+
+
+def sweep_conflicts(candidates, existing=()):
+    """
+    Return, for each of the candidates, the list of other candidates and
+    existing objects whose time range overlaps its own. Overlaps among the
+    existing objects themselves are not looked for.
+
+    All objects need time_start and time_end attributes. The intervals are
+    sorted once and swept in order of their start while keeping the ones still
+    open in heaps keyed on their end, so this takes O(N log N) time plus the
+    number of conflicts found.
+
+    """
+    candidates = list(candidates)
+    existing = list(existing)
+
+    intervals = sorted(
+        [(c.time_start, c.time_end, True, i) for i, c in enumerate(candidates)]
+        + [(e.time_start, e.time_end, False, i) for i, e in enumerate(existing)],
+        key=lambda interval: (interval[0], interval[1]),
+    )
+
+    conflicts = [[] for _ in candidates]
+
+    # Heaps of (time_end, time_start, index) for the intervals still open.
+    open_candidates = []
+    open_existing = []
+
+    for time_start, time_end, is_candidate, index in intervals:
+        for heap in (open_candidates, open_existing):
+            while heap and heap[0][0] <= time_start:
+                heapq.heappop(heap)
+
+        # Every open interval started no later than this one and ends after it
+        # starts, so it overlaps unless this one is empty and starts at the
+        # same moment.
+        for other_end, other_start, other in open_candidates:
+            if other_start < time_end:
+                if is_candidate:
+                    conflicts[index].append(candidates[other])
+                    conflicts[other].append(candidates[index])
+                else:
+                    conflicts[other].append(existing[index])
+
+        if is_candidate:
+            for other_end, other_start, other in open_existing:
+                if other_start < time_end:
+                    conflicts[index].append(existing[other])
+
+            heapq.heappush(open_candidates, (time_end, time_start, index))
+        else:
+            heapq.heappush(open_existing, (time_end, time_start, index))
+
+    return conflicts
+
+
+def find_conflicts(queryset, candidates, owner="pk"):
+    """
+    Return, for each of the candidates, the list of rows in queryset and other
+    candidates whose time range overlaps its own.
+
+    The rows are fetched with a single range query covering all candidates,
+    and the overlaps found with sweep_conflicts. Candidates that are already
+    saved are not reported as conflicting with their own rows: those whose
+    owner attribute, the primary key by default, is the pk of a candidate.
+    Rows such as the occurrences of a series can name theirs with e.g.
+    owner="event_id".
+
+    """
+    candidates = list(candidates)
+
+    if not candidates:
+        return []
+
+    rows = overlapping(
+        queryset,
+        min(c.time_start for c in candidates),
+        max(c.time_end for c in candidates),
+    )
+    pks = {c.pk for c in candidates if c.pk is not None}
+
+    return sweep_conflicts(
+        candidates, [row for row in rows if getattr(row, owner) not in pks]
+    )
@@ -1,11 +1,17 @@
 # File: daterangepicker/fields.py
 from django.forms import ValidationError
-from django.forms.fields import DateTimeField, MultiValueField
+from django.forms.fields import DateTimeField, Field, MultiValueField
 
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from daterangepicker.utils import DATETIME_INPUT_FORMAT
+from daterangepicker.utils import (
+    DATETIME_INPUT_FORMAT,
+    TIME_RANGE_SEPARATOR,
+    parse_time_range,
+)
+from daterangepicker.timerange import TimeRange
+from daterangepicker.timing import phase
 from daterangepicker.widgets import DateTimeRangeWidget
 
 
@@ -35,42 +41,160 @@ class DateTimeRangeField(MultiValueField):
         # Allow a time_range to be in the past
         self.allow_past = allow_past
 
+        # A (time_range_str, time_range, error) result recorded by preclean().
+        self.precleaned = None
+
+    def __deepcopy__(self, memo):
+        """
+        Copy the field for a new form instance. The two DateTimeFields are
+        never changed after __init__, so unlike MultiValueField, the copies
+        share them instead of deep-copying both.
+
+        """
+        return Field.__deepcopy__(self, memo)
+
     def clean(self, time_range_str):
-        try:
-            time_range_tokens = time_range_str.split(" - ")
+        if self.precleaned is not None and self.precleaned[0] == time_range_str:
+            time_range, error = self.precleaned[1:]
 
-            start_time_str, end_time_str, *extra = time_range_tokens
+            if error is not None:
+                raise error
 
-            if extra:
-                raise ValidationError(_("Expected exactly two dates."))
+            return time_range
 
-        except ValueError:
-            raise ValidationError(_("Expected more than one date."))
+        with phase("clean"):
+            time_range = self.to_time_range(time_range_str)
 
-        start_time, end_time = super(DateTimeRangeField, self).clean(
-            (start_time_str, end_time_str)
-        )
+            self.validate_time_range(*time_range)
+
+        return time_range
+
+    def clean_batch(self, time_range_strs, now=None):
+        """
+        Clean many time range strings at once.
+
+        The current time is looked up once for the whole batch (or taken from
+        now, if given) and errors are collected instead of raised. Returns a
+        (time_ranges, errors) pair of lists with one entry per input string:
+        either the cleaned TimeRange and None, or None and the
+        ValidationError for that string.
+
+        """
+        if now is None and not self.allow_past:
+            now = timezone.now()
+
+        time_ranges = []
+        errors = []
+
+        for time_range_str in time_range_strs:
+            try:
+                time_range = self.to_time_range(time_range_str)
+                self.validate_time_range(*time_range, now=now)
+            except ValidationError as e:
+                time_ranges.append(None)
+                errors.append(e)
+            else:
+                time_ranges.append(time_range)
+                errors.append(None)
+
+        return time_ranges, errors
+
+    def preclean(self, time_range_str, time_range, error=None):
+        """
+        Record the result of cleaning time_range_str elsewhere, typically with
+        clean_batch, so that clean() returns (or raises) it without doing the
+        work again. Cleaning any other string is unaffected.
+
+        """
+        self.precleaned = (time_range_str, time_range, error)
+
+    def to_time_range(self, time_range_str):
+        """
+        Convert a time range string into a TimeRange of date/times, without
+        checking that the range itself makes sense.
+
+        """
+        time_range = None
+
+        # Try the fast path first; it only understands the exact formats the
+        # date range picker emits, so anything else goes through the regular
+        # MultiValueField cleaning.
+        if isinstance(time_range_str, str):
+            time_range = parse_time_range(time_range_str)
+
+        if time_range is None:
+            return self.clean_fields(time_range_str)
 
-        # Validate that a range of two date/times makes logical sense.
+        self.run_validators(time_range)
+
+        return time_range
+
+    def validate_time_range(self, start_time, end_time, now=None):
+        """
+        Validate that a range of two date/times makes logical sense and, unless
+        allow_past is set, that it does not start before now.
+
+        """
         if end_time < start_time:
             raise ValidationError(_("End date is before start date."))
 
         if not self.allow_past:
-            now = timezone.now().replace(microsecond=0, second=0)
+            if now is None:
+                now = timezone.now()
+
+            now = now.replace(microsecond=0, second=0)
 
             # Validate that a range of two date/times is not in the past.
             if start_time < now:
                 raise ValidationError(_("Start date is in the past."))
 
-        return start_time, end_time
+    def clean_fields(self, time_range_str):
+        """
+        Clean a time range string by handing each date/time in it to its own
+        DateTimeField.
+
+        """
+        if time_range_str is None:
+            time_range_str = ""
+
+        # Rows decoded from JSON, for one, may hold any type.
+        if not isinstance(time_range_str, str):
+            raise ValidationError(_("Expected a string of two dates."))
 
-    def compress(self, data_list):
         try:
-            start_time, end_time, *extra = data_list
-        except (KeyError, ValueError):
+            time_range_tokens = time_range_str.split(TIME_RANGE_SEPARATOR)
+
+            start_time_str, end_time_str, *extra = time_range_tokens
+
+            if extra:
+                raise ValidationError(_("Expected exactly two dates."))
+
+        except ValueError:
+            raise ValidationError(_("Expected more than one date."))
+
+        return super(DateTimeRangeField, self).clean((start_time_str, end_time_str))
+
+    def has_changed(self, initial, data):
+        """
+        Compare the submitted string with the initial range as the widget
+        would display it. (MultiValueField's version expects a MultiWidget.)
+        Without an initial range the widget displays a default one, so a form
+        submitted untouched sends that back.
+
+        """
+        if self.disabled:
+            return False
+
+        if not data and (not initial or None in initial):
+            return False
+
+        return self.widget.format_value(initial) != (data or "")
+
+    def compress(self, data_list):
+        if len(data_list) < 2:
             raise ValidationError(_("Expected two valid dates."))
 
-        if extra:
+        if len(data_list) > 2:
             raise ValidationError(_("Expected exactly two dates."))
 
-        return start_time, end_time
+        return TimeRange._make(data_list)
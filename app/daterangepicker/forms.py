@@ -1,22 +1,78 @@
 # File: daterangepicker/forms.py
-from django.forms import ModelForm
+from asgiref.sync import sync_to_async
+
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.forms import BaseModelFormSet, ModelChoiceField, ModelForm
+from django.forms.models import ModelFormMetaclass
+from django.utils import timezone
 
 from daterangepicker import utils
 from daterangepicker.utils import DATETIME_INPUT_FORMAT, time_range_generator
 
+from daterangepicker.conflicts import find_conflicts, overlapping
 from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.modelfields import TimeRangeField, get_time_range_field
+from daterangepicker.signals import bulk_saved
+from daterangepicker.timerange import TimeRange
+from daterangepicker.timing import phase
 
 __all__ = [
     "TimeRangedModelForm",
+    "TimeRangedModelFormSet",
+    "TimeRange",
     "utils",
     "DATETIME_INPUT_FORMAT",
     "time_range_generator",
 ]
 
 
-class TimeRangedModelForm(ModelForm):
+class TimeRangedModelFormMetaclass(ModelFormMetaclass):
+    """
+    Take time_start and time_end out of the base fields of forms for models
+    without a TimeRangeField, once when the class is created, rather than out
+    of the copied fields of every form instance.
+
+    """
+
+    def __new__(mcs, name, bases, attrs):
+        new_class = super(TimeRangedModelFormMetaclass, mcs).__new__(
+            mcs, name, bases, attrs
+        )
+
+        model = new_class._meta.model
+
+        if model is not None and get_time_range_field(model) is None:
+            new_class.base_fields.pop("time_start", None)
+            new_class.base_fields.pop("time_end", None)
+
+        return new_class
+
+
+class TimeRangedModelForm(ModelForm, metaclass=TimeRangedModelFormMetaclass):
+    """
+    A model form that edits a model's time_start and time_end fields through a
+    single time_range field.
+
+    If the model has a TimeRangeField, the form maps to it like any other
+    model field. Otherwise time_start and time_end are taken out of the form
+    and set from time_range on save.
+
+    """
+
     time_range = DateTimeRangeField()
 
+    # Set to True in a subclass to reject time ranges that overlap those of
+    # the instances returned by conflict_queryset().
+    check_conflicts = False
+
+    # The attribute of the conflict_queryset() rows that holds the pk of the
+    # instance they belong to, so that an instance doesn't conflict with its
+    # own rows.
+    conflict_owner = "pk"
+
     class Meta:
         # Since time_range isn't actually a field in the model, exclude it from
         # being saved into the new model instance.
@@ -27,10 +83,10 @@ class TimeRangedModelForm(ModelForm):
     def __init__(self, *args, **kwargs):
         super(TimeRangedModelForm, self).__init__(*args, **kwargs)
 
-        # Get rid of time_start and time_end fields, which should still have
-        # been in the subclass's Meta.fields list.
-        self.fields.pop("time_start", None)
-        self.fields.pop("time_end", None)
+        # time_start and time_end are already out of the fields; see
+        # TimeRangedModelFormMetaclass.
+        if get_time_range_field(self._meta.model) is not None:
+            return
 
         time_start = self.initial.pop("time_start", None)
         time_end = self.initial.pop("time_end", None)
@@ -38,21 +94,416 @@ class TimeRangedModelForm(ModelForm):
         # Set a default time_range if it was not already provided.
         self.initial.setdefault("time_range", (time_start, time_end))
 
+    def conflict_queryset(self):
+        """ The instances that the time range may not overlap. """
+        return self._meta.model._default_manager.all()
+
+    def conflict_ranges(self, time_range):
+        """
+        The time ranges to check for conflicts, in order of their start: just
+        the form's time_range, unless a subclass repeats it.
+
+        """
+        return [time_range]
+
+    def clean(self):
+        cleaned_data = super(TimeRangedModelForm, self).clean()
+
+        if self.check_conflicts and cleaned_data.get("time_range"):
+            time_ranges = self.conflict_ranges(cleaned_data["time_range"])
+            queryset = self.conflict_queryset()
+
+            if self.instance.pk is not None:
+                queryset = queryset.exclude(**{self.conflict_owner: self.instance.pk})
+
+            if len(time_ranges) == 1:
+                time_start, time_end = time_ranges[0]
+                conflict = (
+                    overlapping(queryset, time_start, time_end)
+                    .order_by("time_start")
+                    .first()
+                )
+            else:
+                # One range query and a sweep, rather than a query per range.
+                candidates = [
+                    Candidate(None, time_start, time_end, self)
+                    for time_start, time_end in time_ranges
+                ]
+                conflict = min(
+                    (
+                        row
+                        for conflicts in find_conflicts(queryset, candidates)
+                        for row in conflicts
+                        if not isinstance(row, Candidate)
+                    ),
+                    key=lambda row: row.time_start,
+                    default=None,
+                )
+
+            if conflict is not None:
+                self.add_error(
+                    "time_range",
+                    ValidationError(
+                        "Overlaps with %(conflict)s.",
+                        code="conflict",
+                        params={"conflict": conflict},
+                    ),
+                )
+
+        return cleaned_data
+
+    async def ais_valid(self):
+        """
+        Async version of is_valid. Validation runs in a thread, since model
+        validation may query the database (unique checks, choice lookups and
+        conflict checks) even when check_conflicts is off.
+
+        """
+        return await sync_to_async(self.is_valid)()
+
     def save(self, commit=True):
         """ 
         Extend saving such that time_start and time_end values are manually
         set in the model instance. 
         
         """
-        super(TimeRangedModelForm, self).save(commit=False)
+        with phase("save"):
+            self._set_time_range()
+
+            if commit:
+                self.instance.save()
+                self.save_m2m()
+
+        return self.instance
+
+    async def asave(self, commit=True):
+        """
+        Async version of save, for use in async views. Only the database
+        writes are handed off to a thread.
+
+        """
+        with phase("save"):
+            self._set_time_range()
 
-        time_start, time_end = self.cleaned_data["time_range"]
+            if commit:
+                await self.instance.asave()
 
-        self.instance.time_start = time_start
-        self.instance.time_end = time_end
+                opts = self.instance._meta
 
-        if commit:
-            self.instance.save()
-            self.save_m2m()
+                # Saving a TimeRangeField's form data doesn't touch the
+                # database, so only other relations need a thread.
+                if opts.many_to_many or any(
+                    not isinstance(f, TimeRangeField) for f in opts.private_fields
+                ):
+                    await sync_to_async(self.save_m2m)()
+                else:
+                    self.save_m2m()
 
         return self.instance
+
+    def _set_time_range(self):
+        super(TimeRangedModelForm, self).save(commit=False)
+
+        time_range = self.cleaned_data["time_range"]
+        field = get_time_range_field(self._meta.model)
+
+        # A TimeRangeField is normally set by construct_instance already, but
+        # not if the subclass's Meta excludes time_range.
+        if field is not None:
+            field.save_form_data(self.instance, time_range)
+        else:
+            self.instance.time_start, self.instance.time_end = time_range
+
+
+# A form's time range as handed to find_conflicts.
+Candidate = namedtuple("Candidate", ["pk", "time_start", "time_end", "form"])
+
+
+class FetchedModelChoiceField(ModelChoiceField):
+    """
+    The primary key field of a TimeRangedModelFormSet form. It looks the
+    submitted key up among the instances the formset has already fetched,
+    rather than with a query per form.
+
+    """
+
+    def __init__(self, formset, *args, **kwargs):
+        super(FetchedModelChoiceField, self).__init__(*args, **kwargs)
+        self.formset = formset
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+
+        instance = self.formset.fetched_instances().get(str(value))
+
+        if instance is None:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+        return instance
+
+
+class TimeRangedModelFormSet(BaseModelFormSet):
+    """
+    A model formset for TimeRangedModelForm subclasses, e.g.
+
+        EventFormSet = modelformset_factory(
+            Event, form=EventForm, formset=TimeRangedModelFormSet
+        )
+
+    that costs the same number of queries however many forms are submitted:
+
+    - The time_range of every form is cleaned by its own field, but against
+      a single "now".
+    - If the form class has check_conflicts set, the time ranges are checked
+      against conflict_queryset() and each other with one find_conflicts
+      query, instead of one query per form. Each form's conflict_ranges()
+      are checked, and a form's ranges never conflict with each other.
+    - save() creates the new instances with one bulk_create and updates the
+      changed ones with one bulk_update, in one transaction. Since neither
+      sends post_save, bulk_saved is sent instead. That needs a database
+      that returns the primary keys of bulk-inserted rows; on others, each
+      instance is saved on its own, sending post_save.
+
+    Deleted forms are deleted with one queryset delete(), which still sends
+    the delete signals for each instance.
+
+    """
+
+    def _construct_form(self, i, **kwargs):
+        form = super(TimeRangedModelFormSet, self)._construct_form(i, **kwargs)
+
+        # Conflicts are checked for all forms at once in clean().
+        form.check_conflicts = False
+
+        return form
+
+    def add_fields(self, form, index):
+        super(TimeRangedModelFormSet, self).add_fields(form, index)
+
+        pk_field = form.fields[self._pk_field.name]
+
+        # Only submitted forms are cleaned, so others keep the plain field.
+        if self.is_bound and type(pk_field) is ModelChoiceField:
+            form.fields[self._pk_field.name] = FetchedModelChoiceField(
+                self,
+                pk_field.queryset,
+                initial=pk_field.initial,
+                required=False,
+                widget=pk_field.widget,
+            )
+
+    def fetched_instances(self):
+        """ The instances of the formset's queryset, by primary key string. """
+        if not hasattr(self, "_fetched_instances"):
+            self._fetched_instances = {
+                str(instance.pk): instance for instance in self.get_queryset()
+            }
+
+        return self._fetched_instances
+
+    def full_clean(self):
+        if self.is_bound:
+            self.preclean_time_ranges()
+
+        super(TimeRangedModelFormSet, self).full_clean()
+
+    def preclean_time_ranges(self, now=None):
+        """
+        Clean the submitted time_range of every form against one shared now,
+        and record the results on the forms' fields for their own cleaning to
+        pick up. Each form's own field does the cleaning, so settings such as
+        allow_past may differ from form to form.
+
+        """
+        fields = []
+
+        for form in self.forms:
+            field = form.fields.get("time_range")
+
+            if isinstance(field, DateTimeRangeField) and not field.disabled:
+                fields.append((field, form["time_range"].data))
+
+        if not fields:
+            return
+
+        if now is None:
+            now = timezone.now()
+
+        for field, value in fields:
+            time_ranges, errors = field.clean_batch([value], now=now)
+
+            field.preclean(value, time_ranges[0], errors[0])
+
+    def clean(self):
+        super(TimeRangedModelFormSet, self).clean()
+
+        if not self.forms or not self.form.check_conflicts:
+            return
+
+        # deleted_forms is empty until the formset is valid, which it isn't yet.
+        deleted = [
+            form
+            for form in self.forms
+            if self.can_delete and self._should_delete_form(form)
+        ]
+        candidates = []
+
+        for form in self.forms:
+            if form in deleted or not hasattr(form, "cleaned_data"):
+                continue
+
+            time_range = form.cleaned_data.get("time_range")
+
+            if time_range:
+                candidates.extend(
+                    Candidate(form.instance.pk, time_start, time_end, form)
+                    for time_start, time_end in form.conflict_ranges(time_range)
+                )
+
+        if not candidates:
+            return
+
+        owner = self.form.conflict_owner
+        queryset = self.forms[0].conflict_queryset()
+        deleted_pks = [form.instance.pk for form in deleted if form.instance.pk]
+
+        if deleted_pks:
+            queryset = queryset.exclude(**{owner + "__in": deleted_pks})
+
+        numbers = {id(form): i + 1 for i, form in enumerate(self.forms)}
+        reported = set()
+
+        for candidate, conflicts in zip(
+            candidates, find_conflicts(queryset, candidates, owner=owner)
+        ):
+            conflicts = [
+                c
+                for c in conflicts
+                if not (isinstance(c, Candidate) and c.form is candidate.form)
+            ]
+
+            # A form's ranges come in order, so its first conflict is reported.
+            if not conflicts or id(candidate.form) in reported:
+                continue
+
+            reported.add(id(candidate.form))
+
+            # Report the earliest conflict, preferring saved rows to forms.
+            conflict = min(
+                conflicts, key=lambda c: (c.time_start, isinstance(c, Candidate))
+            )
+
+            if isinstance(conflict, Candidate):
+                error = ValidationError(
+                    "Overlaps with form %(number)s.",
+                    code="conflict",
+                    params={"number": numbers[id(conflict.form)]},
+                )
+            else:
+                error = ValidationError(
+                    "Overlaps with %(conflict)s.",
+                    code="conflict",
+                    params={"conflict": conflict},
+                )
+
+            candidate.form.add_error("time_range", error)
+
+    def save(self, commit=True):
+        """
+        Save the formset's instances with one bulk_create, one bulk_update and
+        one delete in a single transaction. Returns the saved instances.
+
+        """
+        if not commit:
+            return super(TimeRangedModelFormSet, self).save(commit=False)
+
+        if not self.can_bulk_save():
+            with transaction.atomic():
+                return super(TimeRangedModelFormSet, self).save()
+
+        with transaction.atomic():
+            # Each form sets up its instance, timing its own "save" phase.
+            instances = super(TimeRangedModelFormSet, self).save(commit=False)
+
+            with phase("save"):
+                self.save_bulk()
+
+        return instances
+
+    def can_bulk_save(self):
+        """
+        Whether bulk_create sets the primary keys of the new instances, which
+        bulk_saved receivers rely on.
+
+        """
+        db = self.model._default_manager.db
+
+        return connections[db].features.can_return_rows_from_bulk_insert
+
+    def save_bulk(self):
+        """ Write the instances set up by save(commit=False) to the database. """
+        manager = self.model._default_manager
+        created = list(self.new_objects)
+        update_fields = self.changed_model_fields()
+
+        # Forms that only changed fields outside the model leave it as it is.
+        updated = [
+            instance
+            for instance, changed in self.changed_objects
+            if self.changed_model_fields([(instance, changed)])
+        ]
+
+        if self.deleted_objects:
+            manager.filter(
+                pk__in=[instance.pk for instance in self.deleted_objects]
+            ).delete()
+
+        if created:
+            manager.bulk_create(created)
+
+        if updated:
+            manager.bulk_update(updated, update_fields)
+
+        self.save_m2m()
+
+        if created or updated:
+            bulk_saved.send(sender=self.model, created=created, updated=updated)
+
+    def changed_model_fields(self, changed_objects=None):
+        """
+        The names of the concrete model fields changed by any form, or by
+        those of the given (instance, changed field names) pairs, with
+        time_range standing for the time_start and time_end columns.
+
+        """
+        if changed_objects is None:
+            changed_objects = self.changed_objects
+
+        opts = self.model._meta
+        field = get_time_range_field(self.model)
+
+        if field is not None:
+            time_range_fields = [f.name for f in field.column_fields()]
+        else:
+            time_range_fields = ["time_start", "time_end"]
+
+        concrete = {f.name for f in opts.concrete_fields if not f.primary_key}
+        names = []
+
+        for instance, changed in changed_objects:
+            for form_field in changed:
+                if form_field == "time_range":
+                    model_fields = time_range_fields
+                else:
+                    model_fields = [form_field]
+
+                for name in model_fields:
+                    if name in concrete and name not in names:
+                        names.append(name)
+
+        return names
@@ -0,0 +1,58 @@
+# File: daterangepicker/freebusy.py
+
+"""
+Free/busy aggregation: the merged intervals during which at least one model
+instance with time_start and time_end fields is taking place.
+"""
+
+from daterangepicker.conflicts import overlapping
+
+
+def merge_intervals(intervals):
+    """
+    Merge (start, end) pairs sorted by start into the disjoint intervals they
+    cover, in a single pass. Intervals that touch are merged too, and empty
+    ones are dropped.
+
+    """
+    current_start = current_end = None
+
+    for start, end in intervals:
+        if end <= start:
+            continue
+
+        if current_end is not None and start <= current_end:
+            if end > current_end:
+                current_end = end
+
+            continue
+
+        if current_end is not None:
+            yield current_start, current_end
+
+        current_start, current_end = start, end
+
+    if current_end is not None:
+        yield current_start, current_end
+
+
+def busy_intervals(queryset, start, end, chunk_size=2000):
+    """
+    Return the list of merged (start, end) intervals within [start, end)
+    during which a row of queryset is taking place, clipped to the window.
+
+    The rows are streamed in order of time_start, reading only time_start and
+    time_end, so the query can be answered from an index on those columns.
+
+    """
+    rows = (
+        overlapping(queryset, start, end)
+        .order_by("time_start")
+        .values_list("time_start", "time_end")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    return [
+        (max(busy_start, start), min(busy_end, end))
+        for busy_start, busy_end in merge_intervals(rows)
+    ]
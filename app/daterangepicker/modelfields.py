@@ -0,0 +1,276 @@
+# File: daterangepicker/modelfields.py
+
+"""
+Model fields for time ranges.
+
+TimeRangeField manages a time_start and a time_end column as one logical time
+range:
+
+    class Event(models.Model):
+        time_range = TimeRangeField()
+
+adds time_start and time_end DateTimeFields to the model, unless it already
+has them, and makes ``event.time_range`` a TimeRange over the two. The range
+can be filtered on with lookups that compile to plain comparisons on the two
+columns, so they can be answered from ordinary indexes:
+
+    Event.objects.filter(time_range__overlaps=(start, end))
+    Event.objects.filter(time_range__contains=moment)
+    Event.objects.filter(time_range__contained_by=(start, end))
+
+Ranges are half-open, [start, end), as elsewhere in daterangepicker. The field
+itself has no column, so it can't be used in values(), order_by() or update();
+use time_start and time_end for those.
+
+RecurrenceField stores a daterangepicker.recurrence.Recurrence.
+"""
+
+from django import forms
+from django.core import exceptions
+from django.db import models
+from django.db.models import Lookup
+
+from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.recurrence import Recurrence
+from daterangepicker.timerange import TimeRange
+
+
+class TimeRangeDescriptor(object):
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        return TimeRange(
+            getattr(instance, self.field.start_field),
+            getattr(instance, self.field.end_field),
+        )
+
+    def __set__(self, instance, value):
+        start, end = (None, None) if value is None else TimeRange.from_pair(value)
+
+        setattr(instance, self.field.start_field, start)
+        setattr(instance, self.field.end_field, end)
+
+
+class TimeRangeField(models.Field):
+    """
+    A time range stored in the model's start_field and end_field columns.
+
+    Model forms get a DateTimeRangeField for it, and the two columns are not
+    editable on their own.
+
+    """
+
+    concrete = False
+    descriptor_class = TimeRangeDescriptor
+    empty_strings_allowed = False
+
+    def __init__(self, start_field="time_start", end_field="time_end", **kwargs):
+        self.start_field = start_field
+        self.end_field = end_field
+
+        super(TimeRangeField, self).__init__(**kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(TimeRangeField, self).deconstruct()
+
+        if self.start_field != "time_start":
+            kwargs["start_field"] = self.start_field
+
+        if self.end_field != "time_end":
+            kwargs["end_field"] = self.end_field
+
+        return name, path, args, kwargs
+
+    def get_attname_column(self):
+        return self.get_attname(), None
+
+    def contribute_to_class(self, cls, name, private_only=False):
+        # Add the two columns first, unless the model declares or inherits them.
+        if not getattr(self, "mti_inherited", False):
+            local_names = {field.name for field in cls._meta.local_fields}
+
+            for column_name in (self.start_field, self.end_field):
+                if column_name not in local_names:
+                    cls.add_to_class(
+                        column_name, models.DateTimeField(editable=False)
+                    )
+
+        super(TimeRangeField, self).contribute_to_class(cls, name, private_only=True)
+
+        setattr(cls, self.attname, self.descriptor_class(self))
+
+    def column_fields(self):
+        """ Return the start and end DateTimeFields of the model. """
+        opts = self.model._meta
+
+        return opts.get_field(self.start_field), opts.get_field(self.end_field)
+
+    def db_type(self, connection):
+        return None
+
+    def to_python(self, value):
+        if value is None:
+            return value
+
+        try:
+            return TimeRange.from_pair(value)
+        except (TypeError, ValueError):
+            raise exceptions.ValidationError("Expected exactly two dates.")
+
+    def validate(self, value, model_instance):
+        super(TimeRangeField, self).validate(value, model_instance)
+
+        if not self.blank and value is not None and None in value:
+            raise exceptions.ValidationError(
+                self.error_messages["blank"], code="blank"
+            )
+
+    def formfield(self, **kwargs):
+        # Model forms, the admin's among them, edit existing rows too, and
+        # those may well have started already.
+        return super(TimeRangeField, self).formfield(
+            **{"form_class": DateTimeRangeField, "allow_past": True, **kwargs}
+        )
+
+    @classmethod
+    def get_lookups(cls):
+        # Only the TimeRangeLookups: those inherited from Field, such as lt, in
+        # or isnull, would compare the field's own column, which doesn't exist.
+        return {
+            name: lookup
+            for name, lookup in super(TimeRangeField, cls).get_lookups().items()
+            if isinstance(lookup, type) and issubclass(lookup, TimeRangeLookup)
+        }
+
+
+class RecurrenceField(models.TextField):
+    """
+    An optional Recurrence, stored as its rule string. Rows without one hold
+    an empty string and load as None.
+
+    """
+
+    description = "Recurrence rule"
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("default", "")
+
+        super(RecurrenceField, self).__init__(**kwargs)
+
+    def from_db_value(self, value, expression, connection):
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Recurrence):
+            return value
+
+        if not value:
+            return None
+
+        try:
+            return Recurrence.parse(value)
+        except ValueError as e:
+            raise exceptions.ValidationError(str(e), code="invalid")
+
+    def get_prep_value(self, value):
+        value = self.to_python(value)
+
+        return "" if value is None else str(value)
+
+    def value_to_string(self, obj):
+        return self.get_prep_value(self.value_from_object(obj))
+
+    def formfield(self, **kwargs):
+        # A rule is a single line, so don't use TextField's textarea.
+        return super(RecurrenceField, self).formfield(
+            **{"widget": forms.TextInput, **kwargs}
+        )
+
+
+def get_time_range_field(model):
+    """ Return the TimeRangeField of a model, or None if it has none. """
+    for field in model._meta.private_fields:
+        if isinstance(field, TimeRangeField):
+            return field
+
+    return None
+
+
+class TimeRangeLookup(Lookup):
+    """
+    A lookup on a TimeRangeField, compiled straight to comparisons on its two
+    columns.
+
+    """
+
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        field = self.lhs.output_field
+        start_field, end_field = field.column_fields()
+
+        qn = connection.ops.quote_name
+        prefix = ""
+
+        if self.lhs.alias:
+            prefix = compiler.quote_name_unless_alias(self.lhs.alias) + "."
+
+        sql, values = self.range_sql(
+            prefix + qn(start_field.column), prefix + qn(end_field.column), self.rhs
+        )
+
+        return sql, [start_field.get_db_prep_value(v, connection) for v in values]
+
+    def range_sql(self, start, end, value):
+        """ Return the SQL condition and its values for the given columns. """
+        raise NotImplementedError
+
+
+@TimeRangeField.register_lookup
+class TimeRangeExact(TimeRangeLookup):
+    lookup_name = "exact"
+
+    def range_sql(self, start, end, value):
+        value = TimeRange.from_pair(value)
+
+        return "{} = %s AND {} = %s".format(start, end), [value.start, value.end]
+
+
+@TimeRangeField.register_lookup
+class TimeRangeOverlaps(TimeRangeLookup):
+    lookup_name = "overlaps"
+
+    def range_sql(self, start, end, value):
+        value = TimeRange.from_pair(value)
+
+        return "{} < %s AND {} > %s".format(start, end), [value.end, value.start]
+
+
+@TimeRangeField.register_lookup
+class TimeRangeContains(TimeRangeLookup):
+    """ Ranges containing either a date/time or all of another range. """
+
+    lookup_name = "contains"
+
+    def range_sql(self, start, end, value):
+        if isinstance(value, (tuple, list)):
+            value = TimeRange.from_pair(value)
+
+            return "{} <= %s AND {} >= %s".format(start, end), [value.start, value.end]
+
+        return "{} <= %s AND {} > %s".format(start, end), [value, value]
+
+
+@TimeRangeField.register_lookup
+class TimeRangeContainedBy(TimeRangeLookup):
+    lookup_name = "contained_by"
+
+    def range_sql(self, start, end, value):
+        value = TimeRange.from_pair(value)
+
+        return "{} >= %s AND {} <= %s".format(start, end), [value.start, value.end]
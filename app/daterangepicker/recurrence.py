@@ -0,0 +1,276 @@
+# File: daterangepicker/recurrence.py
+
+"""
+Recurrence rules for time ranges: daily, weekly or monthly repetition with an
+optional count, end date and excluded dates.
+
+Rules are stored as a subset of the iCalendar RRULE syntax, e.g.
+
+    FREQ=WEEKLY;INTERVAL=2;COUNT=10;UNTIL=20301231T235959Z;EXDATE=20300114T100000Z
+
+Occurrences repeat on the wall clock of a timezone, so an event at 10:00 stays
+at 10:00 across daylight saving time changes. Monthly occurrences fall on the
+same day of the month as the first one, or on the last day of shorter months.
+"""
+
+from django.utils import timezone
+
+from daterangepicker.timerange import TimeRange
+
+import calendar
+import datetime
+
+DAILY = "DAILY"
+WEEKLY = "WEEKLY"
+MONTHLY = "MONTHLY"
+
+FREQUENCIES = (DAILY, WEEKLY, MONTHLY)
+
+ICAL_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def parse_ical_datetime(value):
+    return datetime.datetime.strptime(value, ICAL_DATETIME_FORMAT).replace(
+        tzinfo=datetime.timezone.utc
+    )
+
+
+def format_ical_datetime(value):
+    return value.astimezone(datetime.timezone.utc).strftime(ICAL_DATETIME_FORMAT)
+
+
+def add_months(value, months):
+    """ Add months to a date/time, clamping the day to the end of the month. """
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+
+    return value.replace(
+        year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1])
+    )
+
+
+class Recurrence(object):
+    """
+    How a time range repeats: every interval days, weeks or months, at most
+    count times and not starting after until, leaving out the occurrences that
+    start at one of the exdates.
+
+    """
+
+    __slots__ = ("frequency", "interval", "count", "until", "exdates")
+
+    def __init__(self, frequency, interval=1, count=None, until=None, exdates=()):
+        if frequency not in FREQUENCIES:
+            raise ValueError("Unknown frequency {!r}.".format(frequency))
+
+        if interval < 1:
+            raise ValueError("The interval must be at least 1.")
+
+        if count is not None and count < 1:
+            raise ValueError("The count must be at least 1.")
+
+        if until is not None and timezone.is_naive(until):
+            raise ValueError("The end date must be timezone-aware.")
+
+        self.frequency = frequency
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.exdates = frozenset(
+            exdate.astimezone(datetime.timezone.utc) for exdate in exdates
+        )
+
+    @classmethod
+    def parse(cls, value):
+        """ Parse a rule string, raising ValueError if it is invalid. """
+        parts = {}
+
+        for part in value.strip().split(";"):
+            name, separator, part_value = part.partition("=")
+
+            if not separator or name in parts:
+                raise ValueError("Invalid recurrence rule {!r}.".format(value))
+
+            parts[name.upper()] = part_value
+
+        kwargs = {}
+
+        try:
+            kwargs["frequency"] = parts.pop("FREQ").upper()
+
+            if "INTERVAL" in parts:
+                kwargs["interval"] = int(parts.pop("INTERVAL"))
+
+            if "COUNT" in parts:
+                kwargs["count"] = int(parts.pop("COUNT"))
+
+            if "UNTIL" in parts:
+                kwargs["until"] = parse_ical_datetime(parts.pop("UNTIL"))
+
+            if "EXDATE" in parts:
+                kwargs["exdates"] = [
+                    parse_ical_datetime(exdate)
+                    for exdate in parts.pop("EXDATE").split(",")
+                ]
+        except KeyError:
+            raise ValueError("A recurrence rule needs a FREQ.")
+
+        if parts:
+            raise ValueError(
+                "Unknown recurrence rule parts: {}.".format(", ".join(parts))
+            )
+
+        return cls(**kwargs)
+
+    def __str__(self):
+        parts = ["FREQ=" + self.frequency]
+
+        if self.interval != 1:
+            parts.append("INTERVAL={}".format(self.interval))
+
+        if self.count is not None:
+            parts.append("COUNT={}".format(self.count))
+
+        if self.until is not None:
+            parts.append("UNTIL=" + format_ical_datetime(self.until))
+
+        if self.exdates:
+            parts.append(
+                "EXDATE="
+                + ",".join(
+                    format_ical_datetime(exdate) for exdate in sorted(self.exdates)
+                )
+            )
+
+        return ";".join(parts)
+
+    def __repr__(self):
+        return "<Recurrence: {}>".format(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Recurrence):
+            return NotImplemented
+
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def nth_start(self, first_start, n):
+        """ Return the wall-clock start of the n-th occurrence, counting from 0. """
+        if self.frequency == MONTHLY:
+            return add_months(first_start, n * self.interval)
+
+        days = self.interval * (7 if self.frequency == WEEKLY else 1)
+
+        return first_start + datetime.timedelta(days=n * days)
+
+    def index_before(self, first_start, moment):
+        """
+        Return the index of an occurrence starting no later than moment, and
+        at most a couple of occurrences before it, without stepping through
+        the ones in between. Both are wall-clock date/times.
+
+        """
+        if moment <= first_start:
+            return 0
+
+        if self.frequency == MONTHLY:
+            months = (moment.year - first_start.year) * 12 + (
+                moment.month - first_start.month
+            )
+            n = months // self.interval
+        else:
+            days = self.interval * (7 if self.frequency == WEEKLY else 1)
+            n = (moment - first_start) // datetime.timedelta(days=days)
+
+        # Step back one more to absorb daylight saving time and month clamping.
+        return max(n - 1, 0)
+
+    def occurrences(self, time_range, start=None, end=None, tz=None):
+        """
+        Lazily yield the occurrences of a series whose first occurrence is
+        time_range, as TimeRanges, leaving out those that don't overlap
+        [start, end). Without an end, a series without count or until never
+        ends.
+
+        The first occurrence in the window is found directly, so this takes
+        time proportional to the number of occurrences yielded.
+
+        """
+        first_start, first_end = time_range
+        duration = first_end - first_start
+        aware = timezone.is_aware(first_start)
+
+        if aware:
+            if tz is None:
+                tz = timezone.get_current_timezone()
+
+            first_local = timezone.localtime(first_start, tz).replace(tzinfo=None)
+        else:
+            first_local = first_start
+
+        until = self.until
+
+        if until is not None and not aware:
+            until = until.replace(tzinfo=None)
+
+        n = 0
+
+        if start is not None:
+            earliest = start - duration
+
+            if aware:
+                earliest = timezone.localtime(earliest, tz).replace(tzinfo=None)
+
+            n = self.index_before(first_local, earliest)
+
+        while self.count is None or n < self.count:
+            occurrence_start = self.nth_start(first_local, n)
+
+            if aware:
+                occurrence_start = timezone.make_aware(occurrence_start, tz)
+
+            n += 1
+
+            if until is not None and occurrence_start > until:
+                return
+
+            if end is not None and occurrence_start >= end:
+                return
+
+            occurrence_end = occurrence_start + duration
+
+            if start is not None and occurrence_end <= start:
+                continue
+
+            if self.exdates:
+                if aware:
+                    key = occurrence_start.astimezone(datetime.timezone.utc)
+                else:
+                    key = occurrence_start.replace(tzinfo=datetime.timezone.utc)
+
+                if key in self.exdates:
+                    continue
+
+            yield TimeRange(occurrence_start, occurrence_end)
+
+
+def occurrences(time_range, recurrence=None, start=None, end=None, tz=None):
+    """
+    Like Recurrence.occurrences, but also accepting a time range that does not
+    recur, for which it yields the range itself if it overlaps the window.
+
+    """
+    if recurrence is not None:
+        return recurrence.occurrences(time_range, start=start, end=end, tz=tz)
+
+    time_range = TimeRange.from_pair(time_range)
+
+    if (start is not None and time_range.end <= start) or (
+        end is not None and time_range.start >= end
+    ):
+        return iter(())
+
+    return iter((time_range,))
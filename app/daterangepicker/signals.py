@@ -0,0 +1,9 @@
+# File: daterangepicker/signals.py
+from django.dispatch import Signal
+
+# Sent by TimeRangedModelFormSet.save() inside its transaction, after saving
+# with bulk_create and bulk_update, which send no post_save. The sender is the
+# model, and the created and updated arguments are lists of the instances.
+# Only sent where bulk_create returns primary keys, so that every created
+# instance has one; elsewhere the formset saves each instance with save().
+bulk_saved = Signal()
@@ -1,10 +1,27 @@
-$(function() {
-  $('input[name="time_range"]').daterangepicker({
-    timePicker: true,
-    timePickerIncrement: 1,
-    locale: {
-      format: 'MM/DD/YYYY hh:mm A'
+// Pickers are created lazily: DateTimeRangeWidget puts the options of its
+// picker in a data-daterangepicker-options attribute, and a single listener
+// on the document creates the picker the first time such an input gets
+// focus. Pages with many range inputs, or inputs added later, cost nothing
+// until one is used.
+(function($) {
+  var SELECTOR = 'input[data-daterangepicker-options]';
+
+  function picker(input) {
+    var $input = $(input);
+    var instance = $input.data('daterangepicker');
+
+    if (!instance) {
+      $input.daterangepicker($input.data('daterangepickerOptions'));
+      instance = $input.data('daterangepicker');
+
+      // The picker listens for focus itself from now on, but missed this one.
+      instance.show();
     }
-  });
-});
 
+    return instance;
+  }
+
+  $(document).on('focusin', SELECTOR, function() {
+    picker(this);
+  });
+})(jQuery);
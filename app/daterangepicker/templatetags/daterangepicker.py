@@ -0,0 +1,32 @@
+# File: daterangepicker/templatetags/daterangepicker.py
+from django import template
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def preload_media(media):
+    """
+    Render <link rel="preload"> hints for the stylesheets and scripts of a
+    form's or widget's media, e.g. at the top of <head>:
+
+        {% load daterangepicker %}
+        {% preload_media form.media %}
+
+    so the browser starts fetching them before it reaches the tags that use
+    them. Assets given as objects rather than paths are left out.
+
+    """
+    links = [
+        (media.absolute_path(path), "style")
+        for paths in media._css.values()
+        for path in paths
+        if isinstance(path, str)
+    ] + [
+        (media.absolute_path(path), "script")
+        for path in media._js
+        if isinstance(path, str)
+    ]
+
+    return format_html_join("\n", '<link rel="preload" href="{}" as="{}">', links)
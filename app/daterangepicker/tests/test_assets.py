@@ -0,0 +1,112 @@
+# File: daterangepicker/tests/test_assets.py
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from daterangepicker.assets import (
+    BUNDLE_CSS, 
+    BUNDLE_JS, 
+    BUNDLES, 
+    STATIC_DIR, 
+    build_bundle, 
+    minify_css, 
+)
+from daterangepicker.widgets import DateTimeRangeWidget
+
+import os
+import re
+import tempfile
+
+
+class BundleTestCase(SimpleTestCase):
+
+    def test_bundles_up_to_date(self):
+        """
+        Test that the committed bundles match their sources; rebuild them with
+        python3 -m daterangepicker.assets otherwise
+
+        """
+        for name in BUNDLES:
+            with open(os.path.join(STATIC_DIR, name), encoding='utf-8') as f:
+                self.assertEqual(f.read(), build_bundle(name), name)
+
+    def test_no_source_maps(self):
+        """
+        Test that no vendored script points to a source map, which
+        ManifestStaticFilesStorage would fail to find
+
+        """
+        for name in BUNDLES:
+            self.assertNotIn('sourceMappingURL', build_bundle(name))
+
+    def test_moment_version(self):
+        """
+        Test that the vendored moment.js has the fix for CVE-2022-31129,
+        released in 2.29.4
+
+        """
+        path = os.path.join(STATIC_DIR, 'daterangepicker/vendor/moment.min.js')
+        with open(path, encoding='utf-8') as f:
+            version = re.search(r'\.version="([\d.]+)"', f.read()).group(1)
+
+        self.assertGreaterEqual(tuple(map(int, version.split('.'))), (2, 29, 4))
+
+    def test_minify_css(self):
+        """ Test that comments and whitespace are dropped from stylesheets """
+        self.assertEqual(
+            minify_css("/* A comment */\n.a > .b,\n.c {\n  color: #fff;\n"
+                       "  margin: 0 auto;\n}\n"),
+            ".a>.b,.c{color:#fff;margin:0 auto}")
+
+    def test_widget_media(self):
+        """ Test that the widget only needs the two self-hosted bundles """
+        media = DateTimeRangeWidget().media
+
+        self.assertEqual(media._js, [BUNDLE_JS])
+        self.assertEqual(media._css, {'all': [BUNDLE_CSS]})
+        self.assertNotIn('//', str(media).replace('/static/', ''))
+
+
+class PreloadMediaTestCase(SimpleTestCase):
+
+    def render(self):
+        return Template(
+            '{% load daterangepicker %}{% preload_media widget.media %}'
+        ).render(Context({'widget': DateTimeRangeWidget()}))
+
+    def test_preload(self):
+        """ Test that preload hints are given for the widget's assets """
+        self.assertEqual(self.render().split('\n'), [
+            '<link rel="preload" href="/static/{}" as="style">'.format(BUNDLE_CSS),
+            '<link rel="preload" href="/static/{}" as="script">'.format(BUNDLE_JS),
+        ])
+
+    def test_manifest_storage(self):
+        """
+        Test that with ManifestStaticFilesStorage the media and the preload
+        hints use the content-hashed names of the collected bundles
+
+        """
+        with tempfile.TemporaryDirectory() as static_root:
+            with override_settings(
+                    STATIC_ROOT=static_root,
+                    STORAGES={
+                        'default': {
+                            'BACKEND': 
+                                'django.core.files.storage.FileSystemStorage',
+                        },
+                        'staticfiles': {
+                            'BACKEND': 'django.contrib.staticfiles.storage.'
+                                       'ManifestStaticFilesStorage',
+                        },
+                    }):
+                call_command('collectstatic', interactive=False, verbosity=0)
+
+                preload = self.render()
+                media = str(DateTimeRangeWidget().media)
+
+        hashed_js = re.escape(BUNDLE_JS[:-len('.js')]) + r'\.[0-9a-f]{12}\.js'
+
+        self.assertRegex(preload, 'href="/static/{}"'.format(hashed_js))
+        self.assertRegex(media, 'src="/static/{}"'.format(hashed_js))
+        self.assertNotIn(BUNDLE_CSS, preload)
@@ -0,0 +1,112 @@
+# File: daterangepicker/tests/test_conflicts.py
+from django.test import TestCase
+from django.utils import timezone
+
+from daterangepicker.conflicts import find_conflicts, sweep_conflicts
+
+from simpleapp.models import Event
+
+from collections import namedtuple
+
+import datetime
+import random
+
+Interval = namedtuple("Interval", ["time_start", "time_end", "pk"])
+
+
+class SweepConflictsTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+    def interval(self, start, end, pk=None):
+        return Interval(self.now + datetime.timedelta(hours=start),
+                        self.now + datetime.timedelta(hours=end),
+                        pk)
+
+    def test_half_open(self):
+        """
+        Test that ranges which only touch do not conflict, and empty ranges
+        only conflict with ranges strictly around them
+
+        """
+        a = self.interval(0, 2)
+        b = self.interval(2, 4)
+        c = self.interval(1, 3)
+        empty = self.interval(2, 2)
+        empty_at_start = self.interval(0, 0)
+
+        conflicts = sweep_conflicts([a, b, empty, empty_at_start], [c])
+
+        self.assertEqual(conflicts[0], [c])
+        self.assertEqual(conflicts[1], [c])
+        self.assertEqual(conflicts[2], [c])
+        self.assertEqual(conflicts[3], [])
+
+    def test_candidates_conflict_with_each_other(self):
+        """ Test that overlaps within the candidates are reported both ways """
+        a = self.interval(0, 3)
+        b = self.interval(1, 2)
+
+        self.assertEqual(sweep_conflicts([a, b]), [[b], [a]])
+
+    def test_matches_brute_force(self):
+        """ Test the sweep against comparing every pair of ranges """
+        rng = random.Random(42)
+
+        def random_interval():
+            start = rng.randint(0, 100)
+            return self.interval(start, start + rng.randint(0, 10))
+
+        candidates = [random_interval() for _ in range(200)]
+        existing = [random_interval() for _ in range(200)]
+
+        conflicts = sweep_conflicts(candidates, existing)
+
+        for i, candidate in enumerate(candidates):
+            expected = [
+                other for other in candidates[:i] + candidates[i + 1:] + existing
+                if other.time_start < candidate.time_end
+                and candidate.time_start < other.time_end
+            ]
+
+            self.assertCountEqual(conflicts[i], expected)
+
+
+class FindConflictsTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+        self.event = Event.objects.create(
+                        title="Test Event",
+                        time_start=self.now,
+                        time_end=self.now + datetime.timedelta(hours=2),
+                    )
+        Event.objects.create(
+            title="Far Away Event",
+            time_start=self.now + datetime.timedelta(days=30),
+            time_end=self.now + datetime.timedelta(days=31),
+        )
+
+    def test_single_query(self):
+        """ Test that a whole batch is checked with one query """
+        candidates = [
+            Event(time_start=self.now + datetime.timedelta(hours=i),
+                  time_end=self.now + datetime.timedelta(hours=i, minutes=30))
+            for i in range(4)
+        ]
+
+        with self.assertNumQueries(1):
+            conflicts = find_conflicts(Event.objects.all(), candidates)
+
+        self.assertEqual(conflicts, [[self.event], [self.event], [], []])
+
+    def test_excludes_own_row(self):
+        """ Test that a saved candidate does not conflict with itself """
+        self.assertEqual(find_conflicts(Event.objects.all(), [self.event]), [[]])
+
+    def test_no_candidates(self):
+        """ Test that checking nothing makes no query """
+        with self.assertNumQueries(0):
+            self.assertEqual(find_conflicts(Event.objects.all(), []), [])
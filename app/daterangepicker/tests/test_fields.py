@@ -9,7 +9,9 @@ from django.utils.formats import localize_input
 
 from daterangepicker.forms import time_range_generator, DATETIME_INPUT_FORMAT
 from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.timerange import TimeRange
 
+import copy
 import datetime
 
 
@@ -126,6 +128,12 @@ class BaseDateTimeRangeFieldTestCase(TestCase):
         with self.assertRaises(ValidationError):
             self.field.clean(time_range_str)
 
+    def test_clean_not_a_string(self):
+        """ Test that values other than strings fail validation cleanly """
+        for value in (None, 123, ['yo momma']):
+            with self.assertRaises(ValidationError):
+                self.field.clean(value)
+
     def test_clean_soon_start(self):
         """ 
         Test clean with a start date in the very near future 
@@ -196,3 +204,131 @@ class DateTimeRangeFieldAllowsPastTestCase(BaseDateTimeRangeFieldTestCase):
         
         self.field.clean(time_range_str)
 
+
+class DateTimeRangeFieldFastPathTestCase(TestCase):
+
+    def setUp(self):
+        self.field = DateTimeRangeField(allow_past=True)
+
+    def test_fast_path_matches_fields(self):
+        """
+        Test that the fast path and the per-field DateTimeField path give the
+        same result
+        
+        """
+        for time_range_str in ["12/28/2017 03:30 AM - 12/29/2017 04:45 PM",
+                               "2017-12-28T03:30:00 - 2017-12-29T16:45:00"]:
+            self.assertEqual(self.field.clean(time_range_str), 
+                             self.field.clean_fields(time_range_str))
+
+    def test_fallback(self):
+        """
+        Test that strings the fast path does not recognise still go through
+        DateTimeField parsing
+        
+        """
+        time_range_str = "12/28/2017 03:30 AM  -  12/29/2017 04:45 PM"
+
+        self.assertEqual(
+            self.field.clean(time_range_str),
+            self.field.clean("12/28/2017 03:30 AM - 12/29/2017 04:45 PM"),
+        )
+
+    def test_has_changed(self):
+        """ Test comparing submitted strings with the initial range """
+        time_range = TimeRange(*self.field.clean(
+                        "12/28/2017 03:30 AM - 12/29/2017 04:45 PM"))
+
+        self.assertFalse(self.field.has_changed(
+            time_range, "12/28/2017 03:30 AM - 12/29/2017 04:45 PM"))
+        self.assertTrue(self.field.has_changed(
+            time_range, "12/28/2017 03:30 AM - 12/30/2017 04:45 PM"))
+        self.assertTrue(self.field.has_changed((None, None), "yo momma"))
+        self.assertFalse(self.field.has_changed((None, None), ""))
+
+    def test_returns_time_range(self):
+        """
+        Test that both paths return a TimeRange, which still unpacks like a
+        tuple
+        
+        """
+        time_range_str = "12/28/2017 03:30 AM - 12/29/2017 04:45 PM"
+
+        for time_range in (self.field.clean(time_range_str),
+                           self.field.clean_fields(time_range_str)):
+            self.assertIsInstance(time_range, TimeRange)
+
+            start, end = time_range
+            self.assertEqual(time_range.duration, end - start)
+
+
+class DateTimeRangeFieldCleanBatchTestCase(TestCase):
+
+    def setUp(self):
+        self.field = DateTimeRangeField()
+
+        self.now = timezone.now()
+        self.yesterday = self.now - datetime.timedelta(hours=24)
+        self.tomorrow = self.now + datetime.timedelta(hours=24)
+        self.day_after = self.now + datetime.timedelta(hours=48)
+
+    def test_clean_batch(self):
+        """
+        Test that clean_batch returns one cleaned range or error per input, in
+        order, without raising
+        
+        """
+        time_range_strs = [
+            time_range_generator(self.tomorrow, self.day_after),
+            "yo momma",
+            time_range_generator(self.day_after, self.tomorrow),
+            time_range_generator(self.yesterday, self.tomorrow),
+        ]
+
+        time_ranges, errors = self.field.clean_batch(time_range_strs)
+
+        self.assertEqual(time_ranges[0], 
+                         self.field.clean(time_range_strs[0]))
+        self.assertIsNone(errors[0])
+
+        for i in range(1, 4):
+            self.assertIsNone(time_ranges[i])
+            self.assertIsInstance(errors[i], ValidationError)
+
+        self.assertEqual(errors[2].messages, ["End date is before start date."])
+        self.assertEqual(errors[3].messages, ["Start date is in the past."])
+
+    def test_clean_batch_given_now(self):
+        """ Test that clean_batch checks ranges against a given now """
+        time_range_strs = [time_range_generator(self.yesterday, self.tomorrow)]
+
+        time_ranges, errors = self.field.clean_batch(
+                                time_range_strs, 
+                                now=self.yesterday - datetime.timedelta(hours=1),
+                            )
+        
+        self.assertIsNotNone(time_ranges[0])
+        self.assertIsNone(errors[0])
+
+    def test_clean_batch_empty(self):
+        """ Test clean_batch given no strings """
+        self.assertEqual(self.field.clean_batch([]), ([], []))
+
+    def test_deepcopy_shares_subfields(self):
+        """
+        Test that a copied field, as made for each form instance, shares the
+        two DateTimeFields but has its own widget and precleaned result
+
+        """
+        field = copy.deepcopy(self.field)
+
+        self.assertIsNot(field, self.field)
+        self.assertIs(field.fields, self.field.fields)
+        self.assertIsNot(field.widget, self.field.widget)
+
+        time_range_str = time_range_generator(self.tomorrow, self.tomorrow)
+        field.preclean(time_range_str, None, ValidationError("Precleaned."))
+
+        self.assertIsNone(self.field.precleaned)
+        self.assertRaisesMessage(ValidationError, "Precleaned.",
+                                 field.clean, time_range_str)
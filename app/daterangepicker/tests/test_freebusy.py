@@ -0,0 +1,55 @@
+# File: daterangepicker/tests/test_freebusy.py
+from django.test import TestCase
+from django.utils import timezone
+
+from daterangepicker.freebusy import busy_intervals, merge_intervals
+
+from simpleapp.models import Event
+
+import datetime
+
+
+class MergeIntervalsTestCase(TestCase):
+
+    def test_merge(self):
+        """ Test merging overlapping, touching, nested and empty intervals """
+        intervals = [(0, 2), (1, 3), (3, 4), (5, 9), (6, 7), (8, 8), (10, 10)]
+
+        self.assertEqual(list(merge_intervals(intervals)), [(0, 4), (5, 9)])
+
+    def test_empty(self):
+        """ Test that no intervals merge into none """
+        self.assertEqual(list(merge_intervals([])), [])
+
+
+class BusyIntervalsTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+        for title, start, end in [("Test Event1", 0, 2),
+                                  ("Test Event2", 1, 3),
+                                  ("Test Event3", 5, 6),
+                                  ("Test Event4", 10, 12)]:
+            Event.objects.create(title=title,
+                                 time_start=self.hours(start),
+                                 time_end=self.hours(end))
+
+    def hours(self, n):
+        return self.now + datetime.timedelta(hours=n)
+
+    def test_window(self):
+        """ Test that busy intervals are merged and clipped to the window """
+        with self.assertNumQueries(1):
+            busy = busy_intervals(Event.objects.all(),
+                                  self.hours(1), self.hours(11))
+
+        self.assertEqual(busy, [(self.hours(1), self.hours(3)),
+                                (self.hours(5), self.hours(6)),
+                                (self.hours(10), self.hours(11))])
+
+    def test_free_window(self):
+        """ Test a window with no events in it """
+        busy = busy_intervals(Event.objects.all(), self.hours(3), self.hours(5))
+
+        self.assertEqual(busy, [])
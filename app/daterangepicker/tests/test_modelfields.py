@@ -0,0 +1,111 @@
+# File: daterangepicker/tests/test_modelfields.py
+from django.core.exceptions import FieldError
+from django.forms import ModelForm
+from django.test import TestCase
+from django.utils import timezone
+
+from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.modelfields import TimeRangeField, get_time_range_field
+from daterangepicker.timerange import TimeRange
+
+from simpleapp.models import Event
+
+import datetime
+
+
+class TimeRangeFieldTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+        self.event = Event.objects.create(title="Test Event",
+                                          time_range=self.hours(1, 3))
+
+    def hours(self, start, end):
+        return TimeRange(self.now + datetime.timedelta(hours=start),
+                         self.now + datetime.timedelta(hours=end))
+
+    def test_columns(self):
+        """
+        Test that the field adds non-editable time_start and time_end columns
+        and has none of its own
+
+        """
+        field = get_time_range_field(Event)
+
+        self.assertIsInstance(field, TimeRangeField)
+        self.assertNotIn(field, Event._meta.concrete_fields)
+
+        for name in ('time_start', 'time_end'):
+            self.assertFalse(Event._meta.get_field(name).editable)
+
+    def test_descriptor(self):
+        """ Test reading and assigning the range through the model """
+        event = Event.objects.get(pk=self.event.pk)
+
+        self.assertEqual(event.time_range, self.hours(1, 3))
+        self.assertEqual(event.time_start, self.hours(1, 3).start)
+
+        event.time_range = self.hours(2, 4)
+        self.assertEqual(event.time_end, self.hours(2, 4).end)
+
+        self.assertEqual(Event().time_range, (None, None))
+
+    def test_lookups(self):
+        """ Test the overlaps, contains, contained_by and exact lookups """
+        def titles(**kwargs):
+            return list(Event.objects.filter(**kwargs)
+                                     .values_list('title', flat=True))
+
+        self.assertEqual(titles(time_range__overlaps=self.hours(2, 5)),
+                         ['Test Event'])
+        self.assertEqual(titles(time_range__overlaps=self.hours(3, 5)), [])
+
+        self.assertEqual(titles(time_range__contains=self.hours(1, 3).start),
+                         ['Test Event'])
+        self.assertEqual(titles(time_range__contains=self.hours(1, 3).end), [])
+        self.assertEqual(titles(time_range__contains=self.hours(1, 2)),
+                         ['Test Event'])
+        self.assertEqual(titles(time_range__contains=self.hours(0, 2)), [])
+
+        self.assertEqual(titles(time_range__contained_by=self.hours(0, 3)),
+                         ['Test Event'])
+        self.assertEqual(titles(time_range__contained_by=self.hours(2, 3)), [])
+
+        self.assertEqual(titles(time_range=self.hours(1, 3)), ['Test Event'])
+        self.assertEqual(titles(time_range=self.hours(1, 4)), [])
+
+    def test_other_lookups(self):
+        """ Test that lookups other than the range ones are not registered """
+        self.assertEqual(
+            sorted(Event._meta.get_field('time_range').get_lookups()),
+            ['contained_by', 'contains', 'exact', 'overlaps'])
+
+        for lookup in ('lt', 'in', 'isnull', 'startswith'):
+            with self.assertRaises(FieldError):
+                Event.objects.filter(**{'time_range__' + lookup: self.now})
+
+    def test_lookup_uses_index(self):
+        """ Test that range lookups compile to indexable column comparisons """
+        queryset = Event.objects.filter(time_range__overlaps=self.hours(0, 1))
+
+        sql = str(queryset.query)
+        self.assertIn('"simpleapp_event"."time_start" <', sql)
+        self.assertIn('"simpleapp_event"."time_end" >', sql)
+
+        self.assertRegex(queryset.explain(), r'USING (COVERING )?INDEX event_')
+
+    def test_model_form(self):
+        """ Test that a plain model form maps the field automatically """
+        class EventModelForm(ModelForm):
+            class Meta:
+                model = Event
+                fields = '__all__'
+
+        form = EventModelForm()
+
+        self.assertIsInstance(form.fields['time_range'], DateTimeRangeField)
+        self.assertNotIn('time_start', form.fields)
+
+        form = EventModelForm(instance=self.event)
+        self.assertEqual(form.initial['time_range'], self.hours(1, 3))
@@ -0,0 +1,134 @@
+# File: daterangepicker/tests/test_recurrence.py
+from django.test import TestCase
+
+from daterangepicker.recurrence import (
+    DAILY,
+    MONTHLY,
+    WEEKLY,
+    Recurrence,
+    occurrences,
+)
+from daterangepicker.timerange import TimeRange
+
+import datetime
+
+try:
+    import zoneinfo
+except ImportError:
+    # Python 3.8, where Django 4.2 depends on the backport instead.
+    from backports import zoneinfo
+
+UTC = datetime.timezone.utc
+NEW_YORK = zoneinfo.ZoneInfo("America/New_York")
+
+
+class CountingRecurrence(Recurrence):
+    """ Counts how many occurrence starts are computed. """
+
+    __slots__ = ("computed",)
+
+    def nth_start(self, first_start, n):
+        self.computed = getattr(self, "computed", 0) + 1
+        return super(CountingRecurrence, self).nth_start(first_start, n)
+
+
+class RecurrenceTestCase(TestCase):
+
+    def setUp(self):
+        self.first = TimeRange(
+                        datetime.datetime(2030, 1, 31, 10, tzinfo=NEW_YORK),
+                        datetime.datetime(2030, 1, 31, 11, tzinfo=NEW_YORK))
+
+    def starts(self, recurrence, start=None, end=None):
+        return [time_range.start for time_range in 
+                recurrence.occurrences(self.first, start, end, tz=NEW_YORK)]
+
+    def test_parse_round_trip(self):
+        """ Test that rules survive formatting and parsing """
+        rule = ("FREQ=WEEKLY;INTERVAL=2;COUNT=10;UNTIL=20301231T235959Z;"
+                "EXDATE=20300114T150000Z,20300128T150000Z")
+
+        recurrence = Recurrence.parse(rule)
+
+        self.assertEqual(recurrence.frequency, WEEKLY)
+        self.assertEqual(recurrence.interval, 2)
+        self.assertEqual(str(recurrence), rule)
+        self.assertEqual(Recurrence.parse(str(recurrence)), recurrence)
+
+    def test_parse_invalid(self):
+        """ Test that malformed rules raise ValueError """
+        for rule in ("", "FREQ=YEARLY", "INTERVAL=2", "FREQ=DAILY;COUNT=0",
+                     "FREQ=DAILY;UNTIL=tomorrow", "FREQ=DAILY;BYDAY=MO",
+                     "FREQ=DAILY;FREQ=WEEKLY", "FREQ=DAILY;INTERVAL=x"):
+            with self.assertRaises(ValueError, msg=rule):
+                Recurrence.parse(rule)
+
+    def test_daily_count(self):
+        """ Test a daily series with a count """
+        starts = self.starts(Recurrence(DAILY, count=3))
+
+        self.assertEqual([s.day for s in starts], [31, 1, 2])
+
+    def test_weekly_until_and_exdates(self):
+        """ Test a fortnightly series with an end date and an exception """
+        recurrence = Recurrence(
+                        WEEKLY, interval=2,
+                        until=datetime.datetime(2030, 3, 14, 13, tzinfo=UTC),
+                        exdates=[datetime.datetime(2030, 2, 14, 15, tzinfo=UTC)])
+
+        self.assertEqual([(s.month, s.day) for s in self.starts(recurrence)],
+                         [(1, 31), (2, 28)])
+
+    def test_monthly_clamps_to_month_end(self):
+        """ Test that monthly occurrences fall on the last day of short months """
+        starts = self.starts(Recurrence(MONTHLY, count=4))
+
+        self.assertEqual([(s.month, s.day) for s in starts],
+                         [(1, 31), (2, 28), (3, 31), (4, 30)])
+
+    def test_wall_clock(self):
+        """ Test that occurrences keep their local time across DST changes """
+        starts = self.starts(Recurrence(WEEKLY, count=10))
+
+        self.assertEqual({s.hour for s in starts}, {10})
+        self.assertEqual({s.utcoffset() for s in starts},
+                         {datetime.timedelta(hours=-5),
+                          datetime.timedelta(hours=-4)})
+
+    def test_window_matches_full_series(self):
+        """ Test that jumping into a window gives the same occurrences """
+        for frequency in (DAILY, WEEKLY, MONTHLY):
+            recurrence = Recurrence(frequency, interval=3, count=200)
+            series = list(recurrence.occurrences(self.first, tz=NEW_YORK))
+
+            for days in (0, 45, 400, 3000):
+                start = self.first.start + datetime.timedelta(days=days, hours=1)
+                end = start + datetime.timedelta(days=60)
+
+                self.assertEqual(
+                    list(recurrence.occurrences(self.first, start, end,
+                                                tz=NEW_YORK)),
+                    [o for o in series if o.overlaps((start, end))],
+                    msg=(frequency, days))
+
+    def test_lazy(self):
+        """
+        Test that a window far into an endless series costs about as much as
+        the occurrences in it
+
+        """
+        recurrence = CountingRecurrence(DAILY)
+        start = self.first.start + datetime.timedelta(days=10000)
+
+        window = list(recurrence.occurrences(
+                        self.first, start, start + datetime.timedelta(days=7),
+                        tz=NEW_YORK))
+
+        self.assertEqual(len(window), 7)
+        self.assertLess(recurrence.computed, 12)
+
+    def test_not_recurring(self):
+        """ Test that a range without a rule occurs once, if in the window """
+        self.assertEqual(list(occurrences(self.first)), [self.first])
+        self.assertEqual(list(occurrences(self.first, None,
+                                          start=self.first.end)), [])
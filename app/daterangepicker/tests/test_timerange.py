@@ -0,0 +1,117 @@
+# File: daterangepicker/tests/test_timerange.py
+from django.test import TestCase
+from django.utils import timezone
+
+from daterangepicker.timerange import TimeRange, TimeRangeArray
+
+import datetime
+
+try:
+    import zoneinfo
+except ImportError:
+    # Python 3.8, where Django 4.2 depends on the backport instead.
+    from backports import zoneinfo
+
+
+class TimeRangeTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+    def hours(self, start, end):
+        return TimeRange(self.now + datetime.timedelta(hours=start),
+                         self.now + datetime.timedelta(hours=end))
+
+    def test_tuple_compatible(self):
+        """ Test that a TimeRange unpacks and compares like a 2-tuple """
+        time_range = self.hours(0, 1)
+        start, end = time_range
+
+        self.assertEqual((start, end), time_range)
+        self.assertEqual(hash((start, end)), hash(time_range))
+        self.assertEqual(time_range.duration, datetime.timedelta(hours=1))
+
+    def test_immutable(self):
+        """ Test that a TimeRange can't be changed or given attributes """
+        time_range = self.hours(0, 1)
+
+        with self.assertRaises(AttributeError):
+            time_range.start = self.now
+
+        with self.assertRaises(AttributeError):
+            time_range.extra = None
+
+    def test_from_pair(self):
+        """ Test converting sequences, which must hold exactly two dates """
+        time_range = self.hours(0, 1)
+
+        self.assertIs(TimeRange.from_pair(time_range), time_range)
+        self.assertEqual(TimeRange.from_pair(list(time_range)), time_range)
+
+        with self.assertRaises(ValueError):
+            TimeRange.from_pair((self.now, self.now, self.now))
+
+    def test_contains(self):
+        """ Test containment of date/times and ranges, excluding the end """
+        time_range = self.hours(0, 2)
+
+        self.assertTrue(time_range.contains(self.now))
+        self.assertFalse(time_range.contains(time_range.end))
+        self.assertTrue(time_range.contains(self.hours(1, 2)))
+        self.assertFalse(time_range.contains(self.hours(1, 3)))
+
+    def test_overlaps_and_intersection(self):
+        """ Test overlap and intersection of half-open ranges """
+        time_range = self.hours(0, 2)
+
+        self.assertTrue(time_range.overlaps(self.hours(1, 3)))
+        self.assertFalse(time_range.overlaps(self.hours(2, 3)))
+
+        self.assertEqual(time_range.intersection(self.hours(1, 3)),
+                         self.hours(1, 2))
+        self.assertIsNone(time_range.intersection(self.hours(2, 3)))
+
+
+class TimeRangeArrayTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.time_ranges = [
+            TimeRange(self.now + datetime.timedelta(hours=n),
+                      self.now + datetime.timedelta(hours=n, minutes=90))
+            for n in range(5)
+        ]
+        self.array = TimeRangeArray(self.time_ranges)
+
+    def test_round_trip(self):
+        """ Test that ranges come back equal, to the microsecond """
+        self.assertEqual(len(self.array), 5)
+        self.assertEqual(list(self.array), self.time_ranges)
+        self.assertEqual(self.array[-1], self.time_ranges[-1])
+        self.assertEqual(list(self.array[1:4:2]), self.time_ranges[1:4:2])
+
+        with self.assertRaises(IndexError):
+            self.array[5]
+
+    def test_other_timezone(self):
+        """ Test that aware date/times in any timezone are stored correctly """
+        tz = zoneinfo.ZoneInfo("America/New_York")
+        time_range = TimeRange(self.now.astimezone(tz), self.now.astimezone(tz))
+
+        array = TimeRangeArray([time_range])
+
+        self.assertEqual(array[0], time_range)
+        self.assertEqual(array[0].start.tzinfo, datetime.timezone.utc)
+
+    def test_naive(self):
+        """ Test storing naive date/times """
+        naive = datetime.datetime(2030, 6, 9, 11, 0)
+
+        array = TimeRangeArray([(naive, naive)], tzinfo=None)
+
+        self.assertEqual(array[0], (naive, naive))
+
+    def test_overlapping_and_durations(self):
+        """ Test the queries answered from the stored integers """
+        self.assertEqual(self.array.overlapping(self.time_ranges[2]), [1, 2, 3])
+        self.assertEqual(list(self.array.durations()), [90 * 60 * 10 ** 6] * 5)
@@ -0,0 +1,97 @@
+# File: daterangepicker/tests/test_timezones.py
+from django.test import TestCase
+from django.utils import timezone
+
+from daterangepicker.timerange import TimeRange
+from daterangepicker.timezones import localize_many, localize_time_ranges
+
+import datetime
+
+try:
+    import zoneinfo
+except ImportError:
+    # Python 3.8, where Django 4.2 depends on the backport instead.
+    from backports import zoneinfo
+
+import pytz
+
+
+class LocalizeManyTestCase(TestCase):
+
+    def setUp(self):
+        utc = datetime.timezone.utc
+
+        # Every quarter of an hour around both daylight saving time changes of
+        # 2030 in New York, and a few values in other years and offsets.
+        self.values = [
+            moment + datetime.timedelta(minutes=15 * n)
+            for moment in (datetime.datetime(2030, 3, 10, 5, tzinfo=utc),
+                           datetime.datetime(2030, 11, 3, 4, tzinfo=utc))
+            for n in range(16)
+        ] + [
+            datetime.datetime(1999, 12, 31, 23, 59, tzinfo=utc),
+            datetime.datetime(2030, 6, 9, 11, tzinfo=zoneinfo.ZoneInfo("Asia/Tokyo")),
+            datetime.datetime(2041, 1, 1, tzinfo=datetime.timezone(
+                                datetime.timedelta(hours=-3))),
+        ]
+
+    def assertLocalized(self, localized, tz):
+        expected = [value.astimezone(tz) for value in self.values]
+
+        self.assertEqual(localized, expected)
+        self.assertEqual(
+            [(v.replace(tzinfo=None), v.utcoffset(), v.tzname()) for v in localized],
+            [(v.replace(tzinfo=None), v.utcoffset(), v.tzname()) for v in expected])
+
+    def test_zoneinfo(self):
+        """ Test converting to a zoneinfo zone across DST changes """
+        tz = zoneinfo.ZoneInfo("America/New_York")
+
+        self.assertLocalized(localize_many(self.values, tz), tz)
+
+    def test_pytz(self):
+        """
+        Test converting to a pytz zone with its transition table, giving the
+        tzinfo instance of each offset like astimezone and normalize
+
+        """
+        for name in ("America/New_York", "Australia/Lord_Howe", "Asia/Kolkata"):
+            tz = pytz.timezone(name)
+
+            self.assertLocalized(localize_many(self.values, tz), tz)
+
+    def test_fixed_offset(self):
+        """ Test converting to UTC and fixed offsets """
+        for tz in (datetime.timezone.utc, pytz.utc,
+                   datetime.timezone(datetime.timedelta(hours=5, minutes=30))):
+            self.assertLocalized(localize_many(self.values, tz), tz)
+
+    def test_current_timezone(self):
+        """ Test that the current timezone is used by default """
+        with timezone.override("Asia/Tokyo"):
+            localized = localize_many(iter(self.values))
+
+        self.assertLocalized(localized, zoneinfo.ZoneInfo("Asia/Tokyo"))
+
+    def test_none_and_naive(self):
+        """ Test that None is passed through and naive date/times rejected """
+        tz = pytz.timezone("Europe/Paris")
+
+        self.assertEqual(localize_many([None], tz), [None])
+
+        for tz in (tz, zoneinfo.ZoneInfo("Europe/Paris")):
+            with self.assertRaises(ValueError):
+                localize_many([datetime.datetime(2030, 1, 1)], tz)
+
+    def test_time_ranges(self):
+        """ Test converting both ends of time ranges """
+        tz = zoneinfo.ZoneInfo("America/New_York")
+        pairs = list(zip(self.values[::2], self.values[1::2]))
+
+        time_ranges = localize_time_ranges(pairs, tz)
+
+        self.assertEqual(time_ranges, [
+            TimeRange(start.astimezone(tz), end.astimezone(tz))
+            for start, end in pairs
+        ])
+        self.assertIsInstance(time_ranges[0], TimeRange)
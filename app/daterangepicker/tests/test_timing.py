@@ -0,0 +1,95 @@
+# File: daterangepicker/tests/test_timing.py
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from daterangepicker.timing import ServerTimingMiddleware, Timings, phase
+
+from simpleapp.models import Event
+
+
+class TimingsTestCase(TestCase):
+
+    def test_header(self):
+        """ Test formatting timings as a Server-Timing header """
+        timings = Timings()
+        timings.add("clean", 0.001)
+        timings.add("clean", 0.002)
+        timings.query_count = 2
+        timings.query_time = 0.0005
+
+        self.assertEqual(
+            timings.header(0.01),
+            'clean;dur=3.000, db;dur=0.500;desc="2 queries", total;dur=10.000'
+        )
+
+    def test_phase_outside_request(self):
+        """ Test that phases outside of a timed request do nothing """
+        with phase("clean") as p:
+            pass
+
+        self.assertIsNone(p.timings)
+
+
+class ServerTimingMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def view(self, request):
+        with phase("clean"):
+            pass
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+        return HttpResponse()
+
+    def test_header_and_log(self):
+        """
+        Test that phases and queries are reported in the Server-Timing header
+        and the log
+        
+        """
+        middleware = ServerTimingMiddleware(self.view)
+
+        with self.assertLogs("daterangepicker.timing", "INFO") as logs:
+            response = middleware(self.factory.get("/"))
+
+        header = response["Server-Timing"]
+
+        self.assertRegex(header, r'^clean;dur=[\d.]+, '
+                                 r'db;dur=[\d.]+;desc="1 queries", '
+                                 r'total;dur=[\d.]+$')
+
+        data = logs.records[0].server_timing
+
+        self.assertEqual(data["db_queries"], 1)
+        self.assertEqual(data["path"], "/")
+        self.assertEqual(data["status"], 200)
+        self.assertIn("clean", data)
+
+    def test_async(self):
+        """
+        Test that queries made from the worker threads of async views are
+        counted, and the middleware stays async
+        
+        """
+        async def view(request):
+            with phase("clean"):
+                pass
+
+            await Event.objects.acount()
+            await sync_to_async(Event.objects.count)()
+
+            return HttpResponse()
+
+        middleware = ServerTimingMiddleware(view)
+        request = AsyncRequestFactory().get("/")
+
+        response = async_to_sync(middleware)(request)
+
+        self.assertRegex(response["Server-Timing"],
+                         r'^clean;dur=[\d.]+, db;dur=[\d.]+;desc="2 queries", ')
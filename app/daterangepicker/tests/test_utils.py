@@ -0,0 +1,197 @@
+# File: daterangepicker/tests/test_utils.py
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from django.forms.utils import from_current_timezone
+
+from daterangepicker.utils import (
+    TimeRangeCache, 
+    format_time_range, 
+    format_time_ranges, 
+    parse_datetime_input, 
+    parse_time_range, 
+    time_range_cache, 
+    time_range_generator,
+)
+
+import datetime
+
+
+class ParseDateTimeInputTestCase(TestCase):
+
+    def test_input_format(self):
+        """ Test parsing a date/time in DATETIME_INPUT_FORMAT """
+        self.assertEqual(parse_datetime_input("12/28/2017 03:30 AM"),
+                         datetime.datetime(2017, 12, 28, 3, 30))
+
+    def test_input_format_noon_and_midnight(self):
+        """ Test that 12 AM is midnight and 12 PM is noon """
+        self.assertEqual(parse_datetime_input("12/28/2017 12:05 AM"),
+                         datetime.datetime(2017, 12, 28, 0, 5))
+        self.assertEqual(parse_datetime_input("12/28/2017 12:05 pm"),
+                         datetime.datetime(2017, 12, 28, 12, 5))
+
+    def test_input_format_out_of_range(self):
+        """ Test that impossible date/times are not recognised """
+        self.assertIsNone(parse_datetime_input("13/28/2017 03:30 AM"))
+        self.assertIsNone(parse_datetime_input("02/30/2017 03:30 AM"))
+        self.assertIsNone(parse_datetime_input("12/28/2017 00:30 AM"))
+        self.assertIsNone(parse_datetime_input("12/28/2017 03:60 AM"))
+
+    def test_iso_format(self):
+        """ Test parsing an ISO 8601 date/time """
+        self.assertEqual(parse_datetime_input("2017-12-28T03:30:00"),
+                         datetime.datetime(2017, 12, 28, 3, 30))
+        self.assertEqual(
+            parse_datetime_input("2017-12-28T03:30:00+00:00"),
+            datetime.datetime(2017, 12, 28, 3, 30, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_unrecognised(self):
+        """ Test that arbitrary strings are not recognised """
+        self.assertIsNone(parse_datetime_input("yo momma"))
+        self.assertIsNone(parse_datetime_input("2017-12-28 yo momma"))
+
+
+class ParseTimeRangeTestCase(TestCase):
+
+    def test_input_format(self):
+        """ Test parsing a time range written in DATETIME_INPUT_FORMAT """
+        start, end = parse_time_range(
+            "12/28/2017 03:30 AM - 12/29/2017 04:45 PM"
+        )
+
+        self.assertEqual(start, from_current_timezone(
+                            datetime.datetime(2017, 12, 28, 3, 30)))
+        self.assertEqual(end, from_current_timezone(
+                            datetime.datetime(2017, 12, 29, 16, 45)))
+        self.assertTrue(timezone.is_aware(start))
+
+    def test_iso_format(self):
+        """ Test parsing a time range written in ISO 8601 form """
+        start, end = parse_time_range(
+            "2017-12-28T03:30:00-05:00 - 2017-12-29T16:45:00-05:00"
+        )
+
+        self.assertEqual(start, datetime.datetime(
+                            2017, 12, 28, 8, 30, tzinfo=datetime.timezone.utc))
+        self.assertEqual(end, datetime.datetime(
+                            2017, 12, 29, 21, 45, tzinfo=datetime.timezone.utc))
+
+    def test_unrecognised(self):
+        """ Test that anything but exactly two recognised dates gives None """
+        date_str = "12/28/2017 03:30 AM"
+
+        self.assertIsNone(parse_time_range(date_str))
+        self.assertIsNone(parse_time_range(" - ".join([date_str] * 3)))
+        self.assertIsNone(parse_time_range(date_str + " - yo momma"))
+        self.assertIsNone(parse_time_range("yo momma"))
+
+    def test_nonexistent_time(self):
+        """
+        Test that wall times skipped by a DST change are left to the slower
+        DateTimeField path
+        
+        """
+        with timezone.override("America/New_York"):
+            self.assertIsNone(parse_time_range(
+                "03/08/2020 02:30 AM - 03/08/2020 04:30 AM"
+            ))
+
+
+class TimeRangeCacheTestCase(TestCase):
+
+    def test_get_set(self):
+        """ Test that cached values are returned and counted as hits """
+        cache = TimeRangeCache(maxsize=2)
+
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", "A")
+        self.assertEqual(cache.get("a"), "A")
+
+        self.assertEqual(cache.info(), (1, 1, 2, 1))
+
+    def test_evicts_least_recently_used(self):
+        """ Test that the least recently used entry is evicted first """
+        cache = TimeRangeCache(maxsize=2)
+
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+
+        self.assertEqual(cache.get("a"), "A")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "C")
+
+    def test_disabled(self):
+        """ Test that a cache with a size of 0 stores nothing """
+        cache = TimeRangeCache(maxsize=0)
+
+        cache.set("a", "A")
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_size_setting(self):
+        """ Test that the cache size is read from settings by default """
+        with override_settings(DATERANGEPICKER_FORMAT_CACHE_SIZE=5):
+            self.assertEqual(TimeRangeCache().maxsize, 5)
+
+
+class TimeRangeGeneratorTestCase(TestCase):
+
+    def setUp(self):
+        time_range_cache.clear()
+
+        self.start = timezone.now()
+        self.end = self.start + datetime.timedelta(hours=3)
+
+    def test_cached(self):
+        """ Test that repeated ranges are served from the cache """
+        for html in (False, True):
+            first = time_range_generator(self.start, self.end, html=html)
+            second = time_range_generator(self.start, self.end, html=html)
+
+            self.assertEqual(first, format_time_range(self.start, self.end, 
+                                                      html=html))
+            self.assertEqual(first, second)
+
+        self.assertEqual(time_range_cache.info().hits, 2)
+        self.assertEqual(time_range_cache.info().misses, 2)
+
+    def test_keyed_on_timezone(self):
+        """ Test that activating another timezone gives a fresh result """
+        with timezone.override("UTC"):
+            utc = time_range_generator(self.start, self.end)
+
+        with timezone.override("Asia/Tokyo"):
+            tokyo = time_range_generator(self.start, self.end)
+
+        self.assertNotEqual(utc, tokyo)
+
+    def test_format_many(self):
+        """
+        Test that formatting many ranges at once gives the same strings as
+        formatting them one by one, naive date/times included
+
+        """
+        naive = timezone.make_naive(self.start)
+        time_ranges = [(self.start, self.end), (naive, naive), 
+                       (self.end, self.end + datetime.timedelta(days=200))]
+
+        for html in (False, True):
+            with timezone.override("Asia/Tokyo"):
+                self.assertEqual(
+                    format_time_ranges(time_ranges, html=html),
+                    [format_time_range(start, end, html=html) 
+                     for start, end in time_ranges])
+
+    def test_cleared_on_format_change(self):
+        """ Test that changing DATETIME_FORMAT invalidates the cache """
+        time_range_generator(self.start, self.end, html=True)
+
+        with override_settings(DATETIME_FORMAT="Y"):
+            self.assertEqual(
+                time_range_generator(self.start, self.end, html=True),
+                format_time_range(self.start, self.end, html=True),
+            )
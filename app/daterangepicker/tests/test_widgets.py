@@ -1,13 +1,21 @@
 # File: daterangepicker/tests/test_widgets.py
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
+from django.utils.safestring import SafeString, mark_safe
 
 from django.forms.utils import to_current_timezone
 
 from daterangepicker.forms import time_range_generator, DATETIME_INPUT_FORMAT
 from daterangepicker.widgets import DateTimeRangeWidget
 
+from simpleapp.forms import EventForm
+
+from unittest import mock
+
 import datetime
+import html
+import json
+import re
 
 
 class DateTimeRangeWidgetTestCase(TestCase):
@@ -163,3 +171,100 @@ class DateTimeRangeWidgetTestCase(TestCase):
                 + "1-hour error threshhold")
 
 
+class PickerOptionsTestCase(TestCase):
+
+    def options(self, widget):
+        match = re.search(r'data-daterangepicker-options="([^"]*)"',
+                          widget.render('time_range', None))
+
+        return json.loads(html.unescape(match.group(1)))
+
+    def test_default_options(self):
+        """ Test that the picker options are emitted as a JSON attribute """
+        options = self.options(DateTimeRangeWidget())
+
+        self.assertEqual(options, DateTimeRangeWidget.picker_options)
+        self.assertEqual(options['locale']['format'], 'MM/DD/YYYY hh:mm A')
+
+    def test_override_options(self):
+        """ Test overriding some of the options of a widget's picker """
+        options = self.options(DateTimeRangeWidget(options={
+                        'timePickerIncrement': 15, 'drops': 'up'}))
+
+        self.assertEqual(options['timePickerIncrement'], 15)
+        self.assertEqual(options['drops'], 'up')
+        self.assertTrue(options['timePicker'])
+        self.assertEqual(DateTimeRangeWidget.picker_options['timePickerIncrement'],
+                         1)
+
+
+class FastRenderTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.tomorrow = self.now + datetime.timedelta(hours=24)
+
+        self.values = [
+            None,
+            (self.now, self.tomorrow),
+            time_range_generator(self.now, self.tomorrow),
+            'Not a "range" <script>&amp;',
+            mark_safe('Already &amp; escaped'),
+        ]
+        self.attrs = [
+            None,
+            {'id': 'id_time_range'},
+            {'id': 'id_<x>', 'required': True, 'disabled': False,
+             'data-count': 3, 'title': 'Tom & "Jerry"'},
+        ]
+
+    def assertSameRender(self, widget, name='time_range'):
+        for value in self.values:
+            for attrs in self.attrs:
+                widget.fast_render = False
+                expected = widget.render(name, value, attrs)
+
+                widget.fast_render = True
+                html = widget.render(name, value, attrs)
+
+                self.assertEqual(html, expected)
+                self.assertIsInstance(html, SafeString)
+
+    def test_matches_template(self):
+        """ Test that the fast render path gives the template's exact output """
+        self.assertSameRender(DateTimeRangeWidget())
+        self.assertSameRender(
+            DateTimeRangeWidget(attrs={'class': 'form-control', 'autofocus': True}),
+            name='range<&>')
+
+    def test_setting(self):
+        """ Test that the setting enables the fast render path by default """
+        widget = DateTimeRangeWidget()
+
+        with mock.patch.object(widget, 'render_html',
+                               return_value='fast') as render_html:
+            widget.render('time_range', None)
+            self.assertFalse(render_html.called)
+
+            with override_settings(DATERANGEPICKER_FAST_RENDER=True):
+                self.assertEqual(widget.render('time_range', None), 'fast')
+
+            # A widget attribute takes precedence over the setting.
+            widget = DateTimeRangeWidget(fast_render=False)
+
+            with override_settings(DATERANGEPICKER_FAST_RENDER=True):
+                widget.render('time_range', None)
+
+        self.assertEqual(render_html.call_count, 1)
+
+    @override_settings(DATERANGEPICKER_FAST_RENDER=True)
+    def test_form(self):
+        """ Test that a form renders the same either way """
+        form = EventForm({'title': 'Test Event',
+                          'time_range': time_range_generator(self.now,
+                                                             self.tomorrow)})
+        html = str(form)
+
+        with override_settings(DATERANGEPICKER_FAST_RENDER=False):
+            self.assertHTMLEqual(str(form), html)
+            self.assertEqual(str(form), html)
@@ -0,0 +1,168 @@
+# File: daterangepicker/timerange.py
+
+"""
+Value types for ranges of date/times.
+
+TimeRange is an immutable (start, end) pair that still behaves as a tuple, so
+``start, end = time_range`` keeps working. TimeRangeArray packs many ranges
+into a flat array of epoch microseconds, for collections too large to keep as
+one object per range.
+
+Like the rest of daterangepicker, both treat ranges as half-open,
+[start, end).
+"""
+
+from array import array
+from collections import namedtuple
+
+import datetime
+
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+class TimeRange(namedtuple("TimeRange", ["start", "end"])):
+    """ A range of date/times, from start up to but not including end. """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_pair(cls, pair):
+        """
+        Return pair as a TimeRange, raising ValueError unless it holds exactly
+        two date/times.
+
+        """
+        if isinstance(pair, cls):
+            return pair
+
+        if len(pair) != 2:
+            raise ValueError("Expected exactly two dates.")
+
+        return cls._make(pair)
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def contains(self, other):
+        """
+        Whether a date/time, or all of another range, falls within this range.
+
+        """
+        if isinstance(other, tuple):
+            return self.start <= other[0] and other[1] <= self.end
+
+        return self.start <= other < self.end
+
+    def overlaps(self, other):
+        return self.start < other[1] and other[0] < self.end
+
+    def intersection(self, other):
+        """ Return the range both ranges cover, or None if they don't overlap. """
+        if not self.overlaps(other):
+            return None
+
+        return TimeRange(max(self.start, other[0]), min(self.end, other[1]))
+
+
+class TimeRangeArray(object):
+    """
+    A list of time ranges stored as pairs of 64-bit microseconds since the
+    epoch, taking 16 bytes per range.
+
+    Ranges are returned as TimeRange objects in tzinfo, UTC by default. Pass
+    tzinfo=None to store naive date/times.
+
+    """
+
+    __slots__ = ("_data", "_epoch")
+
+    def __init__(self, time_ranges=(), tzinfo=datetime.timezone.utc):
+        self._data = array("q")
+        self._epoch = datetime.datetime(1970, 1, 1, tzinfo=tzinfo)
+
+        self.extend(time_ranges)
+
+    @property
+    def tzinfo(self):
+        return self._epoch.tzinfo
+
+    def _to_int(self, value):
+        return (value - self._epoch) // _MICROSECOND
+
+    def _to_datetime(self, value):
+        return self._epoch + datetime.timedelta(microseconds=value)
+
+    def append(self, time_range):
+        start, end = time_range
+
+        self._data.append(self._to_int(start))
+        self._data.append(self._to_int(end))
+
+    def extend(self, time_ranges):
+        to_int = self._to_int
+
+        for start, end in time_ranges:
+            self._data.append(to_int(start))
+            self._data.append(to_int(end))
+
+    def __len__(self):
+        return len(self._data) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            sliced = TimeRangeArray(tzinfo=self.tzinfo)
+
+            for i in range(*index.indices(len(self))):
+                sliced._data.extend(self._data[2 * i : 2 * i + 2])
+
+            return sliced
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("TimeRangeArray index out of range")
+
+        return TimeRange(
+            self._to_datetime(self._data[2 * index]),
+            self._to_datetime(self._data[2 * index + 1]),
+        )
+
+    def __iter__(self):
+        data = self._data
+        to_datetime = self._to_datetime
+
+        for i in range(0, len(data), 2):
+            yield TimeRange(to_datetime(data[i]), to_datetime(data[i + 1]))
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeRangeArray):
+            return NotImplemented
+
+        return self._data == other._data and self.tzinfo == other.tzinfo
+
+    def __repr__(self):
+        return "<TimeRangeArray: {} ranges>".format(len(self))
+
+    def overlapping(self, time_range):
+        """
+        Return the indexes of the ranges overlapping time_range, comparing the
+        stored integers without creating any date/times.
+
+        """
+        start = self._to_int(time_range[0])
+        end = self._to_int(time_range[1])
+        data = self._data
+
+        return [
+            i // 2
+            for i in range(0, len(data), 2)
+            if data[i] < end and start < data[i + 1]
+        ]
+
+    def durations(self):
+        """ Return the duration of each range, in microseconds. """
+        data = self._data
+
+        return array("q", (data[i + 1] - data[i] for i in range(0, len(data), 2)))
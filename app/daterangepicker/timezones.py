@@ -0,0 +1,103 @@
+# File: daterangepicker/timezones.py
+
+"""
+Bulk conversion of aware date/times to a timezone.
+
+Django's localtime(), and so to_current_timezone() and the template engine,
+look up the current timezone and check USE_TZ and awareness again for every
+value they convert. localize_many() converts a whole batch to one zone, looked
+up once:
+
+    starts = localize_many(event.time_start for event in events)
+
+pytz zones are converted with their table of UTC transitions, bisected
+directly for each value, instead of going through astimezone() and
+normalize(). zoneinfo and fixed-offset zones already keep their transitions in
+C, so astimezone() is the fastest way to shift each value with them.
+"""
+
+from django.utils import timezone
+
+from daterangepicker.timerange import TimeRange
+
+import bisect
+import datetime
+
+UTC = datetime.timezone.utc
+
+
+def _naive_utc(value):
+    if value.tzinfo is UTC:
+        return value.replace(tzinfo=None)
+
+    offset = value.utcoffset()
+
+    if offset is None:
+        raise ValueError("localize_many() cannot be applied to a naive datetime")
+
+    return value.replace(tzinfo=None) - offset
+
+
+def _localize_many_pytz(values, tz):
+    """
+    Convert aware date/times to the pytz zone tz, which keeps a tzinfo
+    instance per offset and the naive UTC date/times it changes at.
+
+    """
+    instants = tz._utc_transition_times
+    infos = tz._transition_info
+    tzinfos = tz._tzinfos
+    localized = []
+
+    for value in values:
+        if value is None:
+            localized.append(None)
+            continue
+
+        value = _naive_utc(value)
+        info = infos[max(bisect.bisect_right(instants, value) - 1, 0)]
+
+        localized.append((value + info[0]).replace(tzinfo=tzinfos[info]))
+
+    return localized
+
+
+def localize_many(values, tz=None):
+    """
+    Convert aware date/times to tz, by default the current timezone, and
+    return them as a list. None values are passed through, and naive ones
+    raise ValueError.
+
+    The result compares and formats the same as astimezone(tz) on each value.
+
+    """
+    if tz is None:
+        tz = timezone.get_current_timezone()
+
+    if hasattr(tz, "_utc_transition_times"):
+        return _localize_many_pytz(values, tz)
+
+    localized = []
+
+    for value in values:
+        if value is None:
+            localized.append(None)
+        elif value.utcoffset() is None:
+            raise ValueError("localize_many() cannot be applied to a naive datetime")
+        else:
+            localized.append(value.astimezone(tz))
+
+    return localized
+
+
+def localize_time_ranges(time_ranges, tz=None):
+    """
+    Convert the start and end of each of the time ranges to tz, by default the
+    current timezone, returning a list of TimeRanges.
+
+    """
+    values = localize_many(
+        [value for time_range in time_ranges for value in time_range], tz
+    )
+
+    return [TimeRange(values[i], values[i + 1]) for i in range(0, len(values), 2)]
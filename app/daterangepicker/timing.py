@@ -0,0 +1,184 @@
+# File: daterangepicker/timing.py
+
+"""
+Per-request timing of the phases of handling a form: cleaning, saving,
+rendering and database queries.
+
+Code marks a phase with ``with phase("name"):``. Outside of a request handled
+by ServerTimingMiddleware that costs a single context variable lookup, so the
+hooks can be left in place everywhere. The same goes for the query timer,
+which is installed on every database connection so that queries made from the
+worker threads of async views are counted too.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from contextvars import ContextVar
+
+import json
+import logging
+import time
+
+logger = logging.getLogger("daterangepicker.timing")
+
+_current = ContextVar("daterangepicker_timings", default=None)
+
+
+class Timings(object):
+    """ The durations, in seconds, collected while handling one request. """
+
+    __slots__ = ("phases", "query_count", "query_time")
+
+    def __init__(self):
+        self.phases = {}
+        self.query_count = 0
+        self.query_time = 0.0
+
+    def add(self, name, duration):
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def as_dict(self, total):
+        data = {
+            name: round(duration * 1e3, 3) for name, duration in self.phases.items()
+        }
+        data["db"] = round(self.query_time * 1e3, 3)
+        data["db_queries"] = self.query_count
+        data["total"] = round(total * 1e3, 3)
+
+        return data
+
+    def header(self, total):
+        """ Format the timings as a Server-Timing header value. """
+        metrics = [
+            "{};dur={:.3f}".format(name, duration * 1e3)
+            for name, duration in self.phases.items()
+        ]
+        metrics.append(
+            'db;dur={:.3f};desc="{} queries"'.format(
+                self.query_time * 1e3, self.query_count
+            )
+        )
+        metrics.append("total;dur={:.3f}".format(total * 1e3))
+
+        return ", ".join(metrics)
+
+
+class phase(object):
+    """
+    A context manager that adds the time spent inside it to the named phase of
+    the current request's timings, if they are being collected.
+
+    """
+
+    __slots__ = ("name", "timings", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = _current.get()
+
+        if self.timings is not None:
+            self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.start)
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    A database execute wrapper that times every query made while the timings
+    of a request are being collected.
+
+    """
+    timings = _current.get()
+
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.query_time += time.perf_counter() - start
+        timings.query_count += 1
+
+
+def install_query_timer(connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+connection_created.connect(install_query_timer)
+
+
+class ServerTimingMiddleware(object):
+    """
+    Collect phase and query timings for each request, and report them in a
+    Server-Timing header and a structured log line.
+
+    Put it first in MIDDLEWARE so that it covers all other middleware. It works
+    under both WSGI and ASGI, without forcing async views onto a thread.
+
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        # Connections opened before this module was imported missed the
+        # connection_created signal.
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings = Timings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self.report(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings = Timings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self.report(request, response, timings, time.perf_counter() - start)
+
+    def report(self, request, response, timings, total):
+        response["Server-Timing"] = timings.header(total)
+
+        if logger.isEnabledFor(logging.INFO):
+            data = timings.as_dict(total)
+            data.update(
+                method=request.method, path=request.path, status=response.status_code
+            )
+
+            logger.info(json.dumps(data, sort_keys=True), extra={"server_timing": data})
+
+        return response
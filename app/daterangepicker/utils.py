@@ -1,13 +1,220 @@
 # File: daterangepicker/utils.py
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
+from django.utils import timezone, translation
 from django.utils.dateformat import format
 from django.utils.formats import localize_input
 
 from django.forms.utils import to_current_timezone
 
+from daterangepicker.timerange import TimeRange
+from daterangepicker.timezones import localize_many
+
+from collections import OrderedDict, namedtuple
+
+import datetime
+import re
+import threading
+
 DATETIME_INPUT_FORMAT = "%m/%d/%Y %I:%M %p"
 
+# The seperator placed between the start and end of a time range string
+TIME_RANGE_SEPARATOR = " - "
+
+# Matches date/times written in DATETIME_INPUT_FORMAT, i.e. the format emitted
+# by time_range_generator and the front-end date range picker.
+DATETIME_INPUT_RE = re.compile(
+    r"(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2}):(\d{2}) ([AaPp])[Mm]\Z"
+)
+
+
+def parse_datetime_input(value):
+    """
+    Parse a single date/time string written either in DATETIME_INPUT_FORMAT or
+    in ISO 8601 form.
+
+    Returns None if the string is not recognised, so that callers can fall back
+    to the slower, more lenient DateTimeField parsing.
+
+    """
+    match = DATETIME_INPUT_RE.match(value)
+
+    if match is None:
+        # ISO 8601 date/times always have a dash right after the year.
+        if value[4:5] != "-":
+            return None
+
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+    month, day, year, hour, minute, meridiem = match.groups()
+
+    hour = int(hour)
+
+    if not 1 <= hour <= 12:
+        return None
+
+    # 12 AM is midnight and 12 PM is noon.
+    hour %= 12
+
+    if meridiem in "Pp":
+        hour += 12
+
+    try:
+        return datetime.datetime(int(year), int(month), int(day), hour, int(minute))
+    except ValueError:
+        return None
+
+
+def make_input_aware(value, tz):
+    """
+    Attach the timezone tz to a naive date/time parsed from user input.
+
+    Returns None for wall times that are ambiguous or do not exist in tz, so
+    that the slower DateTimeField path can report them properly.
+
+    """
+    if value.utcoffset() is not None:
+        return value
+
+    aware = value.replace(tzinfo=tz)
+
+    if aware.utcoffset() != value.replace(fold=not value.fold, tzinfo=tz).utcoffset():
+        return None
+
+    return aware
+
+
+def parse_time_range(time_range_str):
+    """
+    Parse both ends of a time range string in a single pass.
+
+    Returns a TimeRange of date/times in the current timezone, or None if the
+    string is not in one of the formats understood by
+    parse_datetime_input.
+
+    """
+    start_str, separator, end_str = time_range_str.partition(TIME_RANGE_SEPARATOR)
+
+    if not separator or TIME_RANGE_SEPARATOR in end_str:
+        return None
+
+    start = parse_datetime_input(start_str)
+
+    if start is None:
+        return None
+
+    end = parse_datetime_input(end_str)
+
+    if end is None:
+        return None
+
+    if settings.USE_TZ:
+        # Look up the current timezone once for both ends of the range.
+        tz = timezone.get_current_timezone()
+
+        start = make_input_aware(start, tz)
+        end = make_input_aware(end, tz)
+
+        if start is None or end is None:
+            return None
+
+    return TimeRange(start, end)
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class TimeRangeCache(object):
+    """
+    A bounded, thread-safe LRU cache of formatted time range strings.
+
+    The size limit is read from the DATERANGEPICKER_FORMAT_CACHE_SIZE setting
+    (default 1024) unless one is given explicitly. A size of 0 disables the
+    cache.
+
+    """
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        if self._maxsize is None:
+            return getattr(settings, "DATERANGEPICKER_FORMAT_CACHE_SIZE", 1024)
+
+        return self._maxsize
+
+    def get(self, key):
+        """ Return the cached value for key, or None if there is none. """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value):
+        """ Cache value under key, evicting the least recently used entries. """
+        maxsize = self.maxsize
+
+        if maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """ Drop every cached value and reset the hit/miss counters. """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """ Return the hit/miss counters and current size of the cache. """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+# Formatted strings produced by time_range_generator.
+time_range_cache = TimeRangeCache()
+
+# Settings that change how time_range_generator formats a range.
+TIME_RANGE_CACHE_SETTINGS = {
+    "DATETIME_FORMAT",
+    "DATERANGEPICKER_FORMAT_CACHE_SIZE",
+    "FORMAT_MODULE_PATH",
+    "LANGUAGE_CODE",
+    "TIME_ZONE",
+    "USE_L10N",
+    "USE_TZ",
+}
+
+
+@receiver(setting_changed)
+def clear_time_range_cache(setting, **kwargs):
+    if setting in TIME_RANGE_CACHE_SETTINGS:
+        time_range_cache.clear()
+
 
 def time_range_generator(start, end, html=False):
     """ 
@@ -21,10 +228,67 @@ def time_range_generator(start, end, html=False):
 
         "12/28/2017 03:30 AM - 12/28/2017 03:30 AM"
 
+    Results are kept in time_range_cache, keyed on the range, the mode, and the
+    active timezone and language.
+
+    """
+    key = (
+        start,
+        end,
+        html,
+        timezone.get_current_timezone(),
+        translation.get_language(),
+    )
+
+    time_range = time_range_cache.get(key)
+
+    if time_range is None:
+        time_range = format_time_range(start, end, html=html)
+        time_range_cache.set(key, time_range)
+
+    return time_range
+
+
+def format_time_range(start, end, html=False):
+    """
+    Format a time range string like time_range_generator, without caching.
+
+    """
+    return format_local_time_range(
+        to_current_timezone(start), to_current_timezone(end), html=html
+    )
+
+
+def format_time_ranges(time_ranges, html=False):
+    """
+    Format (start, end) pairs like format_time_range, returning a list of
+    strings. The aware date/times are converted to the current timezone in one
+    batch with localize_many.
+
+    """
+    values = [value for time_range in time_ranges for value in time_range]
+
+    if settings.USE_TZ:
+        aware = [i for i, value in enumerate(values) if timezone.is_aware(value)]
+
+        for i, value in zip(aware, localize_many([values[i] for i in aware])):
+            values[i] = value.replace(tzinfo=None)
+
+    return [
+        format_local_time_range(values[i], values[i + 1], html=html)
+        for i in range(0, len(values), 2)
+    ]
+
+
+def format_local_time_range(start, end, html=False):
+    """
+    Format a time range string like format_time_range, from date/times that
+    are already in the current timezone.
+
     """
 
     # The seperator to use between start and end date/times
-    separator = " &ndash; " if html else " - "
+    separator = " &ndash; " if html else TIME_RANGE_SEPARATOR
 
     # The function to use to format a datetime object into a string
     datetime_fmtr_func = format if html else localize_input
@@ -33,8 +297,5 @@ def time_range_generator(start, end, html=False):
     fmt_str = settings.DATETIME_FORMAT if html else DATETIME_INPUT_FORMAT
 
     return separator.join(
-        [
-            datetime_fmtr_func(to_current_timezone(start), fmt_str),
-            datetime_fmtr_func(to_current_timezone(end), fmt_str),
-        ]
+        [datetime_fmtr_func(start, fmt_str), datetime_fmtr_func(end, fmt_str),]
     )
@@ -1,22 +1,107 @@
 # File: daterangepicker/widgets.py
+from django.conf import settings
 from django.forms import TextInput
 from django.forms.utils import to_current_timezone
 
 from django.utils import timezone
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
+from daterangepicker.assets import BUNDLE_CSS, BUNDLE_JS
+from daterangepicker.timerange import TimeRange
 from daterangepicker.utils import time_range_generator
 
 import datetime
+import json
+
+
+def render_attrs(attrs):
+    """ Render widget attributes like django/forms/widgets/attrs.html. """
+    html = []
+
+    for name, value in attrs.items():
+        if value is True:
+            html.append(" {}".format(conditional_escape(name)))
+        elif value is not False:
+            html.append(
+                ' {}="{}"'.format(
+                    conditional_escape(name), conditional_escape(str(value))
+                )
+            )
+
+    return "".join(html)
 
 
 class DateTimeRangeWidget(TextInput):
+    """
+    A text input for a time range string, turned into a date range picker by
+    the widget's media.
+
+    The options of the picker are emitted as JSON in a
+    data-daterangepicker-options attribute, from which script.js creates the
+    picker the first time the input gets focus. Pass options to override some
+    of picker_options.
+
+    With fast_render, which defaults to the DATERANGEPICKER_FAST_RENDER setting
+    (False), the widget builds the HTML of its template directly instead of
+    going through the template engine. That is much cheaper for forms with
+    many widgets, but ignores overrides of the template.
+
+    """
+
     template_name = "daterangepicker/forms/widgets/datetimerange.html"
     supports_microseconds = False
 
-    def __init__(self, attrs=None):
+    # Options of the front-end picker, matching DATETIME_INPUT_FORMAT.
+    picker_options = {
+        "timePicker": True,
+        "timePickerIncrement": 1,
+        "locale": {"format": "MM/DD/YYYY hh:mm A"},
+    }
+
+    fast_render = None
+
+    def __init__(self, attrs=None, options=None, fast_render=None):
         super(DateTimeRangeWidget, self).__init__(attrs)
 
+        if options is not None:
+            self.picker_options = {**self.picker_options, **options}
+
+        if fast_render is not None:
+            self.fast_render = fast_render
+
+    def get_context(self, name, value, attrs):
+        context = super(DateTimeRangeWidget, self).get_context(name, value, attrs)
+
+        context["widget"]["attrs"].setdefault(
+            "data-daterangepicker-options",
+            json.dumps(self.picker_options, separators=(",", ":")),
+        )
+
+        return context
+
+    def render(self, name, value, attrs=None, renderer=None):
+        fast_render = self.fast_render
+
+        if fast_render is None:
+            fast_render = getattr(settings, "DATERANGEPICKER_FAST_RENDER", False)
+
+        if not fast_render:
+            return super(DateTimeRangeWidget, self).render(name, value, attrs, renderer)
+
+        return mark_safe(self.render_html(self.get_context(name, value, attrs)))
+
+    def render_html(self, context):
+        """ Return the HTML that template_name renders for the context. """
+        widget = context["widget"]
+
+        return '<input type="text" name="{}" value="{}"\n  {} />'.format(
+            conditional_escape(widget["name"]),
+            conditional_escape(widget["value"]),
+            render_attrs(widget["attrs"]),
+        )
+
     def format_value(self, time_range):
         if isinstance(time_range, str):
             return time_range
@@ -43,19 +128,18 @@ class DateTimeRangeWidget(TextInput):
             start_time = default_time
             end_time = default_time
         else:
-            start_time, end_time, *extra = [to_current_timezone(t) for t in time_range]
-
-            if extra:
+            try:
+                time_range = TimeRange.from_pair(time_range)
+            except ValueError:
                 raise ValueError(_("Expected exactly two dates."))
 
+            start_time = to_current_timezone(time_range.start)
+            end_time = to_current_timezone(time_range.end)
+
         return time_range_generator(start_time, end_time)
 
     class Media:
         css = {
-            "all": ("daterangepicker/css/styles.css",),
+            "all": (BUNDLE_CSS,),
         }
-        js = (
-            "//cdn.jsdelivr.net/momentjs/latest/moment.min.js",
-            "//cdn.jsdelivr.net/bootstrap.daterangepicker/2/" + "daterangepicker.js",
-            "daterangepicker/js/script.js",
-        )
+        js = (BUNDLE_JS,)
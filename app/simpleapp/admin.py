@@ -1,5 +1,8 @@
 # File: simpleapp/admin.py
 from simpleapp.models import Event
+from simpleapp.paginators import EstimatedCountPaginator
+
+from daterangepicker.admin import TimeRangeListFilter, admin_media
 
 from django.contrib import admin
 
@@ -7,4 +10,14 @@ from django.contrib import admin
 # Register your models here.
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    pass
+    list_display = ("title", "time_start", "time_end")
+    list_filter = [("time_range", TimeRangeListFilter)]
+    date_hierarchy = "time_start"
+
+    # Keep the changelist from counting the whole table, twice, on every page.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        return super(EventAdmin, self).media + admin_media()
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class SimpleAppConfig(AppConfig):
     name = "simpleapp"
+
+    def ready(self):
+        # Connect signal receivers.
+        from simpleapp import signals  # noqa: F401
@@ -0,0 +1,187 @@
+# File: simpleapp/caching.py
+from django.core.cache import cache
+
+import asyncio
+import hashlib
+import time
+
+# How long a re-render may take before another request is allowed to try.
+REVALIDATE_LOCK_TIMEOUT = 30
+
+# With stale_while_revalidate, how long past its timeout an entry is kept to
+# be served while it is re-rendered.
+STALE_TIMEOUT = 3600
+
+# How long a request waits for another one to render a fragment that isn't
+# cached at all, before rendering it itself, and how often it looks.
+MISS_WAIT = 2
+MISS_POLL_INTERVAL = 0.05
+
+
+def make_key(prefix, *parts):
+    """ Build a cache key of bounded length from arbitrary parts. """
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+
+    return "{}:{}".format(prefix, digest)
+
+
+def _entry(version, html, timeout):
+    """ A cache entry, fresh for timeout seconds (forever if None). """
+    fresh_until = None if timeout is None else time.time() + timeout
+
+    return (version, html, fresh_until)
+
+
+def _valid_entry(entry):
+    # Entries in any other shape were written by older code.
+    if isinstance(entry, tuple) and len(entry) == 3:
+        return entry
+
+    return None
+
+
+def _is_fresh(entry, version):
+    cached_version, html, fresh_until = entry
+
+    return cached_version == version and (
+        fresh_until is None or time.time() < fresh_until
+    )
+
+
+def _hard_timeout(timeout, stale_while_revalidate):
+    if timeout is None or not stale_while_revalidate:
+        return timeout
+
+    return timeout + STALE_TIMEOUT
+
+
+def _waited_entry(entry, version):
+    """ Whether an entry that appeared while waiting on a miss may be used. """
+    return entry is not None and entry[0] == version
+
+
+def fetch_fragment(key, version, render, timeout=None, stale_while_revalidate=False):
+    """
+    Return a (version, html) pair: the HTML fragment cached under key and the
+    version it was rendered for, calling render() to produce and cache it if
+    there is no fresh entry for the given version.
+
+    version is anything that changes whenever the fragment's data does, so an
+    entry cached for another version is never served as current, and entries
+    are fresh for timeout seconds.
+
+    With stale_while_revalidate, only one request at a time renders the
+    fragment. While it does, the others get the outdated entry, which is kept
+    STALE_TIMEOUT seconds past its timeout for that. The version returned is
+    then the one the outdated entry was rendered for, so callers can give the
+    response matching validators. If nothing is cached at all, the others
+    wait up to MISS_WAIT seconds for the render instead of all rendering the
+    same fragment at once.
+
+    If version is None, the fragment is always rendered afresh.
+
+    """
+    if version is None:
+        return None, render()
+
+    entry = _valid_entry(cache.get(key))
+
+    if entry is not None and _is_fresh(entry, version):
+        return entry[:2]
+
+    lock_key = key + ":lock"
+    locked = False
+
+    if stale_while_revalidate:
+        locked = cache.add(lock_key, True, REVALIDATE_LOCK_TIMEOUT)
+
+        if not locked and entry is not None:
+            return entry[:2]
+
+        if not locked:
+            deadline = time.monotonic() + MISS_WAIT
+
+            while time.monotonic() < deadline and cache.get(lock_key):
+                time.sleep(MISS_POLL_INTERVAL)
+
+            entry = _valid_entry(cache.get(key))
+
+            if _waited_entry(entry, version):
+                return entry[:2]
+
+    try:
+        html = render()
+        cache.set(
+            key,
+            _entry(version, html, timeout),
+            _hard_timeout(timeout, stale_while_revalidate),
+        )
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+    return version, html
+
+
+def cached_fragment(key, version, render, timeout=None, stale_while_revalidate=False):
+    """ Like fetch_fragment, but only return the HTML. """
+    return fetch_fragment(key, version, render, timeout, stale_while_revalidate)[1]
+
+
+async def afetch_fragment(
+    key, version, render, timeout=None, stale_while_revalidate=False
+):
+    """
+    Async version of fetch_fragment, using the async cache API. render is a
+    coroutine function.
+
+    """
+    if version is None:
+        return None, await render()
+
+    entry = _valid_entry(await cache.aget(key))
+
+    if entry is not None and _is_fresh(entry, version):
+        return entry[:2]
+
+    lock_key = key + ":lock"
+    locked = False
+
+    if stale_while_revalidate:
+        locked = await cache.aadd(lock_key, True, REVALIDATE_LOCK_TIMEOUT)
+
+        if not locked and entry is not None:
+            return entry[:2]
+
+        if not locked:
+            deadline = time.monotonic() + MISS_WAIT
+
+            while time.monotonic() < deadline and await cache.aget(lock_key):
+                await asyncio.sleep(MISS_POLL_INTERVAL)
+
+            entry = _valid_entry(await cache.aget(key))
+
+            if _waited_entry(entry, version):
+                return entry[:2]
+
+    try:
+        html = await render()
+        await cache.aset(
+            key,
+            _entry(version, html, timeout),
+            _hard_timeout(timeout, stale_while_revalidate),
+        )
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+
+    return version, html
+
+
+async def acached_fragment(
+    key, version, render, timeout=None, stale_while_revalidate=False
+):
+    """ Like afetch_fragment, but only return the HTML. """
+    return (
+        await afetch_fragment(key, version, render, timeout, stale_while_revalidate)
+    )[1]
@@ -0,0 +1,200 @@
+# File: simpleapp/exports.py
+from daterangepicker.recurrence import MONTHLY, Recurrence
+from daterangepicker.utils import format_time_ranges
+
+from django.utils import timezone
+
+from itertools import islice
+
+import csv
+import datetime
+
+# Number of rows fetched from the database at a time.
+CHUNK_SIZE = 2000
+
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+# A wall-clock date/time, qualified by a TZID parameter.
+ICS_LOCAL_DATETIME_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def iter_chunks(rows, chunk_size):
+    """ Yield lists of up to chunk_size items from the iterable rows. """
+    rows = iter(rows)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+class Echo(object):
+    """ A file-like object whose write method just returns what it is given. """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yield the events in queryset as lines of CSV, with the same title,
+    time_range and recurrence columns that the import_events command reads.
+
+    """
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(["title", "time_range", "recurrence"])
+
+    rows = queryset.values_list("title", "time_start", "time_end", "recurrence")
+
+    # Convert the date/times of a whole chunk to the current timezone at once.
+    for chunk in iter_chunks(rows.iterator(chunk_size=chunk_size), chunk_size):
+        time_ranges = format_time_ranges((row[1], row[2]) for row in chunk)
+
+        for (title, _, _, recurrence), time_range in zip(chunk, time_ranges):
+            yield writer.writerow(
+                [title, time_range, "" if recurrence is None else str(recurrence)]
+            )
+
+
+def ics_escape(text):
+    """ Escape text for use as an iCalendar TEXT value (RFC 5545, 3.3.11). """
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def ics_line(line):
+    """
+    Fold a content line so that no physical line is longer than 75 octets
+    (RFC 5545, 3.1), and terminate it with CRLF.
+
+    """
+    data = line.encode("utf-8")
+
+    if len(data) <= 75:
+        return line + "\r\n"
+
+    chunks = []
+    limit = 75
+
+    while data:
+        cut = min(limit, len(data))
+
+        # Never split a multi-byte UTF-8 sequence.
+        while cut < len(data) and data[cut] & 0xC0 == 0x80:
+            cut -= 1
+
+        chunks.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+
+        # Continuation lines start with a space, which counts towards the limit.
+        limit = 74
+
+    return "\r\n ".join(chunks) + "\r\n"
+
+
+def ics_recurrence_lines(time_start, time_end, recurrence):
+    """
+    Return the DTSTART, DTEND, RRULE and EXDATE lines of a recurring event.
+
+    Occurrences repeat on the wall clock of the default timezone, so the
+    date/times are given in it, with a TZID naming the IANA time zone. The
+    VTIMEZONE that would define it is left out, as time zones by reference
+    allow (RFC 7809); calendar clients know the IANA zones.
+
+    """
+    tz = timezone.get_default_timezone()
+    tzid = "TZID=" + timezone.get_default_timezone_name()
+
+    def local(value):
+        return timezone.localtime(value, tz).strftime(ICS_LOCAL_DATETIME_FORMAT)
+
+    # Excluded dates are EXDATE properties of their own in iCalendar.
+    rule = str(
+        Recurrence(
+            recurrence.frequency,
+            interval=recurrence.interval,
+            count=recurrence.count,
+            until=recurrence.until,
+        )
+    )
+    day = timezone.localtime(time_start, tz).day
+
+    # A plain monthly RRULE skips the months without the day, rather than
+    # falling on their last day.
+    if recurrence.frequency == MONTHLY and day > 28:
+        rule += ";BYMONTHDAY={},-1;BYSETPOS=1".format(day)
+
+    lines = [
+        "DTSTART;{}:{}".format(tzid, local(time_start)),
+        "DTEND;{}:{}".format(tzid, local(time_end)),
+        "RRULE:" + rule,
+    ]
+
+    if recurrence.exdates:
+        lines.append(
+            "EXDATE;{}:{}".format(
+                tzid, ",".join(local(exdate) for exdate in sorted(recurrence.exdates))
+            )
+        )
+
+    return lines
+
+
+def iter_ics(queryset, domain, chunk_size=CHUNK_SIZE):
+    """
+    Yield the events in queryset as an iCalendar (.ics) file, one VEVENT at a
+    time. Event UIDs are made unique with the given domain. Recurring events
+    are a single VEVENT with an RRULE.
+
+    """
+    utc = datetime.timezone.utc
+    dtstamp = timezone.now().astimezone(utc).strftime(ICS_DATETIME_FORMAT)
+
+    yield "".join(
+        ics_line(line)
+        for line in [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//daterangepicker-mwe//simpleapp//EN",
+        ]
+    )
+
+    rows = queryset.values_list("pk", "title", "time_start", "time_end", "recurrence")
+
+    for chunk in iter_chunks(rows.iterator(chunk_size=chunk_size), chunk_size):
+        descriptions = format_time_ranges((row[2], row[3]) for row in chunk)
+
+        for row, description in zip(chunk, descriptions):
+            pk, title, time_start, time_end, recurrence = row
+
+            if recurrence is None:
+                times = [
+                    "DTSTART:"
+                    + time_start.astimezone(utc).strftime(ICS_DATETIME_FORMAT),
+                    "DTEND:" + time_end.astimezone(utc).strftime(ICS_DATETIME_FORMAT),
+                ]
+            else:
+                times = ics_recurrence_lines(time_start, time_end, recurrence)
+
+            lines = [
+                "BEGIN:VEVENT",
+                "UID:event-{}@{}".format(pk, domain),
+                "DTSTAMP:" + dtstamp,
+                *times,
+                "SUMMARY:" + ics_escape(title),
+                "DESCRIPTION:" + ics_escape(description),
+                "END:VEVENT",
+            ]
+
+            yield "".join(ics_line(line) for line in lines)
+
+    yield ics_line("END:VCALENDAR")
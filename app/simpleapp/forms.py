@@ -1,8 +1,14 @@
 # File: simpleapp/forms.py
-from simpleapp.models import Event
+from simpleapp.models import Event, Occurrence
+from simpleapp.occurrences import horizon
 
 from daterangepicker.forms import TimeRangedModelForm
 from daterangepicker.fields import DateTimeRangeField
+from daterangepicker.recurrence import occurrences
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 class EventForm(TimeRangedModelForm):
@@ -12,10 +18,44 @@ class EventForm(TimeRangedModelForm):
 
     """
 
+    # The rows of conflict_queryset() are Occurrences, owned by their event.
+    conflict_owner = "event_id"
+
     class Meta:
         model = Event
         fields = "__all__"
 
+    def conflict_queryset(self):
+        """ The materialised occurrences of every event. """
+        return Occurrence.objects.select_related("event")
+
+    def conflict_ranges(self, time_range):
+        """
+        The occurrences of the event's series that start before the
+        occurrence horizon, since the Occurrence rows end there too. A series
+        starting beyond the horizon is checked on its first occurrence.
+
+        """
+        try:
+            recurrence = Event._meta.get_field("recurrence").to_python(
+                self.cleaned_data.get("recurrence")
+            )
+        except ValidationError:
+            # Reported when the model is validated.
+            recurrence = None
+
+        if recurrence is None:
+            return [time_range]
+
+        return list(
+            occurrences(
+                time_range,
+                recurrence,
+                end=horizon(),
+                tz=timezone.get_default_timezone(),
+            )
+        ) or [time_range]
+
 
 class EventFormAllowsPast(EventForm):
     """ 
@@ -28,3 +68,9 @@ class EventFormAllowsPast(EventForm):
     """
 
     time_range = DateTimeRangeField(allow_past=True)
+
+
+class TimeRangeForm(forms.Form):
+    """ A form with just a time range, used by the picker benchmark page. """
+
+    time_range = DateTimeRangeField()
@@ -0,0 +1,106 @@
+# File: simpleapp/freebusy.py
+
+"""
+Cached free/busy lookups over the occurrences of events.
+
+The busy intervals of a window are cached under a version built from a token
+per UTC day the window covers. Saving or deleting an event replaces the tokens
+of the days touched by the occurrences it added or removed, so only the
+windows overlapping those are recomputed, and saves that leave the
+occurrences as they were replace none. Tokens expire along with the windows
+cached under them, and a missing token is replaced with a fresh one.
+
+Recurring events are busy up to the occurrence horizon; see
+simpleapp.occurrences.
+"""
+
+from simpleapp.caching import cached_fragment, make_key
+from simpleapp.models import Occurrence
+from simpleapp.occurrences import materialised_ranges
+
+from daterangepicker.freebusy import busy_intervals
+
+from django.conf import settings
+from django.core.cache import cache
+
+import datetime
+import hashlib
+import uuid
+
+# The longest window answered, which bounds both the query and the number of
+# day tokens looked up.
+MAX_WINDOW = datetime.timedelta(days=366)
+
+DAY_KEY_PREFIX = "simpleapp:freebusy:day"
+
+
+def day_keys(start, end):
+    """ Return the cache keys of the tokens of the UTC days [start, end] touches. """
+    first = start.astimezone(datetime.timezone.utc).date()
+    last = end.astimezone(datetime.timezone.utc).date()
+
+    return [
+        "{}:{}".format(DAY_KEY_PREFIX, first + datetime.timedelta(days=n))
+        for n in range((last - first).days + 1)
+    ]
+
+
+def window_version(start, end):
+    keys = day_keys(start, end)
+    tokens = cache.get_many(keys)
+
+    # A token that was never set, or was evicted, gets a fresh value, so an
+    # entry cached under the old one can never match again.
+    missing = {key: uuid.uuid4().hex for key in keys if key not in tokens}
+
+    if missing:
+        cache.set_many(missing, settings.SIMPLEAPP_FREEBUSY_CACHE_TIMEOUT)
+        tokens.update(missing)
+
+    return hashlib.md5(
+        "".join(tokens[key] for key in keys).encode("ascii")
+    ).hexdigest()
+
+
+def invalidate(time_ranges):
+    """ Invalidate the cached windows overlapping any of the time ranges. """
+    keys = set()
+
+    for time_start, time_end in time_ranges:
+        keys.update(day_keys(time_start, time_end))
+
+    if keys:
+        cache.set_many(
+            {key: uuid.uuid4().hex for key in keys},
+            settings.SIMPLEAPP_FREEBUSY_CACHE_TIMEOUT,
+        )
+
+
+def invalidate_series(changes):
+    """
+    Invalidate the cached windows overlapping the occurrences that are in only
+    one of the old and new series of each (old, new) pair in changes. Series
+    are as returned by Event.series(), or None for no event.
+
+    """
+    time_ranges = []
+
+    for old, new in changes:
+        if old != new:
+            time_ranges.extend(materialised_ranges(old) ^ materialised_ranges(new))
+
+    invalidate(time_ranges)
+
+
+def busy(start, end):
+    """
+    Return the merged (start, end) intervals within [start, end) during which
+    an occurrence of an event is taking place.
+
+    """
+    return cached_fragment(
+        make_key("simpleapp:freebusy", start.isoformat(), end.isoformat()),
+        version=window_version(start, end),
+        render=lambda: busy_intervals(Occurrence.objects.all(), start, end),
+        timeout=settings.SIMPLEAPP_FREEBUSY_CACHE_TIMEOUT,
+    )
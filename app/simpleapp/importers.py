@@ -0,0 +1,256 @@
+# File: simpleapp/importers.py
+from simpleapp import freebusy, occurrences, watermarks
+from simpleapp.models import Event, Occurrence
+
+from daterangepicker.conflicts import find_conflicts
+from daterangepicker.fields import DateTimeRangeField
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+
+from collections import namedtuple
+from itertools import islice
+
+import csv
+import json
+
+ImportResult = namedtuple("ImportResult", ["created", "failed"])
+
+# An occurrence of the index-th event of a batch, as handed to find_conflicts.
+BatchOccurrence = namedtuple(
+    "BatchOccurrence", ["pk", "time_start", "time_end", "index"]
+)
+
+
+def read_csv(lines):
+    """
+    Yield (line number, row) pairs from CSV text with a header row, e.g.
+
+        title,time_range,recurrence
+        Parade,06/09/2030 11:00 AM - 06/09/2030 02:00 PM,FREQ=WEEKLY;COUNT=4
+
+    The recurrence column is optional.
+
+    """
+    reader = csv.DictReader(lines)
+
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(lines):
+    """
+    Yield (line number, row) pairs from JSON Lines text with one object per
+    line, e.g.
+
+        {"title": "Parade", "time_range": "06/09/2030 11:00 AM - ..."}
+
+    Lines that are not JSON objects are yielded as their error message.
+
+    """
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_num, "Invalid JSON: {}".format(e)
+            continue
+
+        if not isinstance(row, dict):
+            yield line_num, "Expected a JSON object."
+            continue
+
+        yield line_num, row
+
+
+READERS = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+}
+
+
+class EventImporter(object):
+    """
+    Create Event rows from a stream of (line number, row) pairs, as yielded by
+    read_csv or read_jsonl.
+
+    Rows are validated with the same rules as DateTimeRangeField and saved with
+    one bulk_create per batch of batch_size rows, each in its own transaction.
+    On databases where bulk_create can't return the new primary keys, the rows
+    of a batch are saved one by one instead.
+    Invalid rows are reported to on_error(line number, messages) and skipped.
+    Only one batch is held in memory at a time.
+
+    Rows may have a recurrence rule. With check_conflicts, rows with an
+    occurrence overlapping one of an existing event or an earlier row are
+    rejected too, up to the occurrence horizon that the Occurrence table
+    covers. That costs one range query per batch.
+
+    """
+
+    def __init__(
+        self, batch_size=1000, allow_past=False, check_conflicts=False, on_error=None
+    ):
+        self.batch_size = batch_size
+        self.check_conflicts = check_conflicts
+        self.on_error = on_error
+
+        self.time_range_field = DateTimeRangeField(allow_past=allow_past)
+        self.title_field = Event._meta.get_field("title")
+        self.recurrence_field = Event._meta.get_field("recurrence")
+
+    def run(self, rows):
+        """ Import every row, returning an ImportResult with the totals. """
+        created = 0
+        failed = 0
+
+        rows = iter(rows)
+
+        while True:
+            batch = list(islice(rows, self.batch_size))
+
+            if not batch:
+                break
+
+            events = self.import_batch(batch)
+
+            created += len(events)
+            failed += len(batch) - len(events)
+
+        return ImportResult(created, failed)
+
+    def import_batch(self, batch):
+        """ Validate and save one batch of rows, returning the new events. """
+        time_ranges, errors = self.time_range_field.clean_batch(
+            [
+                (row.get("time_range") or "") if isinstance(row, dict) else ""
+                for line_num, row in batch
+            ]
+        )
+
+        events = []
+        line_nums = []
+
+        for (line_num, row), time_range, error in zip(batch, time_ranges, errors):
+            if not isinstance(row, dict):
+                self.report(line_num, [row])
+                continue
+
+            messages = []
+
+            try:
+                title = self.title_field.clean(row.get("title", ""), None)
+            except ValidationError as e:
+                messages.extend(e.messages)
+
+            recurrence = row.get("recurrence") or ""
+
+            if not isinstance(recurrence, str):
+                messages.append("Expected a recurrence rule string.")
+            else:
+                try:
+                    recurrence = self.recurrence_field.to_python(recurrence)
+                except ValidationError as e:
+                    messages.extend(e.messages)
+
+            if error is not None:
+                messages.extend(error.messages)
+
+            if messages:
+                self.report(line_num, messages)
+                continue
+
+            time_start, time_end = time_range
+            events.append(
+                Event(
+                    title=title,
+                    time_start=time_start,
+                    time_end=time_end,
+                    recurrence=recurrence,
+                )
+            )
+            line_nums.append(line_num)
+
+        if self.check_conflicts:
+            events = self.reject_conflicts(events, line_nums)
+
+        if events and not self.can_bulk_create():
+            # Each save sends post_save, whose receivers do the rest.
+            with transaction.atomic():
+                for event in events:
+                    event.save()
+        elif events:
+            with transaction.atomic():
+                Event.objects.bulk_create(events)
+
+                # bulk_create does not send post_save, so record the change here.
+                occurrences.refresh(events)
+                watermarks.touch(watermarks.EVENTS)
+
+            freebusy.invalidate_series((None, event.series()) for event in events)
+
+        return events
+
+    def can_bulk_create(self):
+        """
+        Whether bulk_create sets the primary keys of the new events, which
+        their occurrences need.
+
+        """
+        return connections[Event.objects.db].features.can_return_rows_from_bulk_insert
+
+    def reject_conflicts(self, events, line_nums):
+        """
+        Report and drop the events with an occurrence that overlaps one of an
+        existing event or of an event that comes earlier in the batch,
+        returning the rest.
+
+        """
+        until = occurrences.horizon()
+
+        # A series starting beyond the horizon is checked on its first
+        # occurrence, as the only one that an existing row could overlap.
+        candidates = [
+            BatchOccurrence(None, time_range.start, time_range.end, i)
+            for i, event in enumerate(events)
+            for time_range in list(event.occurrences(end=until)) or [event.time_range]
+        ]
+        found = [[] for _ in events]
+
+        for candidate, conflicts in zip(
+            candidates,
+            find_conflicts(Occurrence.objects.select_related("event"), candidates),
+        ):
+            found[candidate.index].extend(
+                conflict
+                for conflict in conflicts
+                if not (
+                    isinstance(conflict, BatchOccurrence)
+                    and conflict.index == candidate.index
+                )
+            )
+
+        accepted = [False] * len(events)
+
+        for i, conflicts in enumerate(found):
+            for conflict in conflicts:
+                if not isinstance(conflict, BatchOccurrence):
+                    self.report(line_nums[i], ["Overlaps with {}.".format(conflict)])
+                    break
+
+                if conflict.index < i and accepted[conflict.index]:
+                    self.report(
+                        line_nums[i],
+                        ["Overlaps with line {}.".format(line_nums[conflict.index])],
+                    )
+                    break
+            else:
+                accepted[i] = True
+
+        return [event for event, ok in zip(events, accepted) if ok]
+
+    def report(self, line_num, messages):
+        if self.on_error is not None:
+            self.on_error(line_num, messages)
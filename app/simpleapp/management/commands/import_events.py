@@ -0,0 +1,79 @@
+# File: simpleapp/management/commands/import_events.py
+from simpleapp.importers import READERS, EventImporter
+
+from django.core.management.base import BaseCommand, CommandError
+
+import os
+import sys
+
+
+class Command(BaseCommand):
+    help = (
+        "Import events from a CSV or JSON Lines file with title, time_range and "
+        "optional recurrence."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format. Guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows saved per transaction.",
+        )
+        parser.add_argument(
+            "--allow-past",
+            action="store_true",
+            help="Accept events that start in the past.",
+        )
+        parser.add_argument(
+            "--reject-conflicts",
+            action="store_true",
+            help="Skip events with an occurrence that overlaps one of an existing "
+            "event or an earlier row.",
+        )
+
+    def handle(
+        self,
+        path,
+        format=None,
+        batch_size=1000,
+        allow_past=False,
+        reject_conflicts=False,
+        **options
+    ):
+        if format is None:
+            format = os.path.splitext(path)[1].lstrip(".").lower()
+
+            if format not in READERS:
+                raise CommandError("Cannot guess the format of {}.".format(path))
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        def on_error(line_num, messages):
+            self.stderr.write("line {}: {}".format(line_num, " ".join(messages)))
+
+        importer = EventImporter(
+            batch_size=batch_size,
+            allow_past=allow_past,
+            check_conflicts=reject_conflicts,
+            on_error=on_error,
+        )
+
+        if path == "-":
+            result = importer.run(READERS[format](sys.stdin))
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                result = importer.run(READERS[format](f))
+
+        self.stdout.write(
+            "Imported {} events, skipped {} invalid rows.".format(
+                result.created, result.failed
+            )
+        )
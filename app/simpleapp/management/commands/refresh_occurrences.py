@@ -0,0 +1,103 @@
+# File: simpleapp/management/commands/refresh_occurrences.py
+from simpleapp import freebusy, occurrences
+from simpleapp.models import Event
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+import datetime
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        "Extend the materialised occurrences of recurring events up to the "
+        "horizon, or rebuild them for every event."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Regenerate the occurrences of every event from scratch.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Days ahead to materialise occurrences up to. "
+            "Defaults to SIMPLEAPP_OCCURRENCE_HORIZON_DAYS.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of events refreshed per transaction.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches, to leave room for other "
+            "queries.",
+        )
+
+    def handle(self, rebuild=False, days=None, batch_size=500, sleep=0, **options):
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        if days is None:
+            until = occurrences.horizon()
+        elif days < 0:
+            raise CommandError("--days must not be negative.")
+        else:
+            until = timezone.now() + datetime.timedelta(days=days)
+
+        queryset = Event.objects.all()
+
+        if not rebuild:
+            queryset = queryset.filter(
+                Q(occurrences_until__isnull=True)
+                | (~Q(recurrence="") & Q(occurrences_until__lt=until))
+            )
+
+        refreshed = 0
+        last_pk = None
+
+        # Walk the events in primary key order, one batch per transaction, so
+        # a large table is never locked or held in memory as a whole.
+        while True:
+            batch = queryset.order_by("pk")
+
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+
+            batch = list(batch[:batch_size])
+
+            if not batch:
+                break
+
+            before = [event.series() for event in batch]
+
+            if rebuild:
+                occurrences.refresh(batch, until)
+            else:
+                occurrences.extend(batch, until)
+
+            # Extending a series only invalidates the days it was extended to.
+            freebusy.invalidate_series(zip(before, [event.series() for event in batch]))
+
+            refreshed += len(batch)
+            last_pk = batch[-1].pk
+
+            if options.get("verbosity", 1) > 1:
+                self.stdout.write("Refreshed {} events.".format(refreshed))
+
+            if sleep:
+                time.sleep(sleep)
+
+        self.stdout.write(
+            "Materialised the occurrences of {} events up to {}.".format(
+                refreshed, until.isoformat()
+            )
+        )
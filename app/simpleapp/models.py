@@ -1,10 +1,234 @@
 # File: simpleapp/models.py
 from django.db import models
+from django.utils import timezone
+
+from daterangepicker.modelfields import RecurrenceField, TimeRangeField
+from daterangepicker.recurrence import occurrences
+
+import heapq
+
+
+class EventQuerySet(models.QuerySet):
+    """
+    Range lookups for Event. Each of them is a plain comparison on time_start
+    and/or time_end, so they can be answered from the indexes declared in
+    Event.Meta.
+
+    """
+
+    def overlapping(self, start, end, max_duration=None):
+        """
+        Events that overlap the half-open range [start, end).
+
+        If no event lasts longer than max_duration, pass it in so that the
+        time_start index can be range-scanned from both sides; otherwise every
+        event that ends after start has to be looked at.
+
+        """
+        queryset = self.filter(time_start__lt=end, time_end__gt=start)
+
+        if max_duration is not None:
+            queryset = queryset.filter(time_start__gt=start - max_duration)
+
+        return queryset
+
+    def containing(self, moment, max_duration=None):
+        """
+        Events that are happening at the given moment, i.e. whose half-open
+        range [start, end) includes it. See overlapping() for max_duration.
+
+        """
+        queryset = self.filter(time_start__lte=moment, time_end__gt=moment)
+
+        if max_duration is not None:
+            queryset = queryset.filter(time_start__gt=moment - max_duration)
+
+        return queryset
+
+    def upcoming(self, now=None):
+        """ Events that have not started yet, soonest first. """
+        if now is None:
+            now = timezone.now()
+
+        return self.filter(time_start__gt=now).order_by("time_start")
+
+    def past(self, now=None):
+        """ Events that have already ended, most recent first. """
+        if now is None:
+            now = timezone.now()
+
+        return self.filter(time_end__lt=now).order_by("-time_end")
+
+    def occurrences(self, start, end):
+        """
+        Lazily yield (event, TimeRange) pairs for the occurrences of these
+        events that overlap [start, end), in order of their start.
+
+        The materialised occurrences, those starting before the
+        occurrences_until of their event, come from one indexed query on the
+        Occurrence table. Only events never materialised, and series
+        materialised up to less than end, are expanded here, from their
+        occurrences_until on; series that ended long ago aren't even fetched.
+
+        """
+        materialised = (
+            Occurrence.objects.overlapping(start, end)
+            .filter(event__in=self)
+            .select_related("event")
+            .order_by("time_start")
+        )
+        recurring = ~models.Q(recurrence="")
+        events = self.filter(
+            models.Q(occurrences_until__isnull=True)
+            & (
+                models.Q(recurrence="", time_start__lt=end, time_end__gt=start)
+                | (recurring & models.Q(time_start__lt=end))
+            )
+            | (recurring & models.Q(time_start__lt=end, occurrences_until__lt=end))
+        )
+
+        def materialised_occurrences():
+            for occurrence in materialised:
+                yield occurrence.event, occurrence.time_range
+
+        def event_occurrences(event):
+            until = event.occurrences_until
+            window_start = start if until is None else max(start, until)
+
+            for time_range in event.occurrences(window_start, end):
+                if until is None or time_range.start >= until:
+                    yield event, time_range
+
+        return heapq.merge(
+            materialised_occurrences(),
+            *[event_occurrences(event) for event in events],
+            key=lambda occurrence: occurrence[1].start,
+        )
 
 
 class Event(models.Model):
     """ Represents a named event. """
 
     title = models.CharField(max_length=100)
-    time_start = models.DateTimeField()
-    time_end = models.DateTimeField()
+
+    # Adds the time_start and time_end columns.
+    time_range = TimeRangeField()
+
+    # How the event repeats, if it does. time_range is its first occurrence.
+    recurrence = RecurrenceField(
+        help_text="Optional, e.g. FREQ=WEEKLY;COUNT=10 or "
+        "FREQ=MONTHLY;UNTIL=20301231T000000Z"
+    )
+
+    # Occurrences starting before this are materialised as Occurrence rows.
+    occurrences_until = models.DateTimeField(null=True, editable=False)
+
+    objects = EventQuerySet.as_manager()
+
+    def __str__(self):
+        return self.title
+
+    def occurrences(self, start=None, end=None):
+        """
+        Lazily yield the occurrences of the event overlapping [start, end), as
+        TimeRanges. They repeat on the wall clock of the default timezone.
+
+        """
+        recurrence = self._meta.get_field("recurrence").to_python(self.recurrence)
+
+        return occurrences(
+            self.time_range,
+            recurrence,
+            start=start,
+            end=end,
+            tz=timezone.get_default_timezone(),
+        )
+
+    def series(self):
+        """
+        Return what the event's Occurrence rows are generated from: its time
+        range, recurrence and occurrences_until.
+
+        """
+        return (
+            self.time_start,
+            self.time_end,
+            self._meta.get_field("recurrence").to_python(self.recurrence),
+            self.occurrences_until,
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Event, cls).from_db(db, field_names, values)
+
+        # Remember the saved series, so that the free/busy windows of the
+        # occurrences it changes can be invalidated when it is saved.
+        if {"time_start", "time_end", "recurrence", "occurrences_until"} <= set(
+            instance.__dict__
+        ):
+            instance._loaded_series = instance.series()
+
+        return instance
+
+    class Meta:
+        indexes = [
+            # Serves upcoming() and the time_start bound of overlapping() and
+            # containing().
+            models.Index(
+                fields=["time_start", "time_end"], name="event_start_end_idx"
+            ),
+            # Serves past() and the time_end bound of overlapping() and
+            # containing().
+            models.Index(
+                fields=["time_end", "time_start"], name="event_end_start_idx"
+            ),
+            # Serves the keyset pagination of the home page listing.
+            models.Index(fields=["time_start", "id"], name="event_start_id_idx"),
+        ]
+
+
+class Watermark(models.Model):
+    """
+    Records when the rows of a table last changed, so that views can answer
+    conditional requests without querying the table itself.
+
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    modified = models.DateTimeField()
+
+    # Incremented on every change, so that changes within the same clock tick
+    # still give different versions.
+    counter = models.PositiveBigIntegerField(default=0)
+
+
+class OccurrenceQuerySet(models.QuerySet):
+    def overlapping(self, start, end):
+        """ Occurrences that overlap the half-open range [start, end). """
+        return self.filter(time_start__lt=end, time_end__gt=start)
+
+
+class Occurrence(models.Model):
+    """
+    One occurrence of an event, materialised from its time range and
+    recurrence by simpleapp.occurrences, so that windows across many series
+    can be answered with an indexed range query.
+
+    """
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+
+    # Adds the time_start and time_end columns.
+    time_range = TimeRangeField()
+
+    objects = OccurrenceQuerySet.as_manager()
+
+    def __str__(self):
+        return str(self.event)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["time_start", "time_end"], name="occurrence_start_end_idx"
+            ),
+        ]
@@ -0,0 +1,150 @@
+# File: simpleapp/occurrences.py
+
+"""
+The Occurrence table: the occurrences of every event, materialised so that
+windows across many recurring series are answered by one indexed range query
+instead of expanding each series on every request.
+
+A one-off event has a single row. A recurring event has a row for each of its
+occurrences starting before its occurrences_until, which is set to the horizon,
+SIMPLEAPP_OCCURRENCE_HORIZON_DAYS ahead, when the rows are generated.
+
+Saving an event regenerates the rows of that event only, and deleting it
+cascades to them. The refresh_occurrences command moves the horizon forward,
+or rebuilds the table, in batches.
+
+None of these functions invalidate the free/busy cache; their callers do.
+"""
+
+from simpleapp.models import Event, Occurrence
+
+from daterangepicker.timerange import TimeRange
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+import datetime
+
+
+def horizon(now=None):
+    """ Return the date/time up to which occurrences are materialised. """
+    if now is None:
+        now = timezone.now()
+
+    return now + datetime.timedelta(days=settings.SIMPLEAPP_OCCURRENCE_HORIZON_DAYS)
+
+
+def occurrence_rows(event, start=None, end=None):
+    """
+    Yield unsaved Occurrences of the event starting in [start, end). A one-off
+    event always gets its row, whatever the window.
+
+    """
+    if not event.recurrence:
+        start = end = None
+
+    for time_range in event.occurrences(start=start, end=end):
+        if start is not None and time_range.start < start:
+            continue
+
+        yield Occurrence(
+            event=event, time_start=time_range.start, time_end=time_range.end
+        )
+
+
+def materialised_ranges(series):
+    """
+    Return the set of the time ranges of the Occurrence rows generated from a
+    series, as returned by Event.series(), or of none for None.
+
+    """
+    if series is None:
+        return set()
+
+    time_start, time_end, recurrence, until = series
+
+    # A recurring event that was never materialised has no rows.
+    if recurrence is not None and until is None:
+        return set()
+
+    event = Event(
+        time_start=time_start,
+        time_end=time_end,
+        recurrence=recurrence,
+        occurrences_until=until,
+    )
+
+    return {
+        TimeRange(row.time_start, row.time_end)
+        for row in occurrence_rows(event, end=until)
+    }
+
+
+def refresh(events, until=None):
+    """
+    Regenerate the occurrences of the saved events up to until, the horizon
+    by default. Takes one DELETE, one bulk INSERT and one UPDATE, in a single
+    transaction, however many events there are.
+
+    """
+    events = list(events)
+
+    if not events:
+        return
+
+    if until is None:
+        until = horizon()
+
+    rows = [row for event in events for row in occurrence_rows(event, end=until)]
+
+    with transaction.atomic():
+        Occurrence.objects.filter(event__in=events).delete()
+        Occurrence.objects.bulk_create(rows)
+        Event.objects.filter(pk__in=[event.pk for event in events]).update(
+            occurrences_until=until
+        )
+
+    for event in events:
+        event.occurrences_until = until
+
+
+def extend(events, until=None):
+    """
+    Add the occurrences of the saved events that start between their
+    occurrences_until and until, the horizon by default, without touching
+    the rows already there. One-off events have nothing to add, and events
+    that were never materialised are refreshed instead.
+
+    """
+    if until is None:
+        until = horizon()
+
+    events = [
+        event
+        for event in events
+        if event.occurrences_until is None or event.occurrences_until < until
+    ]
+    stale = [event for event in events if event.occurrences_until is None]
+    events = [event for event in events if event.occurrences_until is not None]
+
+    refresh(stale, until)
+
+    if not events:
+        return
+
+    rows = [
+        row
+        for event in events
+        if event.recurrence
+        for row in occurrence_rows(event, start=event.occurrences_until, end=until)
+    ]
+
+    with transaction.atomic():
+        Occurrence.objects.bulk_create(rows)
+        Event.objects.filter(pk__in=[event.pk for event in events]).update(
+            occurrences_until=until
+        )
+
+    for event in events:
+        event.occurrences_until = until
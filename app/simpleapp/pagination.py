@@ -0,0 +1,148 @@
+# File: simpleapp/pagination.py
+from django.db.models import Q
+
+import base64
+import datetime
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(direction, value, pk):
+    """
+    Encode a position in a keyset-paginated listing as an opaque string.
+
+    direction is "next" for the page after the given (value, pk) key, or
+    "previous" for the page before it.
+
+    """
+    data = json.dumps([direction, value.isoformat(), pk], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """ Reverse encode_cursor, raising InvalidCursor on malformed input. """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, value, pk = json.loads(data)
+
+        if direction not in ("next", "previous") or not isinstance(pk, int):
+            raise ValueError(direction)
+
+        return direction, datetime.datetime.fromisoformat(value), pk
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+
+
+class KeysetPage(object):
+    def __init__(self, object_list, has_next, has_previous, paginator):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.paginator = paginator
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+
+        return self.paginator.cursor_for("next", self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+
+        return self.paginator.cursor_for("previous", self.object_list[0])
+
+
+class KeysetPaginator(object):
+    """
+    Paginate a queryset by seeking past the (field, pk) key of the last row
+    shown, rather than with OFFSET. Fetching any page costs the same however
+    deep into the listing it is, provided there is an index on (field, pk).
+
+    """
+
+    def __init__(self, queryset, per_page, field="time_start"):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def cursor_for(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self.field), obj.pk)
+
+    def page(self, cursor=None):
+        """
+        Return the page for the given cursor, or the first page if there is
+        none. Raises InvalidCursor if the cursor cannot be decoded.
+
+        """
+        direction, queryset = self.page_queryset(cursor)
+
+        return self.make_page(direction, list(queryset))
+
+    async def apage(self, cursor=None):
+        """ Async version of page, fetching the rows with aiterator. """
+        direction, queryset = self.page_queryset(cursor)
+
+        return self.make_page(direction, [obj async for obj in queryset.aiterator()])
+
+    def page_queryset(self, cursor):
+        """
+        Return the direction of the page for the given cursor and a queryset
+        fetching one row more than the page holds, to tell whether the page
+        has a neighbour in that direction.
+
+        """
+        if not cursor:
+            return None, self.ordered()[: self.per_page + 1]
+
+        direction, value, pk = decode_cursor(cursor)
+
+        if direction == "next":
+            # The leading range condition lets the database seek straight to
+            # the key in the index before applying the tie-breaker on pk.
+            queryset = self.ordered().filter(
+                Q(**{self.field + "__gt": value}) | Q(pk__gt=pk),
+                **{self.field + "__gte": value},
+            )
+        else:
+            queryset = self.ordered(reverse=True).filter(
+                Q(**{self.field + "__lt": value}) | Q(pk__lt=pk),
+                **{self.field + "__lte": value},
+            )
+
+        return direction, queryset[: self.per_page + 1]
+
+    def make_page(self, direction, object_list):
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+
+        if direction is None:
+            return KeysetPage(
+                object_list, has_next=has_more, has_previous=False, paginator=self
+            )
+
+        if direction == "next":
+            return KeysetPage(
+                object_list, has_next=has_more, has_previous=True, paginator=self
+            )
+
+        return KeysetPage(
+            object_list[::-1], has_next=True, has_previous=has_more, paginator=self
+        )
+
+    def ordered(self, reverse=False):
+        prefix = "-" if reverse else ""
+
+        return self.queryset.order_by(prefix + self.field, prefix + "pk")
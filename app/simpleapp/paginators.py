@@ -0,0 +1,88 @@
+# File: simpleapp/paginators.py
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, models, transaction
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+# Per database vendor, a query for the number of rows the planner's statistics
+# give the table named by its one parameter, or None.
+ROW_STATISTICS_SQL = {
+    "postgresql": "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+    "mysql": (
+        "SELECT table_rows FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = %s"
+    ),
+    # Only filled in by ANALYZE. The first number of each row is the count.
+    "sqlite": "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+}
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that doesn't count every row of a large unfiltered table.
+
+    Up to exact_count_below rows are counted exactly, with a COUNT(*) over a
+    query limited to that many rows. Only if the limit is reached is the size
+    estimated, from the database's row statistics or, without those, from
+    the largest auto-incremented primary key; both are cheap lookups.
+    Estimates may be off either way, so the last pages can come out empty or
+    missing. Filtered querysets are always counted exactly.
+
+    """
+
+    exact_count_below = 10000
+
+    @cached_property
+    def count(self):
+        if not self.can_estimate():
+            return super(EstimatedCountPaginator, self).count
+
+        bounded = self.object_list[: self.exact_count_below].count()
+
+        if bounded < self.exact_count_below:
+            return bounded
+
+        return max(bounded, self.estimate_count() or 0)
+
+    def can_estimate(self):
+        """ Whether object_list is a whole table, whose size can be estimated. """
+        queryset = self.object_list
+
+        if not isinstance(queryset, models.QuerySet):
+            return False
+
+        query = queryset.query
+
+        return not (
+            query.where or query.distinct or query.is_sliced or query.combinator
+        )
+
+    def estimate_count(self):
+        """ Return the estimated number of rows, or None if there is none. """
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        sql = ROW_STATISTICS_SQL.get(connection.vendor)
+
+        if sql is not None:
+            # In a savepoint, as a failed query would abort the transaction.
+            try:
+                with transaction.atomic(using=queryset.db):
+                    with connection.cursor() as cursor:
+                        cursor.execute(sql, [queryset.model._meta.db_table])
+                        row = cursor.fetchone()
+            except DatabaseError:
+                row = None
+
+            if row is not None and row[0] is not None:
+                # A float for PostgreSQL, an integer for MySQL and a string of
+                # integers for SQLite.
+                estimate = int(float(str(row[0]).split()[0]))
+
+                # PostgreSQL reports -1 for tables that were never analysed.
+                if estimate >= 0:
+                    return estimate
+
+        if not isinstance(queryset.model._meta.pk, models.AutoField):
+            return None
+
+        return queryset.order_by().aggregate(estimate=Max("pk"))["estimate"] or 0
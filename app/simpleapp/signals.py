@@ -0,0 +1,69 @@
+# File: simpleapp/signals.py
+from simpleapp import freebusy, occurrences, watermarks
+from simpleapp.models import Event
+
+from daterangepicker.signals import bulk_saved
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# The fields the occurrences of an event are generated from.
+SERIES_FIELDS = {"time_start", "time_end", "recurrence"}
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def touch_events_watermark(sender, **kwargs):
+    watermarks.touch(watermarks.EVENTS)
+
+
+@receiver(post_save, sender=Event)
+def refresh_occurrences(sender, instance, update_fields=None, **kwargs):
+    # Deleting an event cascades to its occurrences, so only saves need this.
+    if update_fields is None or SERIES_FIELDS & set(update_fields):
+        occurrences.refresh([instance])
+
+
+@receiver(pre_save, sender=Event)
+def load_series(sender, instance, **kwargs):
+    # Instances that weren't loaded whole, e.g. with only() or built with a
+    # pk, look up the series they replace.
+    if instance.pk is not None and not hasattr(instance, "_loaded_series"):
+        saved = Event.objects.filter(pk=instance.pk).first()
+        instance._loaded_series = None if saved is None else saved.series()
+
+
+@receiver(post_save, sender=Event)
+def invalidate_freebusy(sender, instance, **kwargs):
+    loaded = getattr(instance, "_loaded_series", None)
+    instance._loaded_series = instance.series()
+
+    freebusy.invalidate_series([(loaded, instance._loaded_series)])
+
+
+@receiver(post_delete, sender=Event)
+def invalidate_freebusy_deleted(sender, instance, **kwargs):
+    loaded = getattr(instance, "_loaded_series", None)
+
+    freebusy.invalidate_series([(loaded or instance.series(), None)])
+
+
+@receiver(bulk_saved, sender=Event)
+def bulk_saved_events(sender, created, updated, **kwargs):
+    events = list(created) + list(updated)
+
+    # The formset's instances were all loaded whole, or are new.
+    loaded = [getattr(event, "_loaded_series", None) for event in events]
+
+    occurrences.refresh(events)
+    watermarks.touch(watermarks.EVENTS)
+
+    for event in events:
+        event._loaded_series = event.series()
+
+    changes = [(old, event._loaded_series) for old, event in zip(loaded, events)]
+
+    # The new occurrences aren't visible to other connections until the
+    # transaction commits, so a window recomputed before then would be stale.
+    transaction.on_commit(lambda: freebusy.invalidate_series(changes))
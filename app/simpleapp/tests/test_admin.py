@@ -0,0 +1,241 @@
+# File: simpleapp/tests/test_admin.py
+from django.contrib.admin import site
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from simpleapp.models import Event
+from simpleapp.paginators import EstimatedCountPaginator
+
+from daterangepicker.admin import TimeRangeListFilter
+from daterangepicker.assets import BUNDLE_JS
+from daterangepicker.forms import time_range_generator
+
+from types import SimpleNamespace
+from unittest import mock
+
+import datetime
+import unittest
+
+CHANGELIST_URL = reverse('admin:simpleapp_event_changelist')
+
+
+class EventAdminTestCase(TestCase):
+
+    def setUp(self):
+        self.start = (timezone.now() + datetime.timedelta(days=1)).replace(
+                        second=0, microsecond=0)
+        self.hour = datetime.timedelta(hours=1)
+
+        self.events = [
+            Event.objects.create(
+                title="Test Event{}".format(n),
+                time_start=self.start + 3 * n * self.hour,
+                time_end=self.start + (3 * n + 2) * self.hour,
+            )
+            for n in range(3)
+        ]
+
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(user)
+
+    def test_changelist(self):
+        """
+        Test that the changelist renders the range filter with its picker
+        media and a date hierarchy
+
+        """
+        response = self.client.get(CHANGELIST_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="time_range__overlaps"')
+        self.assertContains(response, BUNDLE_JS)
+        self.assertContains(response, 'class="toplinks"')
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+        # The bundle needs the global jQuery that jquery.init.js removes.
+        content = response.content.decode()
+        self.assertLess(content.index('admin/js/vendor/jquery/jquery'),
+                        content.index(BUNDLE_JS))
+        self.assertLess(content.index(BUNDLE_JS),
+                        content.index('admin/js/jquery.init.js'))
+
+    def test_range_filter(self):
+        """ Test that the range filter keeps the overlapping events only """
+        time_range = time_range_generator(self.start + 4 * self.hour,
+                                          self.start + 6 * self.hour)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(CHANGELIST_URL,
+                                       {'time_range__overlaps': time_range})
+
+        self.assertEqual(list(response.context['cl'].result_list),
+                         [self.events[1]])
+
+        sql = [q['sql'] for q in queries if 'simpleapp_event' in q['sql']]
+        self.assertTrue(any('"simpleapp_event"."time_start" <' in s
+                            and '"simpleapp_event"."time_end" >' in s
+                            for s in sql))
+
+    def test_range_filter_invalid(self):
+        """ Test that an invalid range redirects like other bad lookups """
+        response = self.client.get(CHANGELIST_URL,
+                                   {'time_range__overlaps': 'yo momma'})
+
+        self.assertRedirects(response, CHANGELIST_URL + '?e=1',
+                             fetch_redirect_response=False)
+
+    def test_string_parameters(self):
+        """
+        Test the filter with parameters and a changelist shaped like Django
+        4.2's, with single string values and no filter_params
+
+        """
+        time_range = time_range_generator(self.start + 4 * self.hour,
+                                          self.start + 6 * self.hour)
+
+        spec = TimeRangeListFilter(
+                    Event._meta.get_field('time_range'),
+                    RequestFactory().get(CHANGELIST_URL),
+                    {'time_range__overlaps': time_range},
+                    Event, site._registry[Event], 'time_range')
+
+        self.assertEqual(spec.lookup_val, time_range)
+        self.assertEqual(list(spec.queryset(None, Event.objects.all())),
+                         [self.events[1]])
+
+        changelist = SimpleNamespace(
+                        params={'o': '1', 'time_range__overlaps': time_range},
+                        get_query_string=lambda remove: '?o=1')
+        list(spec.choices(changelist))
+
+        self.assertEqual(spec.hidden_params, [('o', '1')])
+
+    def test_no_full_count(self):
+        """
+        Test that an unfiltered changelist counts no further than the bound
+        before estimating its size
+
+        """
+        with mock.patch.object(EstimatedCountPaginator, 'exact_count_below', 2), \
+                mock.patch.dict('simpleapp.paginators.ROW_STATISTICS_SQL', clear=True), \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(CHANGELIST_URL)
+
+        self.assertEqual(response.context['cl'].result_count, self.events[-1].pk)
+
+        counts = [q['sql'] for q in queries
+                  if 'COUNT(' in q['sql'] and 'simpleapp_event' in q['sql']]
+        self.assertTrue(counts)
+        for sql in counts:
+            self.assertIn('LIMIT 2', sql)
+
+    def test_change_past_event(self):
+        """
+        Test that an event which has already started can still be edited
+
+        """
+        event = self.events[0]
+        event.time_start -= datetime.timedelta(days=2)
+        event.time_end -= datetime.timedelta(days=2)
+        event.save()
+
+        data = {
+            'title': "Renamed Event",
+            'time_range': time_range_generator(
+                            timezone.localtime(event.time_start),
+                            timezone.localtime(event.time_end)),
+            'recurrence': "",
+        }
+        response = self.client.post(
+                        reverse('admin:simpleapp_event_change', args=[event.pk]),
+                        data)
+
+        self.assertRedirects(response, CHANGELIST_URL)
+
+        event.refresh_from_db()
+        self.assertEqual(event.title, "Renamed Event")
+        self.assertEqual(event.time_start, self.events[0].time_start)
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+
+        self.events = [
+            Event.objects.create(title="Test Event{}".format(n),
+                                 time_start=now, time_end=now)
+            for n in range(5)
+        ]
+        self.events[0].delete()
+
+    def paginator(self, queryset, exact_count_below=2):
+        paginator = EstimatedCountPaginator(queryset, 2)
+        paginator.exact_count_below = exact_count_below
+
+        return paginator
+
+    def test_below_bound(self):
+        """ Test that tables smaller than the bound are counted exactly """
+        queryset = Event.objects.order_by('pk')
+
+        self.assertEqual(self.paginator(queryset, exact_count_below=1000).count, 4)
+
+    def test_sparse_pks(self):
+        """
+        Test that a few rows with a large primary key are counted, not
+        estimated from the key
+
+        """
+        now = timezone.now()
+        Event.objects.create(pk=2000000, title="Test Event",
+                             time_start=now, time_end=now)
+        queryset = Event.objects.order_by('pk')
+
+        self.assertEqual(self.paginator(queryset, exact_count_below=10).count, 5)
+
+    def test_estimate(self):
+        """
+        Test that a table reaching the bound is estimated from its largest pk
+        without row statistics
+
+        """
+        queryset = Event.objects.order_by('pk')
+
+        with mock.patch.dict('simpleapp.paginators.ROW_STATISTICS_SQL', clear=True):
+            self.assertEqual(self.paginator(queryset).count, self.events[-1].pk)
+
+    def test_estimate_at_least_bound(self):
+        """ Test that an estimate below the bound gives the bound """
+        queryset = Event.objects.order_by('pk')
+
+        with mock.patch.object(EstimatedCountPaginator, 'estimate_count',
+                               return_value=1):
+            self.assertEqual(self.paginator(queryset, exact_count_below=3).count, 3)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', "sqlite_stat1 is SQLite's")
+    def test_row_statistics(self):
+        """ Test that the estimate comes from the statistics ANALYZE keeps """
+        queryset = Event.objects.order_by('pk')
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        self.assertEqual(self.paginator(queryset).estimate_count(), 4)
+
+    def test_filtered(self):
+        """ Test that filtered querysets and lists are counted exactly """
+        queryset = Event.objects.filter(title__endswith='4').order_by('pk')
+
+        self.assertEqual(self.paginator(queryset, exact_count_below=0).count, 1)
+        self.assertEqual(self.paginator(list(range(7))).count, 7)
+
+    def test_empty(self):
+        """ Test the count of an empty table """
+        Event.objects.all().delete()
+
+        self.assertEqual(self.paginator(Event.objects.order_by('pk')).count, 0)
@@ -0,0 +1,137 @@
+# File: simpleapp/tests/test_caching.py
+from django.core.cache import cache
+from django.test import TestCase
+
+from simpleapp.caching import cached_fragment, fetch_fragment, make_key
+
+from unittest import mock
+
+
+class CachedFragmentTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.key = make_key("test", "fragment")
+        self.renders = []
+
+    def render(self, html):
+        def render():
+            self.renders.append(html)
+            return html
+
+        return render
+
+    def test_hit(self):
+        """ Test that a fragment is only rendered once per version """
+        self.assertEqual(cached_fragment(self.key, 1, self.render("a")), "a")
+        self.assertEqual(cached_fragment(self.key, 1, self.render("b")), "a")
+
+        self.assertEqual(self.renders, ["a"])
+
+    def test_new_version(self):
+        """ Test that a new version is rendered afresh """
+        cached_fragment(self.key, 1, self.render("a"))
+
+        self.assertEqual(cached_fragment(self.key, 2, self.render("b")), "b")
+        self.assertEqual(cached_fragment(self.key, 2, self.render("c")), "b")
+
+    def test_no_version(self):
+        """ Test that fragments without a version are never cached """
+        cached_fragment(self.key, None, self.render("a"))
+        cached_fragment(self.key, None, self.render("b"))
+
+        self.assertEqual(self.renders, ["a", "b"])
+
+    def test_stale_while_revalidate(self):
+        """ 
+        Test that the outdated fragment is served while another request is
+        re-rendering it
+        
+        """
+        cached_fragment(self.key, 1, self.render("a"))
+
+        # Another request is busy re-rendering the fragment.
+        cache.add(self.key + ":lock", True)
+
+        self.assertEqual(
+            cached_fragment(self.key, 2, self.render("b"), 
+                            stale_while_revalidate=True),
+            "a"
+        )
+        self.assertEqual(self.renders, ["a"])
+
+        cache.delete(self.key + ":lock")
+
+        self.assertEqual(
+            cached_fragment(self.key, 2, self.render("b"), 
+                            stale_while_revalidate=True),
+            "b"
+        )
+        self.assertIsNone(cache.get(self.key + ":lock"))
+
+    def test_served_version(self):
+        """ Test that the version of the outdated fragment served is returned """
+        fetch_fragment(self.key, 1, self.render("a"))
+        cache.add(self.key + ":lock", True)
+
+        self.assertEqual(
+            fetch_fragment(self.key, 2, self.render("b"),
+                           stale_while_revalidate=True),
+            (1, "a")
+        )
+
+    def test_soft_timeout(self):
+        """
+        Test that an entry past its timeout is re-rendered, but is kept to be
+        served meanwhile
+
+        """
+        with mock.patch('simpleapp.caching.time.time', return_value=1000):
+            cached_fragment(self.key, 1, self.render("a"), timeout=10,
+                            stale_while_revalidate=True)
+
+        with mock.patch('simpleapp.caching.time.time', return_value=1020):
+            cache.add(self.key + ":lock", True)
+            self.assertEqual(
+                cached_fragment(self.key, 1, self.render("b"), timeout=10,
+                                stale_while_revalidate=True),
+                "a"
+            )
+
+            cache.delete(self.key + ":lock")
+            self.assertEqual(
+                cached_fragment(self.key, 1, self.render("b"), timeout=10,
+                                stale_while_revalidate=True),
+                "b"
+            )
+
+    def test_hard_timeout(self):
+        """ Test that entries outlive their timeout when they may be served stale """
+        with mock.patch.object(cache, 'set') as cache_set:
+            cached_fragment(self.key, 1, self.render("a"), timeout=10,
+                            stale_while_revalidate=True)
+
+        self.assertGreater(cache_set.call_args[0][2], 10)
+
+    def test_miss_waits_for_render(self):
+        """
+        Test that a request finding neither an entry nor the lock free waits
+        for the other request's render instead of rendering too
+
+        """
+        cache.add(self.key + ":lock", True)
+
+        def other_request_renders(seconds):
+            cached_fragment(self.key, 1, self.render("a"))
+            cache.delete(self.key + ":lock")
+
+        with mock.patch('simpleapp.caching.time.sleep',
+                        side_effect=other_request_renders):
+            self.assertEqual(
+                cached_fragment(self.key, 1, self.render("b"),
+                                stale_while_revalidate=True),
+                "a"
+            )
+
+        self.assertEqual(self.renders, ["a"])
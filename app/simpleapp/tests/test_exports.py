@@ -0,0 +1,130 @@
+# File: simpleapp/tests/test_exports.py
+from django.test import TestCase
+from django.utils import timezone
+
+from simpleapp.exports import ics_escape, ics_line, iter_csv, iter_ics
+from simpleapp.importers import EventImporter, read_csv
+from simpleapp.models import Event
+
+from daterangepicker.forms import time_range_generator
+from daterangepicker.recurrence import MONTHLY, WEEKLY, Recurrence
+
+import datetime
+import io
+
+
+class ExportsTestCase(TestCase):
+
+    def setUp(self):
+        self.tomorrow = timezone.now().replace(second=0, microsecond=0) \
+                        + datetime.timedelta(hours=24)
+        self.day_after = self.tomorrow + datetime.timedelta(hours=24)
+
+        self.event = Event.objects.create(
+                        title="Test Event, with; punctuation",
+                        time_start=self.tomorrow,
+                        time_end=self.day_after,
+                    )
+
+    def test_iter_csv(self):
+        """ Test that CSV output matches the time ranges shown in the UI """
+        lines = list(iter_csv(Event.objects.all()))
+
+        self.assertEqual(lines[0], "title,time_range,recurrence\r\n")
+        self.assertEqual(
+            lines[1], 
+            '"{}",{},\r\n'.format(
+                self.event.title, 
+                time_range_generator(self.tomorrow, self.day_after),
+            )
+        )
+
+    def test_iter_csv_round_trip(self):
+        """ Test that exported CSV can be imported again """
+        exported = io.StringIO("".join(iter_csv(Event.objects.all())))
+        Event.objects.all().delete()
+
+        result = EventImporter().run(read_csv(exported))
+
+        self.assertEqual(result, (1, 0))
+        
+        event = Event.objects.get()
+
+        self.assertEqual(event.title, self.event.title)
+        self.assertEqual(event.time_start, self.tomorrow)
+        self.assertEqual(event.time_end, self.day_after)
+
+    def test_iter_csv_recurrence_round_trip(self):
+        """ Test that exported recurrence rules are imported again """
+        self.event.recurrence = Recurrence(WEEKLY, count=4)
+        self.event.save()
+
+        exported = io.StringIO("".join(iter_csv(Event.objects.all())))
+        Event.objects.all().delete()
+
+        self.assertEqual(EventImporter().run(read_csv(exported)), (1, 0))
+        self.assertEqual(Event.objects.get().recurrence, Recurrence(WEEKLY, count=4))
+
+    def test_iter_ics(self):
+        """ Test the iCalendar output for an event """
+        ics = "".join(iter_ics(Event.objects.all(), domain="example.com"))
+
+        self.assertTrue(ics.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"))
+        self.assertTrue(ics.endswith("END:VCALENDAR\r\n"))
+
+        self.assertIn("UID:event-{}@example.com\r\n".format(self.event.pk), ics)
+        self.assertIn("SUMMARY:Test Event\\, with\\; punctuation\r\n", ics)
+        self.assertIn(
+            "DTSTART:" + self.tomorrow.astimezone(datetime.timezone.utc)
+                                      .strftime("%Y%m%dT%H%M%SZ") + "\r\n",
+            ics
+        )
+
+    def test_iter_ics_recurrence(self):
+        """
+        Test that a recurring event is written once, with an RRULE and its
+        excluded dates on the wall clock of the default timezone
+
+        """
+        new_york = timezone.get_default_timezone()
+        start = datetime.datetime(2030, 1, 31, 10, 0, tzinfo=new_york)
+
+        Event.objects.create(
+            title="Monthly Event",
+            time_start=start,
+            time_end=start + datetime.timedelta(hours=1),
+            recurrence=Recurrence(
+                MONTHLY, count=6,
+                exdates=[datetime.datetime(2030, 4, 30, 10, 0, tzinfo=new_york)]),
+        )
+
+        ics = "".join(iter_ics(Event.objects.all(), domain="example.com"))
+
+        self.assertEqual(ics.count("BEGIN:VEVENT"), 2)
+        self.assertIn("DTSTART;TZID=America/New_York:20300131T100000\r\n", ics)
+        self.assertIn("DTEND;TZID=America/New_York:20300131T110000\r\n", ics)
+        self.assertIn(
+            "RRULE:FREQ=MONTHLY;COUNT=6;BYMONTHDAY=31,-1;BYSETPOS=1\r\n", ics)
+        self.assertIn("EXDATE;TZID=America/New_York:20300430T100000\r\n", ics)
+
+        # The one-off event is still in UTC, without a rule.
+        self.assertEqual(ics.count("RRULE:"), 1)
+
+    def test_ics_escape(self):
+        """ Test escaping iCalendar TEXT values """
+        self.assertEqual(ics_escape("a\\b;c,d\ne"), "a\\\\b\\;c\\,d\\ne")
+
+    def test_ics_line_folding(self):
+        """ Test that long lines are folded at 75 octets """
+        line = "DESCRIPTION:" + "é" * 100
+        folded = ics_line(line)
+
+        physical_lines = folded.split("\r\n")[:-1]
+
+        for physical_line in physical_lines:
+            self.assertLessEqual(len(physical_line.encode("utf-8")), 75)
+
+        self.assertEqual(
+            "".join(l[1:] if i else l for i, l in enumerate(physical_lines)),
+            line
+        )
@@ -1,11 +1,14 @@
 # File: simpleapp/tests/test_forms.py
+from django.db import models
 from django.test import TestCase
+from django.test.utils import isolate_apps
 from django.utils import timezone
 
-from simpleapp.models import Event
+from simpleapp.models import Event, Watermark
 from simpleapp.forms import EventForm, EventFormAllowsPast
 
-from daterangepicker.forms import time_range_generator
+from daterangepicker.forms import TimeRangedModelForm, time_range_generator
+from daterangepicker.recurrence import DAILY, Recurrence
 
 import datetime
 
@@ -46,6 +49,20 @@ class EventFormTestCase(TestCase):
         self.assertNotIn('time_start', form.fields)
         self.assertNotIn('time_end', form.fields)
 
+    def test_fields_not_shared(self):
+        """
+        Test that each form gets its own time_range field and widget, while
+        their subfields are shared
+
+        """
+        form, other = EventForm(), EventForm()
+
+        self.assertIsNot(form.fields['time_range'], other.fields['time_range'])
+        self.assertIsNot(form.fields['time_range'].widget,
+                         other.fields['time_range'].widget)
+        self.assertIs(form.fields['time_range'].fields,
+                      other.fields['time_range'].fields)
+
     def test_with_existing_instance(self):
         """
         Test to ensure that a pre-existing instance's time_start and time_end
@@ -97,6 +114,23 @@ class EventFormTestCase(TestCase):
         event.save() 
         self.assertTrue(Event.objects.filter(pk=event.pk).exists())
 
+    async def test_asave(self):
+        """ Test saving a form to database from async code """
+        time_range = time_range_generator(self.tomorrow, self.tomorrow)
+        data = {
+                'title': 'Test Event',
+                'time_range': time_range,
+            }
+
+        form = EventForm(data)
+
+        self.assertTrue(form.is_valid())
+
+        event = await form.asave()
+        self.assertEqual(event.time_start, form.cleaned_data['time_range'][0])
+
+        self.assertTrue(await Event.objects.filter(pk=event.pk).aexists())
+
     def test_save_bad_time_range(self):
         """
         Ensure that validations are working on the form for bad time range data 
@@ -128,6 +162,182 @@ class EventFormTestCase(TestCase):
         self.assertFalse(form.is_valid())
 
 
+@isolate_apps('simpleapp')
+class PlainColumnsTestCase(TestCase):
+    """ A TimeRangedModelForm for a model without a TimeRangeField """
+
+    def setUp(self):
+        class Meeting(models.Model):
+            title = models.CharField(max_length=100)
+            time_start = models.DateTimeField()
+            time_end = models.DateTimeField()
+
+        class MeetingForm(TimeRangedModelForm):
+            class Meta:
+                model = Meeting
+                fields = '__all__'
+
+        self.Meeting = Meeting
+        self.MeetingForm = MeetingForm
+
+        self.tomorrow = (timezone.now() + datetime.timedelta(hours=24)).replace(
+                            second=0, microsecond=0)
+
+    def test_fields_replaced_on_class(self):
+        """
+        Test that time_start and time_end are taken out of the form class's
+        base fields, not just out of each form
+
+        """
+        self.assertIn('time_range', self.MeetingForm.base_fields)
+        self.assertNotIn('time_start', self.MeetingForm.base_fields)
+        self.assertNotIn('time_end', self.MeetingForm.base_fields)
+
+    def test_with_existing_instance(self):
+        """ Test that the instance's columns become the initial time_range """
+        meeting = self.Meeting(title="Test Meeting", time_start=self.tomorrow,
+                               time_end=self.tomorrow)
+
+        form = self.MeetingForm(instance=meeting)
+
+        self.assertEqual(form.initial['time_range'],
+                         (self.tomorrow, self.tomorrow))
+        self.assertNotIn('time_start', form.initial)
+
+    def test_save_no_commit(self):
+        """ Test that saving sets both columns from time_range """
+        form = self.MeetingForm({
+                    'title': 'Test Meeting',
+                    'time_range': time_range_generator(self.tomorrow,
+                                                       self.tomorrow),
+                })
+
+        self.assertTrue(form.is_valid(), form.errors)
+
+        meeting = form.save(commit=False)
+        self.assertEqual(meeting.time_start, self.tomorrow)
+        self.assertEqual(meeting.time_end, self.tomorrow)
+
+
+class EventFormNoConflicts(EventForm):
+    check_conflicts = True
+
+
+class ConflictCheckTestCase(TestCase):
+
+    def setUp(self):
+        # Time ranges are entered to the minute.
+        self.tomorrow = (timezone.now() + datetime.timedelta(hours=24)).replace(
+                            second=0, microsecond=0)
+
+        self.event = Event.objects.create(
+                        title="Test Event",
+                        time_start=self.tomorrow,
+                        time_end=self.tomorrow + datetime.timedelta(hours=2),
+                    )
+
+    def data(self, start_hours, end_hours):
+        return {
+                'title': 'Another Event',
+                'time_range': time_range_generator(
+                    self.tomorrow + datetime.timedelta(hours=start_hours),
+                    self.tomorrow + datetime.timedelta(hours=end_hours)),
+            }
+
+    def test_conflict(self):
+        """ Test that an overlapping time range is rejected """
+        form = EventFormNoConflicts(self.data(1, 3))
+
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+
+        self.assertEqual(form.errors['time_range'],
+                         ['Overlaps with Test Event.'])
+
+        # The rule is off by default.
+        self.assertTrue(EventForm(self.data(1, 3)).is_valid())
+
+    def test_adjacent(self):
+        """ Test that a time range starting as another ends is accepted """
+        self.assertTrue(EventFormNoConflicts(self.data(2, 3)).is_valid())
+
+    def test_own_instance(self):
+        """ Test that editing an event does not conflict with itself """
+        form = EventFormNoConflicts(self.data(1, 3), instance=self.event)
+
+        self.assertTrue(form.is_valid())
+
+    def test_later_occurrence(self):
+        """ Test that a later occurrence of a recurring event conflicts """
+        Event.objects.create(
+            title="Daily Event",
+            time_start=self.tomorrow + datetime.timedelta(hours=4),
+            time_end=self.tomorrow + datetime.timedelta(hours=5),
+            recurrence=Recurrence(DAILY, count=10),
+        )
+
+        form = EventFormNoConflicts(self.data(52, 53))
+
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+
+        self.assertEqual(form.errors['time_range'],
+                         ['Overlaps with Daily Event.'])
+
+    def test_recurring_form(self):
+        """
+        Test that every occurrence of a recurring event is checked, but not
+        against the event's own
+
+        """
+        later = Event.objects.create(
+                    title="Later Event",
+                    time_start=self.tomorrow + datetime.timedelta(hours=51),
+                    time_end=self.tomorrow + datetime.timedelta(hours=52),
+                )
+
+        data = dict(self.data(3, 4), recurrence='FREQ=DAILY;COUNT=3')
+        form = EventFormNoConflicts(data)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+
+        self.assertEqual(form.errors['time_range'],
+                         ['Overlaps with Later Event.'])
+
+        data['recurrence'] = 'FREQ=DAILY;COUNT=2'
+        self.assertTrue(EventFormNoConflicts(data).is_valid())
+
+        later.delete()
+        event = EventForm(dict(data, recurrence='FREQ=DAILY;COUNT=3')).save()
+        self.assertTrue(EventFormNoConflicts(data, instance=event).is_valid())
+
+    async def test_ais_valid(self):
+        """ Test checking for conflicts from async code """
+        form = EventFormNoConflicts(self.data(1, 3))
+
+        self.assertFalse(await form.ais_valid())
+
+    async def test_ais_valid_unique(self):
+        """
+        Test that a form without conflict checking still validates unique
+        fields, which queries the database, from async code
+
+        """
+        class WatermarkForm(TimeRangedModelForm):
+            class Meta:
+                model = Watermark
+                fields = ['name']
+
+        await Watermark.objects.acreate(name='Taken', modified=timezone.now())
+
+        form = WatermarkForm({'name': 'Taken',
+                              'time_range': self.data(4, 5)['time_range']})
+
+        self.assertFalse(await form.ais_valid())
+        self.assertIn('name', form.errors)
+
+
 class EventFormAllowsPastTestCase(TestCase):
 
     def setUp(self):
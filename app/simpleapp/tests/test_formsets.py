@@ -0,0 +1,358 @@
+# File: simpleapp/tests/test_formsets.py
+from django import forms
+from django.core.cache import cache
+from django.db import connection
+from django.forms import modelformset_factory
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from simpleapp import freebusy
+from simpleapp.forms import EventForm
+from simpleapp.models import Event, Occurrence
+
+from daterangepicker.forms import TimeRangedModelFormSet, time_range_generator
+from daterangepicker.signals import bulk_saved
+
+from unittest import mock
+
+import datetime
+import itertools
+
+
+class EventFormConflicts(EventForm):
+    check_conflicts = True
+
+
+class EventFormNotify(EventForm):
+    notify = forms.BooleanField(required=False)
+
+
+class EventFormKeepPast(EventForm):
+
+    def __init__(self, *args, **kwargs):
+        super(EventFormKeepPast, self).__init__(*args, **kwargs)
+
+        # Existing events may have started already; new ones may not.
+        self.fields['time_range'].allow_past = self.instance.pk is not None
+
+
+EventFormSet = modelformset_factory(
+    Event, form=EventForm, formset=TimeRangedModelFormSet, extra=0, can_delete=True
+)
+EventConflictFormSet = modelformset_factory(
+    Event, form=EventFormConflicts, formset=TimeRangedModelFormSet, extra=0,
+    can_delete=True
+)
+EventNotifyFormSet = modelformset_factory(
+    Event, form=EventFormNotify, formset=TimeRangedModelFormSet, extra=0
+)
+EventKeepPastFormSet = modelformset_factory(
+    Event, form=EventFormKeepPast, formset=TimeRangedModelFormSet, extra=0
+)
+EventExtraFormSet = modelformset_factory(
+    Event, form=EventForm, formset=TimeRangedModelFormSet, extra=2
+)
+
+
+class TimeRangedModelFormSetTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.start = (timezone.now() + datetime.timedelta(days=1)).replace(
+                        second=0, microsecond=0)
+        self.hour = datetime.timedelta(hours=1)
+
+    def create_events(self, count):
+        return [
+            Event.objects.create(
+                title="Event {}".format(n),
+                time_start=self.start + 2 * n * self.hour,
+                time_end=self.start + (2 * n + 1) * self.hour,
+            )
+            for n in range(count)
+        ]
+
+    def data(self, existing, new=0, offset=0, **overrides):
+        """
+        POST data updating the existing events (shifted offset hours later)
+        and adding new ones after them
+
+        """
+        data = {
+            'form-TOTAL_FORMS': str(len(existing) + new),
+            'form-INITIAL_FORMS': str(len(existing)),
+        }
+
+        for i, event in enumerate(existing):
+            data.update({
+                'form-{}-id'.format(i): str(event.pk),
+                'form-{}-title'.format(i): event.title,
+                'form-{}-time_range'.format(i): time_range_generator(
+                    event.time_start + offset * self.hour,
+                    event.time_end + offset * self.hour),
+                'form-{}-recurrence'.format(i): '',
+            })
+
+        for i in range(len(existing), len(existing) + new):
+            start = self.start + (100 + 2 * i) * self.hour
+            data.update({
+                'form-{}-title'.format(i): "New Event {}".format(i),
+                'form-{}-time_range'.format(i): time_range_generator(
+                    start, start + self.hour),
+                'form-{}-recurrence'.format(i): '',
+            })
+
+        data.update(overrides)
+
+        return data
+
+    def save(self, formset_class, data):
+        formset = formset_class(data, queryset=Event.objects.order_by('pk'))
+
+        self.assertTrue(formset.is_valid(), formset.errors)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return formset.save()
+
+    def test_create_and_update(self):
+        """ Test that new and changed forms are both saved """
+        events = self.create_events(2)
+
+        self.save(EventFormSet, self.data(events, new=3, offset=1))
+
+        self.assertEqual(Event.objects.count(), 5)
+
+        for event in events:
+            saved = Event.objects.get(pk=event.pk)
+            self.assertEqual(saved.time_start, event.time_start + self.hour)
+            self.assertEqual(saved.time_end, event.time_end + self.hour)
+
+        # The bulk save materialised the occurrences of every event.
+        self.assertEqual(Occurrence.objects.count(), 5)
+        self.assertEqual(
+            set(Occurrence.objects.values_list('time_start', flat=True)),
+            set(Event.objects.values_list('time_start', flat=True)))
+
+    def test_delete(self):
+        """ Test that forms marked for deletion delete their events """
+        events = self.create_events(3)
+
+        self.save(EventFormSet, self.data(events, **{'form-1-DELETE': 'on'}))
+
+        self.assertFalse(Event.objects.filter(pk=events[1].pk).exists())
+        self.assertEqual(Event.objects.count(), 2)
+
+    def test_untouched_extra_forms(self):
+        """
+        Test that extra forms submitted as rendered are skipped, even though
+        their widgets display a default range
+
+        """
+        events = self.create_events(1)
+        formset = EventExtraFormSet(queryset=Event.objects.all())
+
+        data = self.data(events)
+        data['form-TOTAL_FORMS'] = str(len(formset.forms))
+        for i, form in enumerate(formset.extra_forms, start=len(events)):
+            widget = form.fields['time_range'].widget
+            data.update({
+                'form-{}-title'.format(i): '',
+                'form-{}-time_range'.format(i): widget.format_value(
+                    form['time_range'].value()),
+                'form-{}-recurrence'.format(i): '',
+            })
+
+        self.save(EventExtraFormSet, data)
+
+        self.assertEqual(Event.objects.count(), 1)
+
+    def test_non_model_fields(self):
+        """ Test that forms changing only non-model fields update nothing """
+        events = self.create_events(2)
+        receiver = mock.Mock()
+        bulk_saved.connect(receiver, sender=Event)
+        self.addCleanup(bulk_saved.disconnect, receiver, sender=Event)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.save(EventNotifyFormSet,
+                      self.data(events, **{'form-0-notify': 'on'}))
+
+        self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE')])
+        self.assertFalse(receiver.called)
+
+        # Only the form that changed a model field is updated.
+        self.save(EventNotifyFormSet,
+                  self.data(events, **{'form-0-notify': 'on',
+                                       'form-1-title': 'Renamed'}))
+
+        self.assertEqual(receiver.call_args.kwargs['updated'], [events[1]])
+
+    def test_no_bulk_insert_returning(self):
+        """
+        Test that without primary keys from bulk inserts, each instance is
+        saved on its own, sending post_save
+
+        """
+        events = self.create_events(1)
+        receiver = mock.Mock()
+        bulk_saved.connect(receiver, sender=Event)
+        self.addCleanup(bulk_saved.disconnect, receiver, sender=Event)
+
+        with mock.patch.object(type(connection.features),
+                               'can_return_rows_from_bulk_insert',
+                               new_callable=mock.PropertyMock,
+                               return_value=False):
+            self.save(EventFormSet, self.data(events, new=2, offset=1))
+
+        self.assertFalse(receiver.called)
+        self.assertEqual(Event.objects.count(), 3)
+        self.assertEqual(Occurrence.objects.count(), 3)
+        self.assertEqual(
+            set(Occurrence.objects.values_list('time_start', flat=True)),
+            set(Event.objects.values_list('time_start', flat=True)))
+
+    def test_constant_queries(self):
+        """
+        Test that validating and saving costs the same number of queries
+        however many forms are submitted
+
+        """
+        counts = []
+
+        for size in (2, 10):
+            Event.objects.all().delete()
+            events = self.create_events(size)
+
+            with CaptureQueriesContext(connection) as queries:
+                self.save(EventConflictFormSet,
+                          self.data(events, new=size, offset=1))
+
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_shared_now(self):
+        """ Test that every form is validated against the same now """
+        events = self.create_events(1)
+        formset = EventFormSet(self.data(events, new=1),
+                               queryset=Event.objects.all())
+
+        # Only the first lookup puts the events in the past; the extra form's
+        # has_changed looks up the time too, for the range its widget shows.
+        with mock.patch('django.utils.timezone.now', side_effect=itertools.chain(
+                            [self.start + 1000 * self.hour],
+                            itertools.repeat(self.start - self.hour))):
+            self.assertFalse(formset.is_valid())
+
+        for form in formset.forms:
+            self.assertEqual(form.errors['time_range'],
+                             ['Start date is in the past.'])
+
+    def test_per_form_fields(self):
+        """ Test that every form is cleaned by its own time_range field """
+        events = self.create_events(1)
+        formset = EventKeepPastFormSet(self.data(events, new=1),
+                                       queryset=Event.objects.all())
+
+        with mock.patch('django.utils.timezone.now',
+                        return_value=self.start + 1000 * self.hour):
+            self.assertFalse(formset.is_valid())
+
+        self.assertNotIn('time_range', formset.forms[0].errors)
+        self.assertEqual(formset.forms[1].errors['time_range'],
+                         ['Start date is in the past.'])
+
+    def test_conflicts(self):
+        """
+        Test that time ranges overlapping another form or an existing event
+        are rejected, but not those of events being deleted or edited
+
+        """
+        events = self.create_events(3)
+
+        overlap = time_range_generator(events[2].time_start,
+                                       events[2].time_end)
+        data = self.data(events[:2], new=2, **{
+            'form-2-time_range': overlap,
+            'form-3-time_range': overlap,
+        })
+        formset = EventConflictFormSet(data, queryset=Event.objects.all())
+
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.forms[2].errors['time_range'],
+                         ['Overlaps with Event 2.'])
+        self.assertEqual(formset.forms[3].errors['time_range'],
+                         ['Overlaps with Event 2.'])
+
+        # With Event 2 deleted, the two new forms only overlap each other.
+        data = self.data(events, new=2, **{
+            'form-2-DELETE': 'on',
+            'form-3-time_range': overlap,
+            'form-4-time_range': overlap,
+        })
+        formset = EventConflictFormSet(data, queryset=Event.objects.all())
+
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.forms[3].errors['time_range'],
+                         ['Overlaps with form 5.'])
+        self.assertEqual(formset.forms[4].errors['time_range'],
+                         ['Overlaps with form 4.'])
+
+        # Moving every event an hour later overlaps nothing but their own rows.
+        self.save(EventConflictFormSet, self.data(events, offset=1))
+
+    def test_recurring_conflicts(self):
+        """
+        Test that every occurrence of a recurring form is checked against the
+        other forms and the occurrences of existing events
+
+        """
+        events = self.create_events(2)
+        later = self.start + 152 * self.hour
+
+        # The third occurrence of form 3 overlaps form 4.
+        data = self.data(events, new=2, **{
+            'form-2-recurrence': 'FREQ=DAILY;COUNT=3',
+            'form-3-time_range': time_range_generator(later, later + self.hour),
+        })
+        formset = EventConflictFormSet(data, queryset=Event.objects.all())
+
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.forms[2].errors['time_range'],
+                         ['Overlaps with form 4.'])
+        self.assertEqual(formset.forms[3].errors['time_range'],
+                         ['Overlaps with form 3.'])
+
+        # The second occurrence of Event 0 overlaps a new form.
+        data = self.data(events, new=1, **{
+            'form-0-recurrence': 'FREQ=DAILY;COUNT=5',
+            'form-2-time_range': time_range_generator(
+                self.start + 24 * self.hour, self.start + 25 * self.hour),
+        })
+        formset = EventConflictFormSet(data, queryset=Event.objects.all())
+
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.forms[0].errors['time_range'],
+                         ['Overlaps with form 3.'])
+
+        self.save(EventConflictFormSet, self.data(events, new=2, **{
+            'form-2-recurrence': 'FREQ=DAILY;COUNT=2',
+            'form-3-time_range': time_range_generator(later, later + self.hour),
+        }))
+        self.assertEqual(Occurrence.objects.filter(
+                            event__title='New Event 2').count(), 2)
+
+    def test_invalidates_freebusy(self):
+        """ Test that a bulk save invalidates the free/busy windows it touches """
+        events = self.create_events(1)
+        start = self.start - self.hour
+        end = self.start + 10 * self.hour
+
+        self.assertEqual(len(freebusy.busy(start, end)), 1)
+
+        self.save(EventFormSet, self.data(events, new=0, offset=3))
+
+        self.assertEqual(freebusy.busy(start, end),
+                         [(self.start + 3 * self.hour, self.start + 4 * self.hour)])
@@ -0,0 +1,140 @@
+# File: simpleapp/tests/test_freebusy.py
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from simpleapp import freebusy
+from simpleapp.importers import EventImporter
+from simpleapp.models import Event
+
+from daterangepicker.forms import time_range_generator
+from daterangepicker.recurrence import DAILY, Recurrence
+
+from unittest import mock
+
+import datetime
+import io
+
+
+class FreeBusyCacheTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.now = timezone.now().replace(second=0, microsecond=0)
+
+        self.event = Event.objects.create(
+                        title="Test Event",
+                        time_start=self.days(1),
+                        time_end=self.days(1, hours=2),
+                    )
+
+    def days(self, n, hours=0):
+        return self.now + datetime.timedelta(days=n, hours=hours)
+
+    def test_cached(self):
+        """ Test that a window is only computed once """
+        busy = freebusy.busy(self.days(0), self.days(2))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(freebusy.busy(self.days(0), self.days(2)), busy)
+
+    def test_invalidated_by_overlapping_change(self):
+        """
+        Test that changing an event invalidates the windows it overlapped
+        before and after the change, but not others
+
+        """
+        freebusy.busy(self.days(0), self.days(2))
+        freebusy.busy(self.days(5), self.days(6))
+        freebusy.busy(self.days(10), self.days(11))
+
+        self.event = Event.objects.get(pk=self.event.pk)
+        self.event.time_start = self.days(5)
+        self.event.time_end = self.days(5, hours=1)
+        self.event.save()
+
+        self.assertEqual(freebusy.busy(self.days(0), self.days(2)), [])
+        self.assertEqual(freebusy.busy(self.days(5), self.days(6)),
+                         [(self.days(5), self.days(5, hours=1))])
+
+        with self.assertNumQueries(0):
+            freebusy.busy(self.days(10), self.days(11))
+
+    def test_invalidated_by_delete(self):
+        """ Test that deleting an event invalidates the windows it overlapped """
+        freebusy.busy(self.days(0), self.days(2))
+
+        self.event.delete()
+
+        self.assertEqual(freebusy.busy(self.days(0), self.days(2)), [])
+
+    def test_invalidated_by_import(self):
+        """ Test that bulk imports invalidate the windows they overlap """
+        self.assertEqual(len(freebusy.busy(self.days(2), self.days(3))), 0)
+
+        EventImporter().run([
+            (1, {'title': 'Test Event2',
+                 'time_range': time_range_generator(self.days(2, hours=1),
+                                                    self.days(2, hours=2))}),
+        ])
+
+        self.assertEqual(len(freebusy.busy(self.days(2), self.days(3))), 1)
+
+    def test_not_invalidated_by_title_change(self):
+        """ Test that a change leaving the occurrences alone invalidates nothing """
+        freebusy.busy(self.days(0), self.days(2))
+
+        self.event = Event.objects.get(pk=self.event.pk)
+        self.event.title = "Renamed Event"
+        self.event.save()
+
+        with self.assertNumQueries(0):
+            freebusy.busy(self.days(0), self.days(2))
+
+    def test_invalidated_by_partial_instance(self):
+        """ Test that saving an event that wasn't loaded whole looks up its series """
+        freebusy.busy(self.days(0), self.days(2))
+
+        event = Event.objects.only('title').get(pk=self.event.pk)
+        event.time_start = self.days(5)
+        event.time_end = self.days(5, hours=1)
+        event.save()
+
+        self.assertEqual(freebusy.busy(self.days(0), self.days(2)), [])
+
+    def test_extension_invalidates_new_days(self):
+        """
+        Test that extending a series only invalidates the days of the
+        occurrences added
+
+        """
+        Event.objects.create(title="Daily Event",
+                             time_start=self.days(1, hours=3),
+                             time_end=self.days(1, hours=4),
+                             recurrence=Recurrence(DAILY))
+
+        horizon = settings.SIMPLEAPP_OCCURRENCE_HORIZON_DAYS
+        freebusy.busy(self.days(0), self.days(2))
+        self.assertEqual(
+            freebusy.busy(self.days(horizon + 5), self.days(horizon + 6)), [])
+
+        call_command('refresh_occurrences', days=horizon + 10, stdout=io.StringIO())
+
+        with self.assertNumQueries(0):
+            freebusy.busy(self.days(0), self.days(2))
+
+        self.assertEqual(
+            len(freebusy.busy(self.days(horizon + 5), self.days(horizon + 6))), 1)
+
+    def test_token_timeout(self):
+        """ Test that day tokens expire along with the windows cached under them """
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            freebusy.busy(self.days(0), self.days(2))
+            freebusy.invalidate([(self.days(0), self.days(1))])
+
+        self.assertEqual(len(set_many.call_args_list), 2)
+        for call in set_many.call_args_list:
+            self.assertEqual(call.args[1], settings.SIMPLEAPP_FREEBUSY_CACHE_TIMEOUT)
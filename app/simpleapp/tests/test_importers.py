@@ -0,0 +1,267 @@
+# File: simpleapp/tests/test_importers.py
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from simpleapp.importers import EventImporter, read_csv, read_jsonl
+from simpleapp.models import Event, Occurrence
+
+from daterangepicker.forms import time_range_generator
+from daterangepicker.recurrence import DAILY, WEEKLY, Recurrence
+
+from unittest import mock
+
+import datetime
+import io
+import json
+import os
+import tempfile
+
+
+class EventImporterTestCase(TestCase):
+
+    def setUp(self):
+        self.tomorrow = timezone.now() + datetime.timedelta(hours=24)
+        self.yesterday = self.tomorrow - datetime.timedelta(hours=48)
+
+        self.good_range = time_range_generator(self.tomorrow, self.tomorrow)
+        self.past_range = time_range_generator(self.yesterday, self.yesterday)
+
+        self.errors = []
+        self.importer = EventImporter(
+                            batch_size=2, 
+                            on_error=lambda *error: self.errors.append(error),
+                        )
+
+    def test_read_csv(self):
+        """ Test reading rows and line numbers from CSV """
+        lines = io.StringIO(
+                    "title,time_range\n"
+                    "Test Event1,{0}\n"
+                    "Test Event2,{0}\n".format(self.good_range)
+                )
+        
+        rows = list(read_csv(lines))
+
+        self.assertEqual([line_num for line_num, row in rows], [2, 3])
+        self.assertEqual(rows[0][1]['title'], 'Test Event1')
+
+    def test_read_jsonl(self):
+        """ Test reading rows and line numbers from JSON Lines """
+        lines = io.StringIO(
+                    json.dumps({'title': 'Test Event1'}) + "\n"
+                    "\n"
+                    "yo momma\n"
+                    "[]\n"
+                )
+        
+        rows = list(read_jsonl(lines))
+
+        self.assertEqual([line_num for line_num, row in rows], [1, 3, 4])
+        self.assertEqual(rows[0][1], {'title': 'Test Event1'})
+        self.assertIsInstance(rows[1][1], str)
+        self.assertIsInstance(rows[2][1], str)
+
+    def test_run(self):
+        """ 
+        Test that valid rows are saved in batches and invalid rows are
+        reported without stopping the import
+        
+        """
+        rows = [
+            (1, {'title': 'Test Event1', 'time_range': self.good_range}),
+            (2, {'title': 'Test Event2', 'time_range': 'yo momma'}),
+            (3, {'title': '', 'time_range': self.good_range}),
+            (4, {'title': 'Test Event4', 'time_range': self.past_range}),
+            (5, {'title': 'Test Event5'}),
+            (6, 'Invalid JSON'),
+            (7, {'title': 'Test Event7', 'time_range': self.good_range}),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self.importer.run(rows)
+
+        # A single INSERT for each batch that has any valid rows in it.
+        inserts = [q for q in queries 
+                   if q['sql'].startswith('INSERT INTO "simpleapp_event"')]
+        self.assertEqual(len(inserts), 2)
+
+        self.assertEqual(result, (2, 5))
+        self.assertEqual(
+            list(Event.objects.order_by('pk').values_list('title', flat=True)),
+            ['Test Event1', 'Test Event7']
+        )
+        self.assertEqual([line_num for line_num, messages in self.errors], 
+                         [2, 3, 4, 5, 6])
+
+    def test_time_range_not_a_string(self):
+        """
+        Test that a JSON time_range that isn't a string rejects its own line
+        only
+
+        """
+        rows = [
+            (1, {'title': 'Test Event1', 'time_range': 123}),
+            (2, {'title': 'Test Event2', 'time_range': [self.good_range]}),
+            (3, {'title': 'Test Event3', 'time_range': self.good_range}),
+        ]
+
+        result = self.importer.run(rows)
+
+        self.assertEqual(result, (1, 2))
+        self.assertEqual(self.errors, [
+            (1, ['Expected a string of two dates.']),
+            (2, ['Expected a string of two dates.']),
+        ])
+
+    def test_allow_past(self):
+        """ Test importing events in the past when allowed """
+        importer = EventImporter(allow_past=True)
+        
+        result = importer.run(
+                    [(1, {'title': 'Test Event', 'time_range': self.past_range})]
+                )
+
+        self.assertEqual(result, (1, 0))
+
+    def test_check_conflicts(self):
+        """
+        Test that rows overlapping an existing event or an earlier row are
+        rejected, with one conflict query per batch
+        
+        """
+        Event.objects.create(title="Existing Event",
+                             time_start=self.tomorrow,
+                             time_end=self.tomorrow + datetime.timedelta(hours=2))
+
+        later = self.tomorrow + datetime.timedelta(hours=4)
+        later_range = time_range_generator(later, later + datetime.timedelta(hours=1))
+        overlap_range = time_range_generator(
+                            self.tomorrow + datetime.timedelta(hours=1),
+                            self.tomorrow + datetime.timedelta(hours=3))
+
+        rows = [
+            (1, {'title': 'Test Event1', 'time_range': later_range}),
+            (2, {'title': 'Test Event2', 'time_range': overlap_range}),
+            (3, {'title': 'Test Event3', 'time_range': later_range}),
+        ]
+
+        importer = EventImporter(
+                        batch_size=10,
+                        check_conflicts=True,
+                        on_error=lambda *error: self.errors.append(error),
+                    )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = importer.run(rows)
+
+        selects = [q for q in queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+
+        self.assertEqual(result, (1, 2))
+        self.assertEqual(self.errors, [
+            (2, ['Overlaps with Existing Event.']),
+            (3, ['Overlaps with line 1.']),
+        ])
+
+    def test_recurrence(self):
+        """ Test importing recurrence rules, and rejecting invalid ones """
+        rows = [
+            (1, {'title': 'Test Event1', 'time_range': self.good_range,
+                 'recurrence': 'FREQ=WEEKLY;COUNT=4'}),
+            (2, {'title': 'Test Event2', 'time_range': self.good_range,
+                 'recurrence': 'FREQ=YEARLY'}),
+            (3, {'title': 'Test Event3', 'time_range': self.good_range,
+                 'recurrence': 4}),
+        ]
+
+        result = self.importer.run(rows)
+
+        self.assertEqual(result, (1, 2))
+        self.assertEqual(Event.objects.get().recurrence,
+                         Recurrence(WEEKLY, count=4))
+        self.assertEqual([line_num for line_num, messages in self.errors],
+                         [2, 3])
+        self.assertEqual(self.errors[1][1], ['Expected a recurrence rule string.'])
+
+    def test_no_bulk_insert_returning(self):
+        """
+        Test that without primary keys from bulk inserts, each event is saved
+        on its own and still gets its occurrences
+
+        """
+        rows = [
+            (n, {'title': 'Test Event{}'.format(n), 'time_range': self.good_range,
+                 'recurrence': 'FREQ=WEEKLY;COUNT=4'})
+            for n in range(1, 4)
+        ]
+
+        with mock.patch.object(type(connection.features),
+                               'can_return_rows_from_bulk_insert',
+                               new_callable=mock.PropertyMock,
+                               return_value=False):
+            result = self.importer.run(rows)
+
+        self.assertEqual(result, (3, 0))
+        for event in Event.objects.all():
+            self.assertEqual(Occurrence.objects.filter(event=event).count(), 4)
+
+    def test_check_conflicts_occurrences(self):
+        """
+        Test that rows are checked against every occurrence of existing
+        events and of earlier rows
+
+        """
+        hour = datetime.timedelta(hours=1)
+
+        Event.objects.create(title="Daily Event",
+                             time_start=self.tomorrow,
+                             time_end=self.tomorrow + hour,
+                             recurrence=Recurrence(DAILY, count=5))
+
+        def row(hours, recurrence=''):
+            start = self.tomorrow + hours * hour
+            return {'title': 'Test Event',
+                    'time_range': time_range_generator(start, start + hour),
+                    'recurrence': recurrence}
+
+        rows = [
+            (1, row(72)),
+            (2, row(2, 'FREQ=DAILY;COUNT=3')),
+            (3, row(50)),
+            (4, row(3, 'FREQ=WEEKLY')),
+        ]
+
+        importer = EventImporter(
+                        check_conflicts=True,
+                        on_error=lambda *error: self.errors.append(error),
+                    )
+
+        self.assertEqual(importer.run(rows), (2, 2))
+        self.assertEqual(self.errors, [
+            (1, ['Overlaps with Daily Event.']),
+            (3, ['Overlaps with line 2.']),
+        ])
+
+    def test_command(self):
+        """ Test the import_events management command """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'events.csv')
+            
+            with open(path, 'w') as f:
+                f.write("title,time_range\n"
+                        "Test Event1,{}\n"
+                        "Test Event2,yo momma\n".format(self.good_range))
+
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+
+            call_command('import_events', path, batch_size=10, 
+                         stdout=stdout, stderr=stderr)
+
+        self.assertTrue(Event.objects.filter(title='Test Event1').exists())
+        self.assertIn('Imported 1 events, skipped 1 invalid rows.', 
+                      stdout.getvalue())
+        self.assertIn('line 3:', stderr.getvalue())
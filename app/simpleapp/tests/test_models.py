@@ -0,0 +1,249 @@
+# File: simpleapp/tests/test_models.py
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from simpleapp.models import Event, Occurrence
+from simpleapp.forms import EventForm
+
+from daterangepicker.forms import time_range_generator
+from daterangepicker.recurrence import DAILY, Recurrence
+
+from unittest import mock
+
+import datetime
+import unittest
+
+
+class EventQuerySetTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        
+        self.hour = datetime.timedelta(hours=1)
+
+        self.past = Event.objects.create(
+                        title="Past Event",
+                        time_start=self.now - 3 * self.hour,
+                        time_end=self.now - 2 * self.hour,
+                    )
+        self.current = Event.objects.create(
+                        title="Current Event",
+                        time_start=self.now - self.hour,
+                        time_end=self.now + self.hour,
+                    )
+        self.upcoming = Event.objects.create(
+                        title="Upcoming Event",
+                        time_start=self.now + 2 * self.hour,
+                        time_end=self.now + 3 * self.hour,
+                    )
+
+    def test_overlapping(self):
+        """ Test finding events that overlap a range """
+        events = Event.objects.overlapping(self.now, self.now + 2 * self.hour)
+        
+        self.assertEqual(list(events), [self.current])
+
+    def test_overlapping_touching(self):
+        """ Test that ranges which only touch do not overlap """
+        events = Event.objects.overlapping(self.now - 2 * self.hour, 
+                                           self.now - self.hour)
+        
+        self.assertFalse(events.exists())
+
+    def test_overlapping_max_duration(self):
+        """ Test that bounding the event duration gives the same events """
+        events = Event.objects.overlapping(self.now, self.now + 2 * self.hour,
+                                           max_duration=2 * self.hour)
+        
+        self.assertEqual(list(events), [self.current])
+
+    def test_containing(self):
+        """ Test finding events that are happening at a moment """
+        self.assertEqual(list(Event.objects.containing(self.now)), 
+                         [self.current])
+
+    def test_containing_bounds(self):
+        """
+        Test that events contain the moment they start at but not the one
+        they end at
+
+        """
+        self.assertEqual(
+            list(Event.objects.containing(self.now - 2 * self.hour)), [])
+        self.assertEqual(
+            list(Event.objects.containing(self.now - 3 * self.hour)),
+            [self.past])
+        self.assertEqual(
+            list(Event.objects.containing(self.now + self.hour,
+                                          max_duration=2 * self.hour)), [])
+
+    def test_upcoming(self):
+        """ Test finding events that have not started yet """
+        self.assertEqual(list(Event.objects.upcoming(now=self.now)), 
+                         [self.upcoming])
+
+    def test_past(self):
+        """ Test finding events that have already ended """
+        self.assertEqual(list(Event.objects.past(now=self.now)), [self.past])
+
+
+class RecurringEventTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now().replace(second=0, microsecond=0)
+        self.day = datetime.timedelta(days=1)
+
+        self.daily = Event.objects.create(
+                        title="Daily Event",
+                        time_range=(self.now, self.now + datetime.timedelta(hours=1)),
+                        recurrence=Recurrence(DAILY, count=1000),
+                    )
+        self.once = Event.objects.create(
+                        title="One-off Event",
+                        time_start=self.now + 10 * self.day + self.day / 2,
+                        time_end=self.now + 11 * self.day,
+                    )
+
+    def test_recurrence_round_trip(self):
+        """ Test that rules are stored as strings and load as Recurrence """
+        event = Event.objects.get(pk=self.daily.pk)
+
+        self.assertEqual(event.recurrence, Recurrence(DAILY, count=1000))
+        self.assertIsNone(Event.objects.get(pk=self.once.pk).recurrence)
+        self.assertTrue(
+            Event.objects.filter(recurrence="FREQ=DAILY;COUNT=1000").exists())
+
+    def test_occurrences(self):
+        """
+        Test that a window lists the occurrences of recurring and one-off
+        events in order of their start
+
+        """
+        start = self.now + 10 * self.day
+        end = start + 2 * self.day
+
+        # A past series, already over, that the window doesn't expand.
+        Event.objects.create(
+            title="Past Event",
+            time_range=(self.now - 30 * self.day, self.now - 29 * self.day),
+            recurrence=Recurrence(DAILY, count=3),
+        )
+
+        with mock.patch.object(Event, 'occurrences') as expand, \
+                self.assertNumQueries(2):
+            occurrences = [(event.title, time_range.start) for event, time_range
+                           in Event.objects.occurrences(start, end)]
+
+        # Both events are materialised well beyond the window.
+        self.assertFalse(expand.called)
+        self.assertEqual(occurrences, [
+            ("Daily Event", start),
+            ("One-off Event", start + self.day / 2),
+            ("Daily Event", start + self.day),
+        ])
+
+    def test_occurrences_beyond_horizon(self):
+        """
+        Test that a window beyond the materialised occurrences expands the
+        series that go on
+
+        """
+        start = self.now + 500 * self.day
+        end = start + 2 * self.day
+
+        occurrences = list(Event.objects.occurrences(start, end))
+
+        self.assertEqual(occurrences, [
+            (self.daily, time_range)
+            for time_range in self.daily.occurrences(start, end)
+        ])
+        self.assertEqual(len(occurrences), 2)
+
+    def test_occurrences_unmaterialised(self):
+        """ Test that events without Occurrence rows are expanded """
+        Occurrence.objects.all().delete()
+        Event.objects.update(occurrences_until=None)
+
+        start = self.now + 10 * self.day
+        end = start + 2 * self.day
+
+        self.assertEqual(
+            [(event.title, time_range.start) for event, time_range
+             in Event.objects.occurrences(start, end)],
+            [("Daily Event", start),
+             ("One-off Event", start + self.day / 2),
+             ("Daily Event", start + self.day)])
+
+    def test_form_validates_rule(self):
+        """ Test that the event form rejects invalid recurrence rules """
+        data = {
+                'title': 'Test Event',
+                'time_range': time_range_generator(self.now + self.day,
+                                                   self.now + self.day),
+                'recurrence': 'FREQ=YEARLY',
+            }
+
+        form = EventForm(data)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn('recurrence', form.errors)
+
+        data['recurrence'] = 'FREQ=WEEKLY;COUNT=4'
+        form = EventForm(data)
+
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().recurrence, Recurrence.parse(data['recurrence']))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Query plans are SQLite's")
+class EventQueryPlanTestCase(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        
+        self.assertRegex(plan, r"USING (COVERING )?INDEX event_", plan)
+
+    def test_overlapping_uses_index(self):
+        """ Test that overlapping() is answered from an index """
+        self.assertUsesIndex(Event.objects.overlapping(
+                                self.now, self.now + datetime.timedelta(hours=1)
+                            ))
+
+    def test_overlapping_max_duration_uses_start_index(self):
+        """ 
+        Test that overlapping() with max_duration range-scans the time_start
+        index from both sides
+        
+        """
+        plan = Event.objects.overlapping(
+                    self.now, self.now + datetime.timedelta(hours=1), 
+                    max_duration=datetime.timedelta(days=1),
+                ).explain()
+
+        self.assertRegex(plan, r"INDEX event_start_\w+_idx "
+                               r"\(time_start>\? AND time_start<\?\)", plan)
+
+    def test_keyset_page_uses_index(self):
+        """ Test that keyset pagination seeks and orders using an index """
+        plan = Event.objects.filter(
+                    time_start__gte=self.now, 
+                ).order_by('time_start', 'pk')[:25].explain()
+
+        self.assertIn("USING INDEX event_start_id_idx (time_start>?)", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_containing_uses_index(self):
+        """ Test that containing() is answered from an index """
+        self.assertUsesIndex(Event.objects.containing(self.now))
+
+    def test_upcoming_uses_index(self):
+        """ Test that upcoming() is answered from an index """
+        self.assertUsesIndex(Event.objects.upcoming(now=self.now))
+
+    def test_past_uses_index(self):
+        """ Test that past() is answered from an index """
+        self.assertUsesIndex(Event.objects.past(now=self.now))
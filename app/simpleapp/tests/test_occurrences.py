@@ -0,0 +1,175 @@
+# File: simpleapp/tests/test_occurrences.py
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from simpleapp import freebusy, occurrences
+from simpleapp.importers import EventImporter
+from simpleapp.models import Event, Occurrence
+
+from daterangepicker.forms import time_range_generator
+
+import datetime
+import io
+
+
+@override_settings(SIMPLEAPP_OCCURRENCE_HORIZON_DAYS=30)
+class OccurrenceTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.now = timezone.now().replace(second=0, microsecond=0)
+        self.day = datetime.timedelta(days=1)
+        self.hour = datetime.timedelta(hours=1)
+
+        self.once = Event.objects.create(
+                        title="One-off Event",
+                        time_start=self.now + 100 * self.day,
+                        time_end=self.now + 100 * self.day + self.hour,
+                    )
+        self.weekly = Event.objects.create(
+                        title="Weekly Event",
+                        time_start=self.now + self.day,
+                        time_end=self.now + self.day + self.hour,
+                        recurrence="FREQ=WEEKLY",
+                    )
+
+    def rows(self, event):
+        return list(Occurrence.objects.filter(event=event)
+                    .order_by('time_start')
+                    .values_list('time_start', flat=True))
+
+    def test_materialised_on_save(self):
+        """
+        Test that saving an event materialises its occurrences up to the
+        horizon, and a one-off event its single occurrence whatever its date
+
+        """
+        self.assertEqual(self.rows(self.once), [self.once.time_start])
+        self.assertEqual(len(self.rows(self.weekly)), 5)
+
+        self.weekly.refresh_from_db()
+        self.assertGreater(self.weekly.occurrences_until, self.now + 29 * self.day)
+
+    def test_only_touched_series_refreshed(self):
+        """
+        Test that saving an event regenerates its own occurrences and leaves
+        the other series alone
+
+        """
+        once_pks = list(Occurrence.objects.filter(event=self.once)
+                        .values_list('pk', flat=True))
+
+        self.weekly.recurrence = "FREQ=DAILY;COUNT=3"
+        self.weekly.save()
+
+        self.assertEqual(self.rows(self.weekly), [
+            time_range.start for time_range in self.weekly.occurrences()
+        ])
+        self.assertEqual(len(self.rows(self.weekly)), 3)
+        self.assertEqual(list(Occurrence.objects.filter(event=self.once)
+                              .values_list('pk', flat=True)), once_pks)
+
+        # Saving unrelated fields leaves the occurrences as they are.
+        with CaptureQueriesContext(connection) as queries:
+            self.weekly.title = "Renamed Event"
+            self.weekly.save(update_fields=['title'])
+
+        self.assertFalse([q for q in queries if 'simpleapp_occurrence' in q['sql']])
+
+    def test_delete_cascades(self):
+        """ Test that deleting an event deletes its occurrences """
+        self.weekly.delete()
+
+        self.assertFalse(Occurrence.objects.filter(event_id=self.weekly.pk).exists())
+        self.assertEqual(Occurrence.objects.count(), 1)
+
+    def test_refresh_batch_query_count(self):
+        """
+        Test that a batch of events is refreshed with a constant number of
+        queries
+
+        """
+        events = [self.once, self.weekly] + [
+            Event(title="Test Event{}".format(n),
+                  time_start=self.now + self.day,
+                  time_end=self.now + self.day + self.hour,
+                  recurrence="FREQ=DAILY")
+            for n in range(5)
+        ]
+        Event.objects.bulk_create(events[2:])
+
+        with CaptureQueriesContext(connection) as queries:
+            occurrences.refresh(events)
+
+        statements = [q for q in queries if not q['sql'].startswith(
+                      ('SAVEPOINT', 'RELEASE SAVEPOINT'))]
+        self.assertEqual(len(statements), 3)
+
+        self.assertEqual(Occurrence.objects.count(), 1 + 5 + 5 * 29)
+
+    def test_overlapping(self):
+        """ Test that a window finds the occurrences of every series """
+        start = self.now + 7 * self.day
+        end = start + 2 * self.day
+
+        self.assertEqual(
+            list(Occurrence.objects.overlapping(start, end)
+                 .values_list('event__title', 'time_start')),
+            [("Weekly Event", time_range.start)
+             for time_range in self.weekly.occurrences(start, end)])
+
+    def test_extend(self):
+        """
+        Test that extending the horizon adds the missing occurrences without
+        duplicating the existing ones
+
+        """
+        until = self.now + 60 * self.day
+
+        self.weekly.refresh_from_db()
+        occurrences.extend([self.once, self.weekly], until)
+
+        self.assertEqual(self.rows(self.weekly), [
+            time_range.start for time_range in self.weekly.occurrences(end=until)
+        ])
+        self.assertEqual(len(self.rows(self.weekly)), 9)
+        self.assertEqual(len(self.rows(self.once)), 1)
+
+    def test_command(self):
+        """ Test the refresh_occurrences management command """
+        start = self.now + 50 * self.day
+        end = start + self.day
+
+        freebusy.busy(start, end)
+
+        stdout = io.StringIO()
+        call_command('refresh_occurrences', days=60, batch_size=1, stdout=stdout)
+
+        self.assertIn('Materialised the occurrences of 1 events', stdout.getvalue())
+        self.assertEqual(len(self.rows(self.weekly)), 9)
+
+        # The free/busy windows the new occurrences fall in were invalidated.
+        self.assertEqual(freebusy.busy(start, end),
+                         list(self.weekly.occurrences(start, end)))
+
+        Occurrence.objects.all().delete()
+        call_command('refresh_occurrences', rebuild=True, stdout=stdout)
+
+        self.assertEqual(len(self.rows(self.once)), 1)
+        self.assertEqual(len(self.rows(self.weekly)), 5)
+
+    def test_import(self):
+        """ Test that imported events get their occurrences """
+        time_range = time_range_generator(self.now + 2 * self.day,
+                                          self.now + 2 * self.day + self.hour)
+
+        EventImporter().run([(1, {'title': 'Imported Event',
+                                  'time_range': time_range})])
+
+        event = Event.objects.get(title='Imported Event')
+        self.assertEqual(self.rows(event), [event.time_start])
@@ -1,17 +1,28 @@
 # File: simpleapp/tests/test_views.py
-from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.test import TestCase, AsyncClient, Client, override_settings
 from django.urls import reverse
 
 from django.utils import timezone
+from django.utils.http import http_date
 
 from simpleapp.models import Event
 
 from daterangepicker.forms import time_range_generator
 
+from unittest import mock
+
 import datetime
+import time
 
 HOME_URL = reverse('simpleapp:home')
 CREATE_EVENT_URL = reverse('simpleapp:create_event')
+HOME_ASYNC_URL = reverse('simpleapp:home_async')
+CREATE_EVENT_ASYNC_URL = reverse('simpleapp:create_event_async')
+FREE_BUSY_URL = reverse('simpleapp:free_busy')
+EXPORT_CSV_URL = reverse('simpleapp:export_events_csv')
+EXPORT_ICS_URL = reverse('simpleapp:export_events_ics')
+PICKER_BENCHMARK_URL = reverse('simpleapp:picker_benchmark')
 
 
 class HomeTestCase(TestCase):
@@ -59,6 +70,38 @@ class HomeTestCase(TestCase):
                     '<strong>{}</strong>'.format(event.title))
             self.assertContains(response, self.time_ranges[i])
 
+    def test_export_csv(self):
+        """
+        Test that all events are exported as a streamed CSV file
+
+        """
+        client = Client()
+
+        response = client.get(EXPORT_CSV_URL)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        content = b"".join(response.streaming_content).decode()
+        
+        for event in self.events:
+            self.assertIn(event.title, content)
+
+    def test_export_ics(self):
+        """
+        Test that all events are exported as a streamed iCalendar file
+
+        """
+        client = Client()
+
+        response = client.get(EXPORT_ICS_URL)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 
+                         'text/calendar; charset=utf-8')
+
+        content = b"".join(response.streaming_content).decode()
+        
+        self.assertEqual(content.count('BEGIN:VEVENT'), len(self.events))
+
     def test_view_create_event(self):
         """
         View create event page, but don't post anything
@@ -112,5 +155,346 @@ class HomeTestCase(TestCase):
         self.assertFalse(Event.objects.filter(title='Test Event').exists())
 
 
+@override_settings(SIMPLEAPP_EVENTS_PER_PAGE=2)
+class HomePaginationTestCase(TestCase):
+
+    def setUp(self):
+        tomorrow = timezone.now() + datetime.timedelta(hours=24)
+
+        # Two events share a start time, so that ties are broken by id.
+        self.events = [
+                Event.objects.create(
+                        title="Test Event{}".format(i),
+                        time_start=tomorrow + datetime.timedelta(hours=i // 2),
+                        time_end=tomorrow + datetime.timedelta(hours=i),
+                    )
+                for i in range(5)
+            ]
+
+        self.client = Client()
+
+    def test_pages(self):
+        """
+        Test walking forwards and backwards through the pages of events
+
+        """
+        response = self.client.get(HOME_URL)
+        page = response.context['page']
+
+        self.assertEqual(list(page), self.events[:2])
+        self.assertFalse(page.has_previous)
+        self.assertTrue(page.has_next)
+
+        response = self.client.get(HOME_URL, {'cursor': page.next_cursor})
+        page = response.context['page']
+
+        self.assertEqual(list(page), self.events[2:4])
+        self.assertTrue(page.has_previous)
+
+        response = self.client.get(HOME_URL, {'cursor': page.next_cursor})
+        last_page = response.context['page']
+
+        self.assertEqual(list(last_page), self.events[4:])
+        self.assertFalse(last_page.has_next)
+
+        response = self.client.get(HOME_URL, 
+                                   {'cursor': last_page.previous_cursor})
+        page = response.context['page']
+
+        self.assertEqual(list(page), self.events[2:4])
+        self.assertTrue(page.has_next)
+
+        response = self.client.get(HOME_URL, {'cursor': page.previous_cursor})
+        page = response.context['page']
+
+        self.assertEqual(list(page), self.events[:2])
+        self.assertFalse(page.has_previous)
+
+    def test_page_query_count(self):
+        """ 
+        Test that deep pages are fetched with a single query, besides the one
+        for the events watermark
+        
+        """
+        page = self.client.get(HOME_URL).context['page']
+        cursor = page.next_cursor
+
+        with self.assertNumQueries(2):
+            self.client.get(HOME_URL, {'cursor': cursor})
+
+    def test_invalid_cursor(self):
+        """ Test that a malformed cursor gives a 404 """
+        response = self.client.get(HOME_URL, {'cursor': 'yo momma'})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTestCase(TestCase):
+
+    def setUp(self):
+        self.tomorrow = timezone.now() + datetime.timedelta(hours=24)
+
+        self.event = Event.objects.create(
+                        title="Test Event",
+                        time_start=self.tomorrow,
+                        time_end=self.tomorrow,
+                    )
+
+        self.client = Client()
+
+    def test_not_modified(self):
+        """
+        Test that revalidating an unchanged listing gives a 304 without
+        querying the events
+
+        """
+        for url in (HOME_URL, EXPORT_CSV_URL, EXPORT_ICS_URL):
+            response = self.client.get(url)
+
+            self.assertTrue(response.has_header('ETag'))
+            self.assertFalse(response.has_header('Last-Modified'))
+
+            with self.assertNumQueries(1):
+                response = self.client.get(
+                                url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+            self.assertEqual(response.status_code, 304)
+
+    def test_event_list_cached(self):
+        """
+        Test that the rendered event list is reused until an event changes
+
+        """
+        self.client.get(HOME_URL)
+
+        with self.assertNumQueries(1):
+            self.client.get(HOME_URL)
+
+        self.event.title = "Renamed Event"
+        self.event.save()
+
+        self.assertContains(self.client.get(HOME_URL), "Renamed Event")
+
+    def test_stale_fragment_etag(self):
+        """
+        Test that a page showing an outdated cached list carries the ETag of
+        the version it shows, not the current one
+
+        """
+        stale_etag = self.client.get(HOME_URL)['ETag']
+
+        self.event.title = "Renamed Event"
+        self.event.save()
+
+        # Another request is busy re-rendering the list.
+        with mock.patch('simpleapp.caching.cache.add', return_value=False):
+            response = self.client.get(HOME_URL)
+
+        self.assertNotContains(response, "Renamed Event")
+        self.assertEqual(response['ETag'], stale_etag)
+
+        response = self.client.get(HOME_URL, HTTP_IF_NONE_MATCH=stale_etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Renamed Event")
+
+    def test_if_modified_since_ignored(self):
+        """
+        Test that If-Modified-Since alone never gives a 304, as its one
+        second granularity can't tell changes within a second apart
+
+        """
+        response = self.client.get(
+                        HOME_URL, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_same_timestamp(self):
+        """ Test that two changes at the same moment get different ETags """
+        now = timezone.now()
+        etags = []
+
+        for n in range(2):
+            with mock.patch('django.utils.timezone.now', return_value=now):
+                self.event.title = "Renamed Event{}".format(n)
+                self.event.save()
+
+            etags.append(self.client.get(HOME_URL)['ETag'])
+
+        self.assertNotEqual(etags[0], etags[1])
+
+    def test_modified(self):
+        """
+        Test that changing, adding or deleting an event changes the ETag
+
+        """
+        etags = [self.client.get(HOME_URL)['ETag']]
+
+        self.event.title = "Renamed Event"
+        self.event.save()
+        etags.append(self.client.get(HOME_URL)['ETag'])
+
+        Event.objects.create(title="Another Event",
+                             time_start=self.tomorrow,
+                             time_end=self.tomorrow)
+        etags.append(self.client.get(HOME_URL)['ETag'])
+
+        self.event.delete()
+        response = self.client.get(HOME_URL, HTTP_IF_NONE_MATCH=etags[-1])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(set(etags + [response['ETag']])), 4)
+
+
+class AsyncViewsTestCase(TestCase):
+
+    def setUp(self):
+        self.tomorrow = timezone.now() + datetime.timedelta(hours=24)
+
+        self.event = Event.objects.create(
+                        title="Test Event1",
+                        time_start=self.tomorrow,
+                        time_end=self.tomorrow,
+                    )
+
+    async def test_home(self):
+        """
+        Test that the async listing shows the events, and answers conditional
+        GETs like the sync one
+
+        """
+        client = AsyncClient()
+
+        response = await client.get(HOME_ASYNC_URL)
+        self.assertContains(response, '<strong>Test Event1</strong>')
+
+        sync_response = await client.get(HOME_URL)
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+
+        response = await client.get(HOME_ASYNC_URL,
+                                    headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_invalid_cursor(self):
+        """ Test that an undecodable cursor gives a 404 """
+        response = await AsyncClient().get(HOME_ASYNC_URL, {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_post_create_event(self):
+        """ Create an event using the async view """
+        data = {
+                'title': 'Test Event',
+                'time_range': time_range_generator(self.tomorrow,
+                                                   self.tomorrow),
+            }
+
+        response = await AsyncClient().post(CREATE_EVENT_ASYNC_URL, data)
+
+        self.assertContains(response,
+                '<strong>Success!</strong> Event has been created.')
+        self.assertTrue(await Event.objects.filter(title='Test Event').aexists())
+        self.assertIn('save;dur=', response['Server-Timing'])
+
 
+class FreeBusyTestCase(TestCase):
 
+    def setUp(self):
+        self.start = timezone.now().replace(microsecond=0)
+
+        for hours in (1, 2, 5):
+            Event.objects.create(
+                title="Test Event",
+                time_start=self.start + datetime.timedelta(hours=hours),
+                time_end=self.start + datetime.timedelta(hours=hours + 2),
+            )
+
+    def test_busy(self):
+        """ Test that the merged busy intervals are returned as JSON """
+        end = self.start + datetime.timedelta(hours=6)
+
+        response = Client().get(FREE_BUSY_URL, {'start': self.start.isoformat(),
+                                                'end': end.isoformat()})
+
+        self.assertEqual(response.json()['busy'], [
+            {'start': (self.start + datetime.timedelta(hours=1)).isoformat(),
+             'end': (self.start + datetime.timedelta(hours=4)).isoformat()},
+            {'start': (self.start + datetime.timedelta(hours=5)).isoformat(),
+             'end': end.isoformat()},
+        ])
+
+    def test_bad_window(self):
+        """ Test that missing, reversed or too long windows are rejected """
+        start = self.start.isoformat()
+        later = (self.start + datetime.timedelta(days=400)).isoformat()
+
+        for params in ({}, {'start': start, 'end': 'tomorrow'},
+                       {'start': later, 'end': start},
+                       {'start': start, 'end': later}):
+            response = Client().get(FREE_BUSY_URL, params)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.json())
+
+
+class PickerBenchmarkTestCase(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(
+                                    'staff', password='pw', is_staff=True))
+
+    def test_staff_only(self):
+        """ Test that other users are sent to the admin login page """
+        response = Client().get(PICKER_BENCHMARK_URL)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith(reverse('admin:login')))
+
+        client = Client()
+        client.force_login(User.objects.create_user('user', password='pw'))
+
+        self.assertEqual(client.get(PICKER_BENCHMARK_URL).status_code, 302)
+
+    def test_inputs(self):
+        """
+        Test that the page renders the requested number of range inputs, each
+        with its own name and the options of its picker
+
+        """
+        response = self.client.get(PICKER_BENCHMARK_URL)
+
+        self.assertContains(response, 'data-daterangepicker-options=', 
+                            count=500)
+        self.assertContains(response, 'name="form-0-time_range"')
+        self.assertContains(response, 'name="form-499-time_range"')
+        self.assertContains(response, 'daterangepicker/dist/daterangepicker.min.js')
+
+        response = self.client.get(PICKER_BENCHMARK_URL, {'count': 3})
+        self.assertContains(response, 'data-daterangepicker-options=', count=3)
+
+    def test_bad_count(self):
+        """ Test that a count that is not a number is rejected """
+        response = self.client.get(PICKER_BENCHMARK_URL, {'count': 'lots'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class ServerTimingTestCase(TestCase):
+
+    def test_create_event_phases(self):
+        """
+        Test that creating an event reports the clean, save and render phases
+
+        """
+        client = Client()
+
+        tomorrow = timezone.now() + datetime.timedelta(hours=24)
+        data = {
+                'title': 'Test Event',
+                'time_range': time_range_generator(tomorrow, tomorrow),
+            }
+
+        response = client.post(CREATE_EVENT_URL, data)
+        
+        for name in ('clean', 'save', 'render', 'db', 'total'):
+            self.assertIn(name + ';dur=', response['Server-Timing'])
@@ -8,4 +8,10 @@ app_name = "simpleapp"
 urlpatterns = [
     path("", views.home, name="home"),
     path("new/", views.create_event, name="create_event"),
+    path("async/", views.home_async, name="home_async"),
+    path("async/new/", views.create_event_async, name="create_event_async"),
+    path("freebusy/", views.free_busy, name="free_busy"),
+    path("benchmarks/pickers/", views.picker_benchmark, name="picker_benchmark"),
+    path("export/events.csv", views.export_events_csv, name="export_events_csv"),
+    path("export/events.ics", views.export_events_ics, name="export_events_ics"),
 ]
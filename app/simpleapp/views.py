@@ -1,15 +1,137 @@
 # File: simpleapp/views.py
-from simpleapp import forms
+from simpleapp import exports, forms, freebusy
+from simpleapp.caching import afetch_fragment, fetch_fragment, make_key
 from simpleapp.models import Event
+from simpleapp.pagination import InvalidCursor, KeysetPaginator
+from simpleapp.watermarks import (
+    aprefetch_version,
+    events_etag,
+    request_version,
+    version_etag,
+)
 
+from daterangepicker.timezones import localize_time_ranges
+from daterangepicker.timing import phase
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.forms import formset_factory
+from django.http import (
+    Http404,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
+
+from functools import wraps
+
+
+def event_list_context(page):
+    events = list(page.object_list)
+    time_ranges = [event.time_range for event in events]
+
+    # Convert every date/time on the page in one batch; the template renders
+    # them with {% localtime off %} rather than converting each one again.
+    if settings.USE_TZ:
+        time_ranges = localize_time_ranges(time_ranges)
+
+    return {"events": list(zip(events, time_ranges)), "page": page}
+
+
+def event_list_key(cursor, per_page):
+    # The rendered list only changes with the events watermark, so it is
+    # cached per page and per timezone and language it was rendered for.
+    return make_key(
+        "simpleapp:event_list",
+        cursor,
+        per_page,
+        timezone.get_current_timezone_name(),
+        translation.get_language(),
+    )
+
+
+def async_events_condition(view):
+    """
+    condition(etag_func=events_etag) for async views, which Django's own
+    decorator only supports from 5.0 on. The events watermark is fetched
+    asynchronously first, so that events_etag doesn't query the database from
+    the event loop.
+
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        await aprefetch_version(request)
+
+        etag = events_etag(request, *args, **kwargs)
+        etag = quote_etag(etag) if etag is not None else None
+
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = await view(request, *args, **kwargs)
+
+        if request.method in ("GET", "HEAD") and etag:
+            response.headers.setdefault("ETag", etag)
+
+        return response
+
+    return wrapper
+
+
+def with_fragment_etag(request, response, version):
+    """
+    Give a response built from an outdated cached fragment the ETag of the
+    version it shows, rather than the current one condition() would add, so
+    that caches downstream don't keep the outdated page as current.
+
+    """
+    if version != request_version(request):
+        response["ETag"] = quote_etag(version_etag(version))
+
+    return response
 
 
 # Create your views here.
+@condition(etag_func=events_etag)
 def home(request):
-    events = Event.objects.all()
+    cursor = request.GET.get("cursor")
+    per_page = settings.SIMPLEAPP_EVENTS_PER_PAGE
+
+    def render_event_list():
+        paginator = KeysetPaginator(Event.objects.all(), per_page=per_page)
+
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        with phase("render"):
+            return render_to_string(
+                "simpleapp/_event_list.html", event_list_context(page), request=request
+            )
+
+    version, event_list = fetch_fragment(
+        event_list_key(cursor, per_page),
+        version=request_version(request),
+        render=render_event_list,
+        timeout=settings.SIMPLEAPP_EVENT_LIST_CACHE_TIMEOUT,
+        stale_while_revalidate=settings.SIMPLEAPP_EVENT_LIST_STALE_WHILE_REVALIDATE,
+    )
+
+    with phase("render"):
+        response = render(
+            request, "simpleapp/index.html", {"event_list": event_list,}
+        )
 
-    return render(request, "simpleapp/index.html", {"events": events,})
+    return with_fragment_etag(request, response, version)
 
 
 def create_event(request):
@@ -21,4 +143,163 @@ def create_event(request):
             created = True
             form.save()
 
-    return render(request, "simpleapp/create.html", {"form": form, "created": created,})
+    with phase("render"):
+        return render(
+            request, "simpleapp/create.html", {"form": form, "created": created,}
+        )
+
+
+@async_events_condition
+async def home_async(request):
+    """ Like home, but runs on the event loop when served over ASGI. """
+    cursor = request.GET.get("cursor")
+    per_page = settings.SIMPLEAPP_EVENTS_PER_PAGE
+
+    async def render_event_list():
+        paginator = KeysetPaginator(Event.objects.all(), per_page=per_page)
+
+        try:
+            page = await paginator.apage(cursor)
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+        with phase("render"):
+            return render_to_string(
+                "simpleapp/_event_list.html", event_list_context(page), request=request
+            )
+
+    version, event_list = await afetch_fragment(
+        event_list_key(cursor, per_page),
+        version=request_version(request),
+        render=render_event_list,
+        timeout=settings.SIMPLEAPP_EVENT_LIST_CACHE_TIMEOUT,
+        stale_while_revalidate=settings.SIMPLEAPP_EVENT_LIST_STALE_WHILE_REVALIDATE,
+    )
+
+    with phase("render"):
+        response = render(
+            request, "simpleapp/index.html", {"event_list": event_list,}
+        )
+
+    return with_fragment_etag(request, response, version)
+
+
+async def create_event_async(request):
+    """ Like create_event, but runs on the event loop when served over ASGI. """
+    form = forms.EventForm(request.POST or None)
+    created = False
+
+    if request.method == "POST":
+        if await form.ais_valid():
+            created = True
+            await form.asave()
+
+    with phase("render"):
+        return render(
+            request, "simpleapp/create.html", {"form": form, "created": created,}
+        )
+
+
+def parse_window(query):
+    """
+    Return the aware (start, end) datetimes given as ISO 8601 in the start
+    and end query parameters, or raise ValueError.
+
+    """
+    try:
+        start = parse_datetime(query.get("start", ""))
+        end = parse_datetime(query.get("end", ""))
+    except ValueError:
+        start = end = None
+
+    if start is None or end is None:
+        raise ValueError("start and end must be ISO 8601 date/times.")
+
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end)
+
+    if end <= start:
+        raise ValueError("end must be after start.")
+
+    if end - start > freebusy.MAX_WINDOW:
+        raise ValueError(
+            "The window may be at most {} days long.".format(freebusy.MAX_WINDOW.days)
+        )
+
+    return start, end
+
+
+def free_busy(request):
+    """ The merged intervals during which events are taking place, as JSON. """
+    try:
+        start, end = parse_window(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    busy = freebusy.busy(start, end)
+
+    return JsonResponse(
+        {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "busy": [
+                {"start": busy_start.isoformat(), "end": busy_end.isoformat()}
+                for busy_start, busy_end in busy
+            ],
+        }
+    )
+
+
+@condition(etag_func=events_etag)
+def export_events_csv(request):
+    response = StreamingHttpResponse(
+        exports.iter_csv(Event.objects.order_by("time_start", "pk")),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = 'attachment; filename="events.csv"'
+
+    return response
+
+
+# The largest number of inputs the picker benchmark page renders.
+MAX_PICKER_BENCHMARK_COUNT = 5000
+
+
+@staff_member_required
+def picker_benchmark(request):
+    """
+    A formset with ?count= (500 by default) time range inputs, for timing how
+    long a page with many pickers takes to load in a browser. Only staff may
+    load it, as each request renders up to MAX_PICKER_BENCHMARK_COUNT inputs.
+
+    """
+    try:
+        count = int(request.GET.get("count", 500))
+    except ValueError:
+        return HttpResponseBadRequest("count must be an integer.")
+
+    count = max(0, min(count, MAX_PICKER_BENCHMARK_COUNT))
+    formset = formset_factory(forms.TimeRangeForm, extra=count)()
+
+    with phase("render"):
+        return render(
+            request,
+            "simpleapp/picker_benchmark.html",
+            {"formset": formset, "count": count,},
+        )
+
+
+@condition(etag_func=events_etag)
+def export_events_ics(request):
+    response = StreamingHttpResponse(
+        exports.iter_ics(
+            Event.objects.order_by("time_start", "pk"), domain=request.get_host()
+        ),
+        content_type="text/calendar; charset=utf-8",
+    )
+    response["Content-Disposition"] = 'attachment; filename="events.ics"'
+
+    return response
@@ -0,0 +1,114 @@
+# File: simpleapp/watermarks.py
+
+"""
+Watermarks record when the rows of a table last changed, so that views can
+answer conditional requests without querying the table itself.
+
+A watermark is only as accurate as the code that touches it. The Event
+watermark is touched by the model signals in simpleapp.signals and by the bulk
+paths that send no signals (the importer and TimeRangedModelFormSet), but not
+by QuerySet.update() or raw SQL. Code that changes events that way must call
+touch() itself.
+
+Validators are ETags only. Last-Modified has a granularity of one second, so
+two changes within the same second would look the same to a client that only
+sends If-Modified-Since. The ETag includes a counter that goes up with every
+touch().
+"""
+
+from simpleapp.models import Watermark
+
+from django.db.models import F
+from django.utils import timezone
+
+from collections import namedtuple
+
+# Name of the watermark that tracks changes to Event rows.
+EVENTS = "simpleapp.event"
+
+# The state of a watermark: when it was last touched, and how many times.
+Version = namedtuple("Version", ["modified", "counter"])
+
+
+def touch(name=EVENTS):
+    """ Record that the rows tracked by the named watermark just changed. """
+    now = timezone.now()
+
+    # The watermark almost always exists already, so try a plain UPDATE first.
+    if Watermark.objects.filter(name=name).update(
+        modified=now, counter=F("counter") + 1
+    ):
+        return
+
+    watermark, created = Watermark.objects.get_or_create(
+        name=name, defaults={"modified": now, "counter": 1}
+    )
+
+    if not created:
+        Watermark.objects.filter(name=name).update(
+            modified=now, counter=F("counter") + 1
+        )
+
+
+def version(name=EVENTS):
+    """
+    Return the Version of the named watermark, or None if it has never been
+    touched.
+
+    """
+    row = Watermark.objects.filter(name=name).values_list("modified", "counter")
+
+    row = row.first()
+
+    return None if row is None else Version(*row)
+
+
+async def aversion(name=EVENTS):
+    """ Async version of version. """
+    row = Watermark.objects.filter(name=name).values_list("modified", "counter")
+
+    row = await row.afirst()
+
+    return None if row is None else Version(*row)
+
+
+def request_version(request, name=EVENTS):
+    """
+    Like version, but only queried once per request, as both the ETag function
+    of a conditional view and the view itself need it.
+
+    """
+    cache = request.__dict__.setdefault("_watermarks", {})
+
+    if name not in cache:
+        cache[name] = version(name)
+
+    return cache[name]
+
+
+async def aprefetch_version(request, name=EVENTS):
+    """
+    Query the named watermark ahead of request_version. Async views must do
+    this before their ETag function runs, as it is called synchronously.
+
+    """
+    cache = request.__dict__.setdefault("_watermarks", {})
+
+    if name not in cache:
+        cache[name] = await aversion(name)
+
+    return cache[name]
+
+
+def version_etag(version):
+    """ The ETag of pages rendered from the given watermark Version. """
+    if version is None:
+        return None
+
+    return "events-{:x}-{:x}".format(
+        version.counter, int(version.modified.timestamp() * 1e6)
+    )
+
+
+def events_etag(request, *args, **kwargs):
+    return version_etag(request_version(request))